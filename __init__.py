@@ -3,16 +3,38 @@ from __future__ import annotations
 
 import logging
 from datetime import timedelta
-import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant, ServiceCall
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.core import HomeAssistant
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN, CONF_DEVICE_ID
+from .boost import async_get_boost_manager
+from .const import (
+    DOMAIN,
+    CONF_DEVICE_ID,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_PROFILING,
+    CONF_STALE_WINDOW,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_STALE_WINDOW,
+)
+from .coordinator import SalusAccountCoordinator
+from .device_index import async_get_device_index
+from .fleet import async_get_poll_scheduler
+from .models import PAYLOAD_FIELDS
 from .salus_api import SalusAPI
+from .schedules import SalusScheduleEngine, SalusScheduleRegistry
+from .services import async_setup_services
+from .session import async_get_circuit_breaker, async_get_connector
+from .storage import (
+    async_get_boost_store,
+    async_get_schedule_store,
+    async_get_session_store,
+    async_get_snapshot_store,
+)
+from .write_queue import SalusWriteQueue
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -22,33 +44,21 @@ PLATFORMS: list[Platform] = [
     Platform.BINARY_SENSOR,
     Platform.SWITCH,  # For schedule management
 ]
-SCAN_INTERVAL = timedelta(minutes=5)
-
-# Service schemas
-SERVICE_BOOST_HEATING = "boost_heating"
-SERVICE_SET_FROST_PROTECTION = "set_frost_protection"
-SERVICE_SET_HOLIDAY_MODE = "set_holiday_mode"
-SERVICE_SET_SCHEDULE = "set_schedule"
-SERVICE_CREATE_CUSTOM_SCHEDULE = "create_custom_schedule"
-SERVICE_APPLY_SCHEDULE_PERIOD = "apply_schedule_period"
-
-BOOST_HEATING_SCHEMA = vol.Schema({
-    vol.Required("entity_id"): cv.entity_id,
-    vol.Required("duration"): vol.All(vol.Coerce(int), vol.Range(min=5, max=120)),
-    vol.Optional("temperature"): vol.All(vol.Coerce(float), vol.Range(min=5, max=35)),
-})
-
-FROST_PROTECTION_SCHEMA = vol.Schema({
-    vol.Required("entity_id"): cv.entity_id,
-    vol.Required("enabled"): cv.boolean,
-    vol.Optional("temperature"): vol.All(vol.Coerce(float), vol.Range(min=5, max=15)),
-})
-
-HOLIDAY_MODE_SCHEMA = vol.Schema({
-    vol.Required("entity_id"): cv.entity_id,
-    vol.Required("enabled"): cv.boolean,
-    vol.Optional("temperature"): vol.All(vol.Coerce(float), vol.Range(min=5, max=25)),
-})
+
+# Account coordinators, keyed by lowercased username
+DATA_ACCOUNTS = f"{DOMAIN}_accounts"
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the services shared by every SALUS RT310i config entry."""
+    hass.data.setdefault(DOMAIN, {})
+    # Services find their targets' entries here for as long as the
+    # integration is loaded, so it outlives every single entry
+    async_get_device_index(hass)
+    async_setup_services(hass)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -59,179 +69,112 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     password = entry.data["password"]
     device_id = entry.data[CONF_DEVICE_ID]
     
-    api = SalusAPI(username, password, device_id)
-    
-    async def async_update_data():
-        """Fetch data from API."""
+    session_store = await async_get_session_store(hass)
+    snapshot_store = await async_get_snapshot_store(hass)
+    schedule_store = await async_get_schedule_store(hass)
+    boosts = async_get_boost_manager(hass, await async_get_boost_store(hass))
+    accounts: dict[str, SalusAccountCoordinator] = hass.data.setdefault(
+        DATA_ACCOUNTS, {}
+    )
+    if (coordinator := accounts.get(username.lower())) is None:
+        api = SalusAPI(
+            username,
+            password,
+            device_id,
+            async_get_connector(hass),
+            circuit_breaker=async_get_circuit_breaker(hass),
+            payload_fields=PAYLOAD_FIELDS,
+        )
+        # Reuse the session saved before the restart instead of logging in
+        session_store.async_track(api)
+        coordinator = SalusAccountCoordinator(hass, api, snapshot_store)
+        accounts[username.lower()] = coordinator
+
+    max_interval = timedelta(
+        minutes=entry.options.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL)
+    )
+    stale_window = timedelta(
+        minutes=entry.options.get(CONF_STALE_WINDOW, DEFAULT_STALE_WINDOW)
+    )
+    coordinator.set_profiling(device_id, entry.options.get(CONF_PROFILING, False))
+    # Before the first poll, so the next one already keeps clear of the
+    # other accounts
+    poll_scheduler = await async_get_poll_scheduler(hass)
+    entry.async_on_unload(poll_scheduler.async_add_device(device_id, coordinator))
+    # Restore the last snapshot and poll in the background; only a device
+    # seen for the first time waits for the cloud
+    restored = coordinator.async_restore_device(device_id, max_interval, stale_window)
+    if not restored:
         try:
-            await api.login()
-            device_data = await api.get_device_data()
-            return device_data
-        except Exception as err:
-            raise UpdateFailed(f"Error communicating with API: {err}")
-    
-    coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        name="salus_rt310i",
-        update_method=async_update_data,
-        update_interval=SCAN_INTERVAL,
+            await coordinator.async_add_device(device_id, max_interval, stale_window)
+        except Exception:
+            await _async_release_device(hass, username, device_id)
+            raise
+    
+    write_queue = SalusWriteQueue(hass, coordinator, device_id)
+    schedules = SalusScheduleRegistry(device_id, schedule_store)
+    schedule_engine = SalusScheduleEngine(
+        hass, schedules, schedule_store, coordinator, write_queue, boosts
     )
-    
-    await coordinator.async_config_entry_first_refresh()
-    
     hass.data[DOMAIN][entry.entry_id] = {
         "coordinator": coordinator,
-        "api": api,
+        "api": coordinator.api,
         "device_id": device_id,
+        "write_queue": write_queue,
+        "schedules": schedules,
+        "schedule_engine": schedule_engine,
+        "boosts": boosts,
+        "poll_scheduler": poll_scheduler,
     }
     
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    
-    # Register services
-    async def handle_boost_heating(call: ServiceCall) -> None:
-        """Handle boost heating service call."""
-        entity_id = call.data["entity_id"]
-        duration = call.data["duration"]
-        temperature = call.data.get("temperature")
-        
-        _LOGGER.info("Boost heating called: entity=%s, duration=%s, temp=%s", 
-                     entity_id, duration, temperature)
-        
-        # Get the climate entity
-        climate_entity = hass.states.get(entity_id)
-        if not climate_entity:
-            _LOGGER.error("Entity %s not found", entity_id)
-            return
-        
-        # Calculate boost temperature
-        if temperature is None:
-            current_target = float(climate_entity.attributes.get("temperature", 20))
-            temperature = min(35, current_target + 2)
-        
-        # Set the temperature
-        await hass.services.async_call(
-            "climate",
-            "set_temperature",
-            {"entity_id": entity_id, "temperature": temperature},
-            blocking=True,
-        )
-        
-        _LOGGER.info("Boost heating activated for %s minutes at %s°C", duration, temperature)
-    
-    async def handle_frost_protection(call: ServiceCall) -> None:
-        """Handle frost protection service call."""
-        _LOGGER.info("Frost protection service called: %s", call.data)
-        # Implementation would depend on API capabilities
-        
-    async def handle_set_schedule(call: ServiceCall) -> None:
-        """Handle set schedule service call."""
-        entity_id = call.data["entity_id"]
-        schedule_name = call.data["schedule_name"]
-        
-        _LOGGER.info("Set schedule called: entity=%s, schedule=%s", entity_id, schedule_name)
-        
-        # Get device_id from entity
-        climate_entity = hass.states.get(entity_id)
-        if not climate_entity:
-            _LOGGER.error("Entity %s not found", entity_id)
-            return
-        
-        # Turn on the schedule template switch
-        device_id = entry.data[CONF_DEVICE_ID]
-        schedule_entity_id = f"switch.salus_{device_id}_schedule_{schedule_name}"
-        
-        await hass.services.async_call(
-            "switch",
-            "turn_on",
-            {"entity_id": schedule_entity_id},
-            blocking=True,
-        )
-        
-        _LOGGER.info("Activated schedule: %s", schedule_name)
-    
-    async def handle_create_custom_schedule(call: ServiceCall) -> None:
-        """Handle create custom schedule service call."""
-        name = call.data["name"]
-        weekday_periods = call.data["weekday_periods"]
-        weekend_periods = call.data.get("weekend_periods", weekday_periods)
-        
-        _LOGGER.info("Create custom schedule called: %s", name)
-        
-        # Store custom schedule (this would be saved to storage)
-        # For now, just log it
-        _LOGGER.info("Custom schedule created: weekday=%s, weekend=%s", 
-                     weekday_periods, weekend_periods)
-    
-    async def handle_apply_schedule_period(call: ServiceCall) -> None:
-        """Handle apply schedule period service call."""
-        entity_id = call.data["entity_id"]
-        start_time = call.data["start_time"]
-        end_time = call.data["end_time"]
-        temperature = call.data["temperature"]
-        days = call.data.get("days", [])
-        
-        _LOGGER.info("Apply schedule period: %s-%s at %s°C", start_time, end_time, temperature)
-        
-        # This would apply the period to the thermostat
-        # For now, just log it
-        _LOGGER.info("Period applied for days: %s", days)
-    
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_BOOST_HEATING,
-        handle_boost_heating,
-        schema=BOOST_HEATING_SCHEMA,
-    )
-    
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_SET_FROST_PROTECTION,
-        handle_frost_protection,
-        schema=FROST_PROTECTION_SCHEMA,
-    )
-    
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_SET_HOLIDAY_MODE,
-        handle_holiday_mode,
-        schema=HOLIDAY_MODE_SCHEMA,
-    )
-    
-    # Register schedule services
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_SET_SCHEDULE,
-        handle_set_schedule,
-    )
-    
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_CREATE_CUSTOM_SCHEDULE,
-        handle_create_custom_schedule,
-    )
-    
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_APPLY_SCHEDULE_PERIOD,
-        handle_apply_schedule_period,
+    # After the switches restored their state into the registry
+    schedule_engine.async_start()
+    # Also ends boosts that expired while Home Assistant was down
+    entry.async_on_unload(boosts.async_add_device(device_id, coordinator))
+    # Services find this device through its entities and registry device
+    entry.async_on_unload(
+        async_get_device_index(hass).async_add_entry(entry.entry_id, device_id)
     )
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+    if restored:
+        await coordinator.async_request_startup_refresh()
     
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def _async_release_device(
+    hass: HomeAssistant, username: str, device_id: str
+) -> None:
+    """Stop polling a device, closing its account once no device is left."""
+    accounts: dict[str, SalusAccountCoordinator] = hass.data[DATA_ACCOUNTS]
+    coordinator = accounts[username.lower()]
+    coordinator.remove_device(device_id)
+    if not coordinator.device_ids:
+        accounts.pop(username.lower())
+        await coordinator.async_shutdown()
+        await coordinator.api.close()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
-    
-    # Unregister services if this was the last entry
-    if not hass.data[DOMAIN]:
-        hass.services.async_remove(DOMAIN, SERVICE_BOOST_HEATING)
-        hass.services.async_remove(DOMAIN, SERVICE_SET_FROST_PROTECTION)
-        hass.services.async_remove(DOMAIN, SERVICE_SET_HOLIDAY_MODE)
-        hass.services.async_remove(DOMAIN, SERVICE_SET_SCHEDULE)
-        hass.services.async_remove(DOMAIN, SERVICE_CREATE_CUSTOM_SCHEDULE)
-        hass.services.async_remove(DOMAIN, SERVICE_APPLY_SCHEDULE_PERIOD)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        entry_data["schedule_engine"].async_stop()
+        entry_data["write_queue"].async_shutdown()
+        await _async_release_device(
+            hass, entry.data["username"], entry.data[CONF_DEVICE_ID]
+        )
     
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Forget the saved snapshot and schedule of a removed device."""
+    (await async_get_snapshot_store(hass)).async_remove(entry.data[CONF_DEVICE_ID])
+    (await async_get_schedule_store(hass)).async_remove_device(entry.data[CONF_DEVICE_ID])
@@ -0,0 +1,903 @@
+"""Offline benchmarks for the SALUS RT310i integration.
+
+Runs the real client, and the coordinator and write queue when Home
+Assistant is installed, against the local mock cloud and reports:
+
+- requests, connections and logins per poll
+- poll latency percentiles
+- logins caused by expiring sessions
+- requests sent while the cloud is failing, with retries and the circuit breaker
+- set.php requests per burst of setpoint changes and write-to-visible latency
+- memory retained per polled device
+- entry setup time of a cold start versus one restored from storage
+- states rows and attribute bytes the schedule switches add to the recorder
+- setpoint lookups in a compiled schedule versus scanning its periods
+- requests and time to set every device, one by one versus one fleet write
+- open sockets, client sessions, tasks and listeners over repeated reloads
+- peak concurrent requests of several accounts polling in lockstep versus spread
+
+Usage: ``python benchmarks/bench.py [--devices 20] [--polls 50] [--json out.json]``
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import timedelta
+import functools
+import gc
+import importlib
+import json
+import os
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+from typing import Any
+from unittest.mock import patch
+
+import aiohttp
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from mock_cloud import MockCloudConfig, MockSalusCloud  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = "salus_rt310i"
+
+
+def load(module: str) -> types.ModuleType:
+    """Import a module of the integration without a Home Assistant config dir."""
+    if PACKAGE not in sys.modules:
+        package = types.ModuleType(PACKAGE)
+        package.__path__ = [str(ROOT)]
+        sys.modules[PACKAGE] = package
+    return importlib.import_module(f"{PACKAGE}.{module}")
+
+
+def has_homeassistant() -> bool:
+    """Return True if Home Assistant can be imported."""
+    try:
+        importlib.import_module("homeassistant.core")
+    except ImportError:
+        return False
+    return True
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    """Return p50/p95/p99 of samples in milliseconds."""
+    if len(samples) < 2:
+        value = samples[0] * 1000 if samples else 0.0
+        return {"p50_ms": value, "p95_ms": value, "p99_ms": value}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        "p50_ms": round(cuts[49] * 1000, 2),
+        "p95_ms": round(cuts[94] * 1000, 2),
+        "p99_ms": round(cuts[98] * 1000, 2),
+    }
+
+
+async def client(
+    cloud: MockSalusCloud,
+    connector: aiohttp.BaseConnector | None = None,
+    **kwargs: Any,
+):
+    """Return a client for the mock cloud's account."""
+    salus_api = load("salus_api")
+    # Real polls are at least 30 seconds apart; back-to-back benchmark polls
+    # must not be answered from the client's short-lived shared result
+    kwargs.setdefault("data_share_window", 0)
+    return salus_api.SalusAPI(
+        cloud.config.username,
+        cloud.config.password,
+        next(iter(cloud.devices)),
+        connector=connector,
+        base_url=cloud.url,
+        **kwargs,
+    )
+
+
+async def _async_start_hass(config_dir: str):
+    """Return a Home Assistant instance with registries and the switch component."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant import bootstrap, config_entries, loader
+    from homeassistant.core import HomeAssistant
+    from homeassistant.setup import async_setup_component
+
+    hass = HomeAssistant(config_dir)
+    loader.async_setup(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await bootstrap.async_load_base_functionality(hass)
+    await async_setup_component(hass, "switch", {})
+    return hass
+
+
+async def bench_polling(args: argparse.Namespace) -> dict[str, Any]:
+    """Measure traffic and latency of polling every device of an account."""
+    cloud = MockSalusCloud(
+        MockCloudConfig(devices=args.devices, latency=args.latency, jitter=args.jitter)
+    )
+    await cloud.start()
+    api = await client(cloud)
+    try:
+        # The first poll includes the login
+        await api.get_devices_data(list(cloud.devices))
+        first_poll = cloud.stats.total_requests
+        cloud.stats.reset()
+
+        latencies = []
+        for _ in range(args.polls):
+            start = time.perf_counter()
+            results = await api.get_devices_data(list(cloud.devices))
+            latencies.append(time.perf_counter() - start)
+            if errors := [r for r in results.values() if isinstance(r, Exception)]:
+                raise RuntimeError(f"Poll failed: {errors[0]}")
+        stats = cloud.stats
+        return {
+            "devices": args.devices,
+            "polls": args.polls,
+            "requests_first_poll": first_poll,
+            "requests_per_poll": stats.total_requests / args.polls,
+            "connections_per_poll": stats.connections / args.polls,
+            "logins_per_poll": stats.logins / args.polls,
+            "peak_concurrency": stats.peak_in_flight,
+            "latency": percentiles(latencies),
+        }
+    finally:
+        await api.close()
+        await cloud.stop()
+
+
+async def bench_session_expiry(args: argparse.Namespace) -> dict[str, Any]:
+    """Count logins and requests when every session expires between polls."""
+    cloud = MockSalusCloud(MockCloudConfig(devices=args.devices))
+    await cloud.start()
+    api = await client(cloud)
+    polls = max(args.polls // 5, 1)
+    try:
+        await api.get_devices_data(list(cloud.devices))
+        cloud.stats.reset()
+        for _ in range(polls):
+            cloud.expire_sessions()
+            await api.get_devices_data(list(cloud.devices))
+        return {
+            "polls": polls,
+            "logins_per_poll": cloud.stats.logins / polls,
+            "requests_per_poll": cloud.stats.total_requests / polls,
+        }
+    finally:
+        await api.close()
+        await cloud.stop()
+
+
+async def bench_outage(args: argparse.Namespace) -> dict[str, Any]:
+    """Count requests per poll while every data request fails with a 500."""
+    resilience = load("resilience")
+    cloud = MockSalusCloud(MockCloudConfig(devices=args.devices, error_rate=1.0))
+    await cloud.start()
+    api = await client(
+        cloud, retry_policy=resilience.RetryPolicy(base_delay=0.01, max_delay=0.05)
+    )
+    polls = max(args.polls // 5, 1)
+    try:
+        await api.login()
+        cloud.stats.reset()
+        failed_fast = 0
+        for _ in range(polls):
+            start = time.perf_counter()
+            try:
+                await api.get_devices_data(list(cloud.devices))
+            except Exception:  # pylint: disable=broad-except
+                pass
+            if time.perf_counter() - start < 0.005:
+                failed_fast += 1
+        return {
+            "polls": polls,
+            "requests_per_poll": cloud.stats.total_requests / polls,
+            "polls_failed_fast": failed_fast,
+            "circuit_breaker": api.circuit_breaker.as_dict(),
+        }
+    finally:
+        await api.close()
+        await cloud.stop()
+
+
+async def bench_memory(args: argparse.Namespace) -> dict[str, Any]:
+    """Measure memory retained by payloads and parsed state per device.
+
+    Measured once keeping the full payload and once with the field
+    projection the integration uses.
+    """
+    models = load("models")
+    cloud = MockSalusCloud(MockCloudConfig(devices=args.devices))
+    await cloud.start()
+    results: dict[str, Any] = {"devices": args.devices}
+    try:
+        for name, payload_fields in (
+            ("full_payload", None),
+            ("projected", models.PAYLOAD_FIELDS),
+        ):
+            api = await client(cloud, payload_fields=payload_fields)
+            try:
+                await api.login()
+                tracemalloc.start()
+                before = tracemalloc.take_snapshot()
+                payloads = await api.get_devices_data(list(cloud.devices))
+                states = {
+                    device_id: models.SalusDeviceState.from_payload(payload)
+                    for device_id, payload in payloads.items()
+                }
+                after = tracemalloc.take_snapshot()
+                tracemalloc.stop()
+                retained = sum(
+                    stat.size_diff
+                    for stat in after.compare_to(before, "filename")
+                    if stat.size_diff > 0
+                )
+                results[name] = {
+                    "bytes_per_device": retained // max(len(states), 1),
+                    "fields_per_payload": len(next(iter(payloads.values()))),
+                }
+            finally:
+                await api.close()
+    finally:
+        await cloud.stop()
+    return results
+
+
+async def bench_writes(args: argparse.Namespace) -> dict[str, Any]:
+    """Measure set.php requests per setpoint burst and write-to-visible latency."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.core import HomeAssistant
+
+    coordinator_module = load("coordinator")
+    write_queue_module = load("write_queue")
+    const = load("const")
+
+    cloud = MockSalusCloud(MockCloudConfig(devices=1, latency=args.latency))
+    await cloud.start()
+    hass = HomeAssistant(tempfile.gettempdir())
+    api = await client(cloud)
+    device_id = next(iter(cloud.devices))
+    coordinator = coordinator_module.SalusAccountCoordinator(hass, api)
+    queue = write_queue_module.SalusWriteQueue(hass, coordinator, device_id)
+    try:
+        await coordinator.async_add_device(device_id)
+        cloud.stats.reset()
+
+        # Ramp the setpoint in 0.5°C steps, as dragging the card does
+        target = 20.0
+        start = time.perf_counter()
+        for _ in range(args.burst):
+            target += 0.5
+            await queue.async_set_values(**{const.FIELD_SETPOINT: target})
+            await asyncio.sleep(args.step_delay)
+        while coordinator.data[device_id].target_temperature != target:
+            await asyncio.sleep(0.01)
+        visible = time.perf_counter() - start
+
+        return {
+            "burst": args.burst,
+            "step_delay": args.step_delay,
+            "set_requests": cloud.stats.requests["/includes/set.php"],
+            "data_requests": cloud.stats.requests["/public/ajax_device_values.php"],
+            "write_to_visible_ms": round(visible * 1000, 2),
+            "cloud_setpoint": cloud.devices[device_id]["CH1currentSetPoint"],
+        }
+    finally:
+        queue.async_shutdown()
+        await coordinator.async_shutdown()
+        await api.close()
+        await cloud.stop()
+        await hass.async_stop(force=True)
+
+
+async def bench_startup(args: argparse.Namespace) -> dict[str, Any]:
+    """Compare entry setup of a cold start with a start restored from storage.
+
+    Both starts share a config directory, so the second one finds the
+    session and snapshots saved by the first, as after a restart.
+    """
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.core import HomeAssistant
+
+    coordinator_module = load("coordinator")
+    storage = load("storage")
+
+    cloud = MockSalusCloud(MockCloudConfig(devices=args.devices, latency=args.latency))
+    await cloud.start()
+    results: dict[str, Any] = {}
+    try:
+        with tempfile.TemporaryDirectory() as config_dir:
+            for phase in ("cold", "restored"):
+                hass = HomeAssistant(config_dir)
+                session_store = await storage.async_get_session_store(hass)
+                snapshot_store = await storage.async_get_snapshot_store(hass)
+                api = await client(cloud)
+                session_store.async_track(api)
+                coordinator = coordinator_module.SalusAccountCoordinator(
+                    hass, api, snapshot_store
+                )
+
+                async def _setup(device_id: str) -> None:
+                    if not coordinator.async_restore_device(device_id):
+                        await coordinator.async_add_device(device_id)
+
+                cloud.stats.reset()
+                start = time.perf_counter()
+                await asyncio.gather(*(_setup(device_id) for device_id in cloud.devices))
+                setup = time.perf_counter() - start
+                setup_requests = cloud.stats.total_requests
+                if phase == "restored":
+                    # The background poll the entries would start
+                    await coordinator.async_refresh()
+                results[phase] = {
+                    "setup_ms": round(setup * 1000, 2),
+                    "requests_before_ready": setup_requests,
+                    "requests_until_fresh": cloud.stats.total_requests,
+                    "logins": cloud.stats.logins,
+                }
+                await coordinator.async_shutdown()
+                await api.close()
+                # Writes the delayed saves, as a real shutdown does
+                await hass.async_stop(force=True)
+    finally:
+        await cloud.stop()
+    results["setup_ms_saved"] = round(
+        results["cold"]["setup_ms"] - results["restored"]["setup_ms"], 2
+    )
+    return results
+
+
+async def bench_recorder(args: argparse.Namespace) -> dict[str, Any]:
+    """Measure what the schedule switches add to the recorder database.
+
+    The switches are recorded by the real recorder into a temporary
+    SQLite database, next to copies that behave as the switches did
+    before: the period lists and the template list in their attributes,
+    none of them excluded from the recorder, and a state write on every
+    poll and on every template change. Each set follows the same device
+    through its own coordinator.
+    """
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.recorder import get_instance
+    from homeassistant.components.recorder.db_schema import (
+        StateAttributes,
+        States,
+        StatesMeta,
+    )
+    from homeassistant.components.recorder.util import session_scope
+    from homeassistant.const import EVENT_CALL_SERVICE
+    from homeassistant.core import callback
+    from homeassistant.helpers import recorder as recorder_helper
+    from homeassistant.setup import async_setup_component
+
+    coordinator_module = load("coordinator")
+    schedules = load("schedules")
+    switch = load("switch")
+
+    class InlineScheduleMaster(switch.SalusScheduleMaster):
+        """The master switch as it was, with the template list inline."""
+
+        _state_fields = None
+
+        def __init__(self, *args: Any) -> None:
+            super().__init__(*args)
+            self.entity_id = "switch.inline_schedule_master"
+            self._attr_unique_id = f"inline_{self._attr_unique_id}"
+
+        @property
+        def extra_state_attributes(self) -> dict[str, Any]:
+            return {
+                **super().extra_state_attributes,
+                "available_templates": list(schedules.SCHEDULE_TEMPLATES),
+            }
+
+    class InlineScheduleTemplate(switch.SalusScheduleTemplate):
+        """A template switch as it was, with its periods inline."""
+
+        _state_fields = None
+        _unrecorded_attributes = frozenset()
+
+        def __init__(self, *args: Any) -> None:
+            super().__init__(*args)
+            self.entity_id = f"switch.inline_schedule_{self._template_id}"
+            self._attr_unique_id = f"inline_{self._attr_unique_id}"
+
+        @callback
+        def _async_schedule_changed(self, previous: str | None, active: str | None) -> None:
+            self.async_write_ha_state()
+
+        @property
+        def extra_state_attributes(self) -> dict[str, Any]:
+            periods = self._template_data["periods"]
+            return {
+                **super().extra_state_attributes,
+                "weekday_periods": periods["weekday"],
+                "weekend_periods": periods["weekend"],
+            }
+
+    cloud = MockSalusCloud(MockCloudConfig(devices=1))
+    await cloud.start()
+    device_id = next(iter(cloud.devices))
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await _async_start_hass(config_dir)
+        # The recorder refuses in-memory databases; this one is temporary too
+        db_url = f"sqlite:///{Path(config_dir) / 'recorder.db'}"
+        recorder_helper.async_initialize_recorder(hass)
+        await async_setup_component(
+            hass, "recorder", {"recorder": {"db_url": db_url, "commit_interval": 0}}
+        )
+        await hass.async_start()
+        clients = [await client(cloud), await client(cloud)]
+        coordinators = [
+            coordinator_module.SalusAccountCoordinator(hass, api) for api in clients
+        ]
+        try:
+            variants = {}
+            for name, coordinator, master_class, template_class in (
+                ("current", coordinators[0], switch.SalusScheduleMaster, switch.SalusScheduleTemplate),
+                ("inline", coordinators[1], InlineScheduleMaster, InlineScheduleTemplate),
+            ):
+                await coordinator.async_add_device(device_id)
+                registry = schedules.SalusScheduleRegistry(device_id)
+                master = master_class(coordinator, coordinator.api, device_id, registry)
+                templates = [
+                    template_class(coordinator, device_id, template_id, data, registry)
+                    for template_id, data in schedules.SCHEDULE_TEMPLATES.items()
+                ]
+                await hass.data["switch"].async_add_entities([master, *templates])
+                variants[name] = (coordinator, registry, templates)
+            await hass.async_block_till_done()
+            entity_ids = {
+                name: {entity.entity_id for entity in templates} | {master_id}
+                for (name, (_, _, templates)), master_id in zip(
+                    variants.items(),
+                    ("switch.schedule_master", "switch.inline_schedule_master"),
+                )
+            }
+            await get_instance(hass).async_block_till_done()
+            writes_before = {
+                name: coordinator.state_writes
+                for name, (coordinator, _, _) in variants.items()
+            }
+
+            service_calls = 0
+
+            def _count_call(event) -> None:
+                nonlocal service_calls
+                service_calls += 1
+
+            unsub = hass.bus.async_listen(EVENT_CALL_SERVICE, _count_call)
+            # A day of polls at the default interval: the schedule flag
+            # changes a few times and the active template is picked now and
+            # then, sometimes the one already active
+            activations = 0
+            current_templates = variants["current"][2]
+            for poll in range(args.polls):
+                if poll % 10 == 5:
+                    cloud.devices[device_id]["CH1scheduleOn"] = str(poll // 10 % 2)
+                if poll % 7 == 3:
+                    index = poll // 14 % len(current_templates)
+                    await hass.services.async_call(
+                        "switch",
+                        "turn_on",
+                        {"entity_id": current_templates[index].entity_id},
+                        blocking=True,
+                    )
+                    variants["inline"][1].async_activate(
+                        list(schedules.SCHEDULE_TEMPLATES)[index]
+                    )
+                    activations += 1
+                for coordinator in coordinators:
+                    await coordinator.async_refresh()
+                await hass.async_block_till_done()
+            unsub()
+            await get_instance(hass).async_block_till_done()
+
+            def _read_database() -> dict[str, dict[str, int]]:
+                with session_scope(hass=hass, read_only=True) as session:
+                    rows = (
+                        session.query(StatesMeta.entity_id, StateAttributes.shared_attrs)
+                        .join(States, States.metadata_id == StatesMeta.metadata_id)
+                        .outerjoin(
+                            StateAttributes,
+                            States.attributes_id == StateAttributes.attributes_id,
+                        )
+                        .all()
+                    )
+                database = {}
+                for name, ids in entity_ids.items():
+                    attrs = [shared for entity_id, shared in rows if entity_id in ids]
+                    stored = {shared for shared in attrs if shared is not None}
+                    database[name] = {
+                        "states_rows": len(attrs),
+                        "attribute_rows": len(stored),
+                        "attribute_bytes": sum(map(len, stored)),
+                    }
+                return database
+
+            database = await get_instance(hass).async_add_executor_job(_read_database)
+            return {
+                "polls": args.polls,
+                "activations": activations,
+                "service_calls_per_activation": round(
+                    service_calls / max(activations, 1), 2
+                ),
+                **{
+                    name: {
+                        "poll_state_writes": coordinator.state_writes
+                        - writes_before[name],
+                        **database[name],
+                    }
+                    for name, (coordinator, _, _) in variants.items()
+                },
+            }
+        finally:
+            for coordinator in coordinators:
+                await coordinator.async_shutdown()
+                await coordinator.api.close()
+            await cloud.stop()
+            await hass.async_stop(force=True)
+
+
+async def bench_schedule(args: argparse.Namespace) -> dict[str, Any]:
+    """Time setpoint lookups in a compiled schedule against scanning its periods.
+
+    The comfort template gets ``--devices`` extra one-hour periods per day,
+    as many applied periods would add.
+    """
+    schedules = load("schedules")
+    template = schedules.SCHEDULE_TEMPLATES["comfort"]
+    overrides = [
+        {"start": f"{hour % 24:02d}:10", "end": f"{hour % 24:02d}:50", "temp": 20}
+        for hour in range(args.devices)
+    ]
+    start = time.perf_counter()
+    compiled = schedules.CompiledSchedule.from_template(template, overrides)
+    compile_time = time.perf_counter() - start
+
+    periods = [
+        (day, *schedules._period(day, period)[1:])  # pylint: disable=protected-access
+        for day, name in enumerate(schedules.DAYS)
+        for period in [
+            *template["periods"]["weekend" if name in schedules.WEEKEND else "weekday"],
+            *overrides,
+        ]
+    ]
+
+    def _scan(day: int, minute: int) -> float | None:
+        setpoint = None
+        for period_day, begin, end, value in periods:
+            if period_day == day and (
+                begin <= minute < end or (end <= begin and minute >= begin)
+            ):
+                setpoint = value
+        return setpoint
+
+    minutes = [(day, minute) for day in range(7) for minute in range(0, 1440, 7)]
+    results: dict[str, Any] = {"periods": len(periods)}
+    for name, lookup in (("compiled", compiled.setpoint), ("scan", _scan)):
+        start = time.perf_counter()
+        for day, minute in minutes:
+            lookup(day, minute)
+        results[f"{name}_lookup_us"] = round(
+            (time.perf_counter() - start) / len(minutes) * 1e6, 3
+        )
+    results["compile_ms"] = round(compile_time * 1000, 3)
+    return results
+
+
+async def bench_fleet(args: argparse.Namespace) -> dict[str, Any]:
+    """Compare setting every device one by one with one fleet write."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.core import HomeAssistant
+
+    coordinator_module = load("coordinator")
+    fleet = load("fleet")
+    const = load("const")
+
+    cloud = MockSalusCloud(MockCloudConfig(devices=args.devices, latency=args.latency))
+    await cloud.start()
+    hass = HomeAssistant(tempfile.gettempdir())
+    api = await client(cloud)
+    # Let the read that verifies the writes run right after them
+    coordinator = coordinator_module.SalusAccountCoordinator(
+        hass, api, verify_delay=0.05
+    )
+    results: dict[str, Any] = {"devices": args.devices}
+    try:
+        for device_id in cloud.devices:
+            await coordinator.async_add_device(device_id)
+
+        # One service call per device: write, then refresh to show it
+        cloud.stats.reset()
+        start = time.perf_counter()
+        for device_id in cloud.devices:
+            await api.set_values(device_id, **{const.FIELD_SETPOINT: 19.0})
+            await coordinator.async_refresh()
+        results["serial"] = {
+            "set_requests": cloud.stats.requests["/includes/set.php"],
+            "data_requests": cloud.stats.requests["/public/ajax_device_values.php"],
+            "wall_ms": round((time.perf_counter() - start) * 1000, 2),
+            "peak_concurrent_requests": cloud.stats.peak_in_flight,
+        }
+
+        # One call for the fleet: batched writes, shown at once, one read
+        cloud.stats.reset()
+        start = time.perf_counter()
+        written = await fleet.async_write_fleet(
+            {
+                device_id: (coordinator, {const.FIELD_SETPOINT: 21.0})
+                for device_id in cloud.devices
+            }
+        )
+        wall = time.perf_counter() - start
+        await asyncio.sleep(0.2)
+        await hass.async_block_till_done()
+        results["fleet"] = {
+            "set_requests": cloud.stats.requests["/includes/set.php"],
+            "data_requests": cloud.stats.requests["/public/ajax_device_values.php"],
+            "wall_ms": round(wall * 1000, 2),
+            "peak_concurrent_requests": cloud.stats.peak_in_flight,
+            "succeeded": sum(result is True for result in written.values()),
+        }
+        return results
+    finally:
+        await coordinator.async_shutdown()
+        await api.close()
+        await cloud.stop()
+        await hass.async_stop(force=True)
+
+
+def resources(hass) -> dict[str, int | None]:
+    """Return what an entry could leak when it is unloaded."""
+    fd_dir = Path("/proc/self/fd")
+    sockets = None
+    if fd_dir.is_dir():
+        sockets = 0
+        for fd in os.listdir(fd_dir):
+            try:
+                sockets += os.readlink(fd_dir / fd).startswith("socket:")
+            except OSError:
+                pass
+    gc.collect()
+    return {
+        "sockets": sockets,
+        "client_sessions": sum(
+            isinstance(obj, aiohttp.ClientSession) and not obj.closed
+            for obj in gc.get_objects()
+        ),
+        "tasks": len(asyncio.all_tasks()),
+        "listeners": sum(hass.bus.async_listeners().values()),
+        # Cancelled timers stay in the loop's heap until they come up
+        "timers": sum(
+            not handle.cancelled()
+            for handle in hass.loop._scheduled  # pylint: disable=protected-access
+        ),
+    }
+
+
+async def bench_reload(args: argparse.Namespace) -> dict[str, Any]:
+    """Reload every config entry repeatedly and report resource growth.
+
+    The integration is loaded as a custom component of a real Home
+    Assistant instance, with config entries pointing at the mock cloud.
+    Resources are counted after a first reload, once the shared pools and
+    stores exist, and again after ``--reloads`` more.
+    """
+    # pylint: disable=import-outside-toplevel
+    from homeassistant import config_entries, loader
+
+    cloud = MockSalusCloud(MockCloudConfig(devices=args.devices, latency=args.latency))
+    await cloud.start()
+    try:
+        with tempfile.TemporaryDirectory() as config_dir:
+            os.makedirs(Path(config_dir) / "custom_components")
+            os.symlink(ROOT, Path(config_dir) / "custom_components" / PACKAGE)
+            hass = await _async_start_hass(config_dir)
+            integration = await loader.async_get_integration(hass, PACKAGE)
+            component = integration.get_component()
+            salus_api = functools.partial(
+                component.SalusAPI, base_url=cloud.url, data_share_window=0
+            )
+            with patch.object(component, "SalusAPI", salus_api):
+                entries = []
+                for device_id in cloud.devices:
+                    entry = config_entries.ConfigEntry(
+                        version=1,
+                        minor_version=1,
+                        domain=PACKAGE,
+                        title=device_id,
+                        data={
+                            "username": cloud.config.username,
+                            "password": cloud.config.password,
+                            "device_id": device_id,
+                        },
+                        source="user",
+                        options={},
+                    )
+                    await hass.config_entries.async_add(entry)
+                    entries.append(entry)
+                await hass.async_block_till_done()
+
+                async def _reload_all() -> None:
+                    for entry in entries:
+                        await hass.config_entries.async_reload(entry.entry_id)
+                    await hass.async_block_till_done()
+
+                await _reload_all()
+                before = resources(hass)
+                start = time.perf_counter()
+                for _ in range(args.reloads):
+                    await _reload_all()
+                elapsed = time.perf_counter() - start
+                after = resources(hass)
+                loaded = sum(
+                    entry.state is config_entries.ConfigEntryState.LOADED
+                    for entry in entries
+                )
+                for entry in entries:
+                    await hass.config_entries.async_unload(entry.entry_id)
+                await hass.async_block_till_done()
+                unloaded = resources(hass)
+            await hass.async_stop(force=True)
+    finally:
+        await cloud.stop()
+    return {
+        "reloads": args.reloads,
+        "entries_loaded": loaded,
+        "reload_ms": round(elapsed * 1000 / (args.reloads * len(entries)), 2),
+        "before": before,
+        "after": after,
+        "growth": {
+            key: None if value is None else after[key] - value
+            for key, value in before.items()
+        },
+        "after_unload": unloaded,
+    }
+
+
+async def bench_spread(args: argparse.Namespace) -> dict[str, Any]:
+    """Compare accounts polling in lockstep with polls spread by the scheduler.
+
+    ``--accounts`` coordinators, each with its own client and a share of
+    ``--devices``, start together as after a Home Assistant restart. The
+    five-minute poll interval is scaled down to ``--spread-period``
+    seconds; requests are counted over two periods after the first poll.
+    Requests take ``--spread-latency`` seconds, longer than the sub-second
+    jitter Home Assistant adds to each coordinator's timer, so accounts
+    polling in the same second overlap as they do against the real cloud.
+    """
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.core import HomeAssistant
+
+    coordinator_module = load("coordinator")
+    fleet = load("fleet")
+    period = timedelta(seconds=args.spread_period)
+    scan_interval = coordinator_module.SCAN_INTERVAL
+    coordinator_module.SCAN_INTERVAL = fleet.SCAN_INTERVAL = period
+
+    per_account = max(args.devices // args.accounts, 1)
+    cloud = MockSalusCloud(
+        MockCloudConfig(devices=per_account * args.accounts, latency=args.spread_latency)
+    )
+    await cloud.start()
+    device_ids = sorted(cloud.devices)
+    results: dict[str, Any] = {
+        "accounts": args.accounts,
+        "devices_per_account": per_account,
+        "period_seconds": args.spread_period,
+    }
+    try:
+        for mode in ("lockstep", "spread"):
+            hass = HomeAssistant(tempfile.gettempdir())
+            scheduler = fleet.SalusPollScheduler(hass)
+            apis = []
+            coordinators = []
+            for index in range(args.accounts):
+                # Every client logs in on its own, as separate accounts do
+                api = await client(cloud)
+                apis.append(api)
+                coordinator = coordinator_module.SalusAccountCoordinator(hass, api)
+                # Polls are only scheduled while someone listens
+                coordinator.async_add_listener(lambda: None)
+                coordinators.append(coordinator)
+                for device_id in device_ids[index * per_account:(index + 1) * per_account]:
+                    if mode == "spread":
+                        scheduler.async_add_device(device_id, coordinator)
+                    coordinator.device_ids.add(device_id)
+            await asyncio.gather(*(coordinator.async_refresh() for coordinator in coordinators))
+            cloud.stats.reset()
+            await asyncio.sleep(args.spread_period * 2)
+            times = sorted(cloud.stats.request_times)
+            results[mode] = {
+                "data_requests": cloud.stats.requests["/public/ajax_device_values.php"],
+                "peak_concurrent_requests": cloud.stats.peak_in_flight,
+                "peak_requests_per_second": max(
+                    (
+                        sum(1 for other in times[index:] if other - time_ < 1)
+                        for index, time_ in enumerate(times)
+                    ),
+                    default=0,
+                ),
+            }
+            if mode == "spread":
+                results[mode]["scheduler"] = scheduler.as_dict(device_ids[0])
+            for coordinator in coordinators:
+                await coordinator.async_shutdown()
+            for api in apis:
+                await api.close()
+            await hass.async_stop(force=True)
+    finally:
+        coordinator_module.SCAN_INTERVAL = fleet.SCAN_INTERVAL = scan_interval
+        await cloud.stop()
+    return results
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Run every benchmark that the installed packages allow."""
+    results: dict[str, Any] = {
+        "polling": await bench_polling(args),
+        "session_expiry": await bench_session_expiry(args),
+        "outage": await bench_outage(args),
+        "memory": await bench_memory(args),
+    }
+    if has_homeassistant():
+        results["writes"] = await bench_writes(args)
+        results["startup"] = await bench_startup(args)
+        results["recorder"] = await bench_recorder(args)
+        results["schedule"] = await bench_schedule(args)
+        results["fleet"] = await bench_fleet(args)
+        results["reload"] = await bench_reload(args)
+        results["spread"] = await bench_spread(args)
+    else:
+        results["writes"] = "skipped: homeassistant is not installed"
+        results["startup"] = "skipped: homeassistant is not installed"
+        results["recorder"] = "skipped: homeassistant is not installed"
+        results["schedule"] = "skipped: homeassistant is not installed"
+        results["fleet"] = "skipped: homeassistant is not installed"
+        results["reload"] = "skipped: homeassistant is not installed"
+        results["spread"] = "skipped: homeassistant is not installed"
+    return results
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Return the benchmark options, the defaults for an empty list."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=10)
+    parser.add_argument("--polls", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds per request")
+    parser.add_argument("--jitter", type=float, default=0.01, help="extra random seconds")
+    parser.add_argument("--burst", type=int, default=10, help="setpoint steps per burst")
+    parser.add_argument(
+        "--step-delay", type=float, default=0.5, help="seconds between setpoint steps"
+    )
+    parser.add_argument("--reloads", type=int, default=20, help="reloads of every entry")
+    parser.add_argument("--accounts", type=int, default=5, help="accounts polling at once")
+    parser.add_argument(
+        "--spread-period", type=float, default=10, help="seconds standing in for 5 minutes"
+    )
+    parser.add_argument(
+        "--spread-latency",
+        type=float,
+        default=1.0,
+        help="seconds per request in the spread benchmark",
+    )
+    parser.add_argument("--json", type=Path, help="also write the results to this file")
+    return parser.parse_args(argv)
+
+
+def main() -> None:
+    """Parse arguments, run the benchmarks and print the results."""
+    args = parse_args()
+    results = asyncio.run(run(args))
+    print(json.dumps(results, indent=2))
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""Local stand-in for the SALUS cloud at salus-it500.com.
+
+Implements the endpoints the integration talks to (login.php, control.php,
+devices.php, ajax_device_values.php and set.php) closely enough to run the
+real client against it, with knobs for latency, errors, session expiry,
+rate limiting and many devices. It counts every request, connection and
+login so benchmarks can assert on traffic.
+
+Run standalone with ``python benchmarks/mock_cloud.py --devices 10``.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from dataclasses import dataclass, field
+import hashlib
+import json
+import random
+import secrets
+import time
+from typing import Any
+
+from aiohttp import web
+
+LOGIN_PAGE = (
+    '<html><body><form method="post" action="/public/login.php">'
+    '<input name="IDemail"><input name="password" type="password">'
+    "</form></body></html>"
+)
+
+# set.php field -> payload field it updates
+SET_FIELDS = {
+    "current_tempZ1_set": "CH1currentSetPoint",
+    "auto": "CH1heatOnOff",
+    "frost_tempZ1_set": "CH1frostProtectionTemp",
+    "holiday": "holidayEnabled",
+}
+
+
+@dataclass
+class MockCloudConfig:
+    """Behaviour of the mock cloud."""
+
+    username: str = "user@example.com"
+    password: str = "secret"
+    devices: int = 1
+    # Seconds added to every response, plus up to ``jitter`` at random
+    latency: float = 0.0
+    jitter: float = 0.0
+    # Share of data and set requests answered with ``error_status``
+    error_rate: float = 0.0
+    # 503s carry no Retry-After, like an overloaded backend's
+    error_status: int = 500
+    # Sessions expire after this many seconds; None keeps them forever
+    session_ttl: float | None = None
+    # More requests than this per second are answered with a 429
+    rate_limit: int | None = None
+    retry_after: int = 30
+    # Answer multi-field set.php requests with a 400
+    reject_combined_writes: bool = False
+    # Extra fields per payload, to mimic the full cloud response
+    padding_fields: int = 60
+    seed: int = 0
+
+
+@dataclass
+class MockCloudStats:
+    """Traffic seen by the mock cloud."""
+
+    requests: Counter = field(default_factory=Counter)
+    statuses: Counter = field(default_factory=Counter)
+    logins: int = 0
+    connections: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    request_times: list[float] = field(default_factory=list)
+
+    @property
+    def total_requests(self) -> int:
+        """Return the number of requests over all endpoints."""
+        return sum(self.requests.values())
+
+    def reset(self) -> None:
+        """Forget all counters."""
+        self.requests.clear()
+        self.statuses.clear()
+        self.logins = 0
+        self.connections = 0
+        self.peak_in_flight = self.in_flight
+        self.request_times.clear()
+
+
+class MockSalusCloud:
+    """aiohttp application emulating the SALUS cloud."""
+
+    def __init__(self, config: MockCloudConfig | None = None) -> None:
+        """Initialize the mock cloud."""
+        self.config = config or MockCloudConfig()
+        self.stats = MockCloudStats()
+        self.devices: dict[str, dict[str, Any]] = {}
+        # Devices whose requests fail with a 500, as when offline
+        self.offline_devices: set[str] = set()
+        self._sessions: dict[str, float] = {}
+        self._transports: set[int] = set()
+        self._window: list[float] = []
+        self._random = random.Random(self.config.seed)
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+        for index in range(self.config.devices):
+            self.add_device(str(100000 + index))
+
+    def add_device(self, device_id: str) -> None:
+        """Register a device with plausible values on the account."""
+        payload: dict[str, Any] = {
+            "CH1currentRoomTemp": f"{self._random.uniform(17, 22):.1f}",
+            "CH1currentSetPoint": "20.0",
+            "CH1heatOnOff": "1",
+            "CH1heatOnOffStatus": "0",
+            "CH1scheduleOn": "0",
+            "CH1autoOff": "0",
+            "CH1frostProtectionTemp": "5.0",
+            "holidayEnabled": "0",
+            "CH1tempLowAlarmStatus": "0",
+            "CH1tempHighAlarmStatus": "0",
+            "progMode": "0",
+        }
+        for index in range(self.config.padding_fields):
+            payload[f"CH1unusedField{index}"] = str(index)
+        self.devices[device_id] = payload
+
+    def expire_sessions(self) -> None:
+        """Invalidate every session, as the cloud does after inactivity."""
+        self._sessions.clear()
+
+    async def start(self, host: str = "localhost", port: int = 0) -> str:
+        """Start serving and return the base URL."""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_post("/public/login.php", self._login)
+        app.router.add_post("/public/control.php", self._control)
+        app.router.add_get("/public/devices.php", self._device_list)
+        app.router.add_get("/public/ajax_device_values.php", self._device_values)
+        app.router.add_post("/includes/set.php", self._set)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]  # pylint: disable=protected-access
+        self.url = f"http://{host}:{port}"
+        return self.url
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        """Count traffic, add latency and apply rate limiting."""
+        stats = self.stats
+        stats.requests[request.path] += 1
+        if (transport := id(request.transport)) not in self._transports:
+            self._transports.add(transport)
+            stats.connections += 1
+        stats.in_flight += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        now = time.monotonic()
+        stats.request_times.append(now)
+        try:
+            if self.config.latency or self.config.jitter:
+                await asyncio.sleep(
+                    self.config.latency + self._random.uniform(0, self.config.jitter)
+                )
+            if self.config.rate_limit is not None:
+                self._window = [t for t in self._window if now - t < 1]
+                self._window.append(now)
+                if len(self._window) > self.config.rate_limit:
+                    response = web.Response(
+                        status=429, headers={"Retry-After": str(self.config.retry_after)}
+                    )
+                    stats.statuses[response.status] += 1
+                    return response
+            response = await handler(request)
+            stats.statuses[response.status] += 1
+            return response
+        finally:
+            stats.in_flight -= 1
+
+    def _session_valid(self, request: web.Request) -> bool:
+        """Return True if the request carries a live session cookie."""
+        if (started := self._sessions.get(request.cookies.get("PHPSESSID", ""))) is None:
+            return False
+        if self.config.session_ttl is None:
+            return True
+        return time.monotonic() - started < self.config.session_ttl
+
+    def _error_response(self) -> web.Response:
+        """Return the response of a failing backend."""
+        return web.Response(status=self.config.error_status, text="Server Error")
+
+    def _inject_error(self) -> bool:
+        """Return True if this request should fail with a server error."""
+        return self._random.random() < self.config.error_rate
+
+    async def _login(self, request: web.Request) -> web.Response:
+        """Handle login.php: redirect with a session cookie on success."""
+        form = await request.post()
+        password_hash = hashlib.md5(self.config.password.encode()).hexdigest()
+        if form.get("IDemail") != self.config.username or form.get("password") != password_hash:
+            return web.Response(text=LOGIN_PAGE, content_type="text/html")
+        self.stats.logins += 1
+        session_id = secrets.token_hex(16)
+        self._sessions[session_id] = time.monotonic()
+        response = web.Response(status=302, headers={"Location": "/public/devices.php"})
+        response.set_cookie("PHPSESSID", session_id)
+        return response
+
+    async def _control(self, request: web.Request) -> web.Response:
+        """Handle control.php: the device page embedding the token."""
+        if not self._session_valid(request):
+            raise web.HTTPFound("/public/login.php")
+        return web.Response(
+            text=f'<html><input id="token" type="hidden" value="{secrets.token_hex(8)}"></html>',
+            content_type="text/html",
+        )
+
+    async def _device_list(self, request: web.Request) -> web.Response:
+        """Handle devices.php: links to every device of the account."""
+        if not self._session_valid(request):
+            raise web.HTTPFound("/public/login.php")
+        links = "".join(
+            f'<a href="control.php?devId={device_id}">{device_id}</a>'
+            for device_id in self.devices
+        )
+        return web.Response(text=f"<html>{links}</html>", content_type="text/html")
+
+    async def _device_values(self, request: web.Request) -> web.Response:
+        """Handle ajax_device_values.php: the device payload as JSON."""
+        if not self._session_valid(request):
+            raise web.HTTPFound("/public/login.php")
+        if self._inject_error() or request.query.get("devId") in self.offline_devices:
+            return self._error_response()
+        if (payload := self.devices.get(request.query.get("devId", ""))) is None:
+            return web.Response(text="{}", content_type="application/json")
+        return web.Response(text=json.dumps(payload), content_type="application/json")
+
+    async def _set(self, request: web.Request) -> web.Response:
+        """Handle set.php: apply the posted fields to the device."""
+        if not self._session_valid(request):
+            raise web.HTTPFound("/public/login.php")
+        form = await request.post()
+        if self._inject_error() or form.get("devId") in self.offline_devices:
+            return self._error_response()
+        fields = [name for name in form if name in SET_FIELDS]
+        if self.config.reject_combined_writes and len(fields) > 1:
+            return web.Response(status=400, text="error")
+        if (payload := self.devices.get(form.get("devId", ""))) is None:
+            return web.Response(status=400, text="error")
+        for name in fields:
+            payload[SET_FIELDS[name]] = str(form[name])
+        # The relay follows the setpoint like a real thermostat would
+        try:
+            demand = float(payload["CH1currentSetPoint"]) > float(payload["CH1currentRoomTemp"])
+        except ValueError:
+            demand = False
+        payload["CH1heatOnOffStatus"] = "1" if demand and payload["CH1heatOnOff"] == "1" else "0"
+        return web.Response(text="success")
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """Run the mock cloud until interrupted."""
+    cloud = MockSalusCloud(
+        MockCloudConfig(
+            devices=args.devices,
+            latency=args.latency,
+            error_rate=args.error_rate,
+            error_status=args.error_status,
+            session_ttl=args.session_ttl,
+        )
+    )
+    url = await cloud.start(port=args.port)
+    print(f"Mock SALUS cloud on {url} with devices {', '.join(cloud.devices)}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await cloud.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--devices", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--session-ttl", type=float, default=None)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
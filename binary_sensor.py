@@ -10,9 +10,9 @@ from homeassistant.components.binary_sensor import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
+from .entity import SalusEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,6 +25,8 @@ async def async_setup_entry(
     """Set up SALUS RT310i binary sensor platform."""
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
     device_id = hass.data[DOMAIN][entry.entry_id]["device_id"]
+    # Restored at startup from the saved snapshot until the first poll
+    state = coordinator.last_known_state(device_id)
     
     sensors = [
         SalusHeatingSensor(coordinator, device_id),
@@ -33,10 +35,10 @@ async def async_setup_entry(
     ]
     
     # Add optional sensors
-    if coordinator.data.get("holidayEnabled") is not None:
+    if state.holiday_enabled is not None:
         sensors.append(SalusHolidayModeSensor(coordinator, device_id))
     
-    if coordinator.data.get("CH1tempLowAlarmStatus") is not None:
+    if state.low_temp_alarm is not None:
         sensors.extend([
             SalusLowTempAlarmSensor(coordinator, device_id),
             SalusHighTempAlarmSensor(coordinator, device_id),
@@ -45,31 +47,27 @@ async def async_setup_entry(
     async_add_entities(sensors)
 
 
-class SalusBaseBinarySensor(CoordinatorEntity, BinarySensorEntity):
+class SalusBaseBinarySensor(SalusEntity, BinarySensorEntity):
     """Base class for SALUS binary sensors."""
 
     def __init__(self, coordinator, device_id, sensor_type: str, name: str):
         """Initialize the binary sensor."""
-        super().__init__(coordinator)
-        self._device_id = device_id
+        super().__init__(coordinator, device_id)
         self._sensor_type = sensor_type
         self._attr_name = name
         self._attr_unique_id = f"salus_{device_id}_{sensor_type}"
 
-    @property
-    def device_info(self):
-        """Return device information."""
-        return {
-            "identifiers": {(DOMAIN, self._device_id)},
-            "name": f"SALUS RT310i {self._device_id}",
-            "manufacturer": "SALUS",
-            "model": "RT310i",
-        }
-
 
 class SalusHeatingSensor(SalusBaseBinarySensor):
     """Binary sensor for heating status."""
 
+    _state_fields = (
+        "heating_enabled",
+        "relay_on",
+        "current_temperature",
+        "target_temperature",
+    )
+
     def __init__(self, coordinator, device_id):
         """Initialize the sensor."""
         super().__init__(coordinator, device_id, "heating", "Heating")
@@ -78,62 +76,82 @@ class SalusHeatingSensor(SalusBaseBinarySensor):
     @property
     def is_on(self) -> bool:
         """Return true if heating is active."""
-        if self.coordinator.data:
-            # Check both heating on and relay status
-            heating_on = self.coordinator.data.get("CH1heatOnOff", "0")
-            relay_on = self.coordinator.data.get("CH1heatOnOffStatus", "0")
-            return heating_on == "1" and relay_on == "1"
-        return False
+        if (state := self.device_state) is None:
+            return False
+        # Check both heating on and relay status
+        return bool(state.heating_enabled) and state.relay_on
 
     @property
     def extra_state_attributes(self):
         """Return additional attributes."""
-        if self.coordinator.data:
-            current_temp = self.coordinator.data.get("CH1currentRoomTemp")
-            target_temp = self.coordinator.data.get("CH1currentSetPoint")
-            
-            attrs = {
-                "relay_status": self.coordinator.data.get("CH1heatOnOffStatus") == "1",
-            }
-            
-            if current_temp and target_temp:
-                try:
-                    diff = float(target_temp) - float(current_temp)
-                    attrs["temperature_difference"] = round(diff, 1)
-                except (ValueError, TypeError):
-                    pass
-            
-            return attrs
-        return {}
+        if (state := self.device_state) is None:
+            return {}
+        
+        attrs = {
+            "relay_status": state.relay_on,
+        }
+        
+        if state.current_temperature is not None and state.target_temperature is not None:
+            diff = state.target_temperature - state.current_temperature
+            attrs["temperature_difference"] = round(diff, 1)
+        
+        return attrs
 
 
 class SalusConnectionSensor(SalusBaseBinarySensor):
     """Binary sensor for connection status."""
 
+    # Change with nearly every poll; the diagnostics download has them too
+    _unrecorded_attributes = frozenset(
+        {
+            "last_success",
+            "poll_interval",
+            "poll_reason",
+            "circuit_breaker",
+            "consecutive_failures",
+        }
+    )
+
     def __init__(self, coordinator, device_id):
         """Initialize the sensor."""
         super().__init__(coordinator, device_id, "connection", "Connection")
         self._attr_device_class = BinarySensorDeviceClass.CONNECTIVITY
 
+    @property
+    def available(self) -> bool:
+        """Return True; the connection state is known even while offline."""
+        return True
+
     @property
     def is_on(self) -> bool:
-        """Return true if connected."""
-        return self.coordinator.last_update_success
+        """Return true if the last poll reached the device."""
+        return (
+            self.coordinator.last_update_success
+            and self.device_state is not None
+            and self._device_id not in self.coordinator.stale_devices
+        )
 
     @property
     def extra_state_attributes(self):
         """Return additional attributes."""
         attrs = {}
-        if self.coordinator.last_update_success_time:
-            attrs["last_success"] = self.coordinator.last_update_success_time.isoformat()
+        if (last_fetched := self.coordinator.last_fetched(self._device_id)) is not None:
+            attrs["last_success"] = last_fetched.isoformat()
         if hasattr(self.coordinator, 'last_exception') and self.coordinator.last_exception:
             attrs["last_error"] = str(self.coordinator.last_exception)
+        attrs["poll_interval"] = self.coordinator.update_interval.total_seconds()
+        attrs["poll_reason"] = self.coordinator.poll_reason
+        breaker = self.coordinator.api.circuit_breaker
+        attrs["circuit_breaker"] = breaker.state
+        attrs["consecutive_failures"] = breaker.failures
         return attrs
 
 
 class SalusScheduleSensor(SalusBaseBinarySensor):
     """Binary sensor for schedule status."""
 
+    _state_fields = ("schedule_on", "program_mode")
+
     def __init__(self, coordinator, device_id):
         """Initialize the sensor."""
         super().__init__(coordinator, device_id, "schedule", "Schedule Active")
@@ -142,23 +160,25 @@ class SalusScheduleSensor(SalusBaseBinarySensor):
     @property
     def is_on(self) -> bool:
         """Return true if schedule is enabled."""
-        if self.coordinator.data:
-            return self.coordinator.data.get("CH1scheduleOn") == "1"
-        return False
+        if (state := self.device_state) is None:
+            return False
+        return state.schedule_on is True
 
     @property
     def extra_state_attributes(self):
         """Return additional attributes."""
-        if self.coordinator.data:
-            return {
-                "program_mode": self.coordinator.data.get("progMode", "unknown"),
-            }
-        return {}
+        if (state := self.device_state) is None:
+            return {}
+        return {
+            "program_mode": state.program_mode or "unknown",
+        }
 
 
 class SalusHolidayModeSensor(SalusBaseBinarySensor):
     """Binary sensor for holiday mode."""
 
+    _state_fields = ("holiday_enabled",)
+
     def __init__(self, coordinator, device_id):
         """Initialize the sensor."""
         super().__init__(coordinator, device_id, "holiday_mode", "Holiday Mode")
@@ -167,14 +187,16 @@ class SalusHolidayModeSensor(SalusBaseBinarySensor):
     @property
     def is_on(self) -> bool:
         """Return true if holiday mode is enabled."""
-        if self.coordinator.data:
-            return self.coordinator.data.get("holidayEnabled") == "1"
-        return False
+        if (state := self.device_state) is None:
+            return False
+        return state.holiday_enabled is True
 
 
 class SalusLowTempAlarmSensor(SalusBaseBinarySensor):
     """Binary sensor for low temperature alarm."""
 
+    _state_fields = ("low_temp_alarm",)
+
     def __init__(self, coordinator, device_id):
         """Initialize the sensor."""
         super().__init__(coordinator, device_id, "low_temp_alarm", "Low Temperature Alarm")
@@ -183,14 +205,16 @@ class SalusLowTempAlarmSensor(SalusBaseBinarySensor):
     @property
     def is_on(self) -> bool:
         """Return true if low temperature alarm is active."""
-        if self.coordinator.data:
-            return self.coordinator.data.get("CH1tempLowAlarmStatus") == "1"
-        return False
+        if (state := self.device_state) is None:
+            return False
+        return state.low_temp_alarm is True
 
 
 class SalusHighTempAlarmSensor(SalusBaseBinarySensor):
     """Binary sensor for high temperature alarm."""
 
+    _state_fields = ("high_temp_alarm",)
+
     def __init__(self, coordinator, device_id):
         """Initialize the sensor."""
         super().__init__(coordinator, device_id, "high_temp_alarm", "High Temperature Alarm")
@@ -199,6 +223,6 @@ class SalusHighTempAlarmSensor(SalusBaseBinarySensor):
     @property
     def is_on(self) -> bool:
         """Return true if high temperature alarm is active."""
-        if self.coordinator.data:
-            return self.coordinator.data.get("CH1tempHighAlarmStatus") == "1"
-        return False
+        if (state := self.device_state) is None:
+            return False
+        return state.high_temp_alarm is True
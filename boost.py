@@ -0,0 +1,254 @@
+"""Timed setpoint boosts for SALUS RT310i devices."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import logging
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, FIELD_SETPOINT
+from .coordinator import SalusAccountCoordinator
+from .storage import SalusBoostStore
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_BOOST_MANAGER = f"{DOMAIN}_boost_manager"
+
+# Boosts that ended while Home Assistant was down are undone this long
+# after the first device comes back, so entries set up together share writes
+RESTORE_DELAY = timedelta(seconds=5)
+
+# Boosts ending this close to the earliest one end with it
+EXPIRY_WINDOW = timedelta(seconds=1)
+
+# Boosts whose previous setpoint could not be written back are tried again
+RETRY_DELAY = timedelta(minutes=1)
+
+
+@dataclass(slots=True)
+class Boost:
+    """A raised setpoint and when to put the previous one back."""
+
+    previous: float | None
+    setpoint: float
+    expires: datetime
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the boost for storage and diagnostics."""
+        return {
+            "previous": self.previous,
+            "setpoint": self.setpoint,
+            "expires": self.expires.isoformat(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Boost | None:
+        """Return a saved boost, or None if it cannot be read."""
+        if (expires := dt_util.parse_datetime(data.get("expires", ""))) is None:
+            return None
+        return cls(data.get("previous"), data["setpoint"], expires)
+
+
+class SalusBoostManager:
+    """End the boosts of every device with a single timer.
+
+    The timer is set for the earliest expiry over all devices. When it
+    fires, every boost due is undone with one batched write per account,
+    verified by one read. A boost is forgotten only once its previous
+    setpoint was written; failed writes are tried again after RETRY_DELAY.
+    A second boost of a boosted device extends it and keeps the setpoint
+    from before the first one.
+    """
+
+    def __init__(self, hass: HomeAssistant, store: SalusBoostStore) -> None:
+        """Initialize with the boosts saved before the restart."""
+        self.hass = hass
+        self._store = store
+        self.boosts: dict[str, Boost] = {
+            device_id: boost
+            for device_id, data in store.boosts.items()
+            if (boost := Boost.from_dict(data)) is not None
+        }
+        self._coordinators: dict[str, SalusAccountCoordinator] = {}
+        # Previous setpoints being written back, and when to retry failed ones
+        self._ending: dict[str, float] = {}
+        self._retry_at: dict[str, datetime] = {}
+        self._unsub_timer: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_add_device(
+        self, device_id: str, coordinator: SalusAccountCoordinator
+    ) -> CALLBACK_TYPE:
+        """Let the manager end a device's boosts until the returned callback."""
+        self._coordinators[device_id] = coordinator
+        self._async_schedule(restoring=True)
+
+        @callback
+        def remove_device() -> None:
+            self._coordinators.pop(device_id, None)
+            self._async_schedule()
+
+        return remove_device
+
+    @callback
+    def async_boost(
+        self,
+        device_id: str,
+        current: float | None,
+        setpoint: float,
+        duration: timedelta,
+    ) -> bool:
+        """Start or extend a boost; return True if the setpoint must be written."""
+        expires = dt_util.utcnow() + duration
+        if (boost := self.boosts.get(device_id)) is not None:
+            # Extend the boost instead of stacking a second one on top; one
+            # that is being ended may already have its previous setpoint back
+            changed = boost.setpoint != setpoint or device_id in self._ending
+            self._retry_at.pop(device_id, None)
+            boost.setpoint = setpoint
+            boost.expires = max(boost.expires, expires)
+        else:
+            changed = True
+            boost = self.boosts[device_id] = Boost(current, setpoint, expires)
+        _LOGGER.info(
+            "Boosting device %s to %s until %s", device_id, setpoint, boost.expires
+        )
+        self._store.async_set(device_id, boost.as_dict())
+        self._async_schedule()
+        return changed
+
+    @callback
+    def async_defer(self, device_id: str, setpoint: float) -> bool:
+        """Restore ``setpoint`` when a running boost ends; False if not boosted."""
+        if (boost := self.boosts.get(device_id)) is None:
+            return False
+        boost.previous = setpoint
+        self._store.async_set(device_id, boost.as_dict())
+        return True
+
+    @callback
+    def async_cancel(self, device_id: str) -> None:
+        """Forget a device's boost without restoring its setpoint."""
+        self._retry_at.pop(device_id, None)
+        if self.boosts.pop(device_id, None) is not None:
+            self._store.async_remove(device_id)
+            self._async_schedule()
+
+    @callback
+    def _async_schedule(self, restoring: bool = False) -> None:
+        """Set the timer for the earliest expiry of a set-up device."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        expiries = [
+            self._retry_at.get(device_id, boost.expires)
+            for device_id, boost in self.boosts.items()
+            if device_id in self._coordinators and device_id not in self._ending
+        ]
+        if not expiries:
+            return
+        if restoring and (when := min(expiries)) <= (now := dt_util.utcnow()):
+            # Ended during a restart: wait for the other entries to come back
+            when = now + RESTORE_DELAY
+        else:
+            when = min(expiries)
+        self._unsub_timer = async_track_point_in_utc_time(
+            self.hass, self._async_expire, when
+        )
+
+    async def _async_expire(self, now: datetime) -> None:
+        """Undo every boost that is due, one batch per account."""
+        self._unsub_timer = None
+        batches: dict[SalusAccountCoordinator, dict[str, dict[str, Any]]] = {}
+        ended = []
+        for device_id, boost in list(self.boosts.items()):
+            if (
+                device_id in self._ending
+                or device_id not in self._coordinators
+                or self._retry_at.get(device_id, boost.expires) > now + EXPIRY_WINDOW
+            ):
+                continue
+            if boost.previous is None:
+                # Only boosts saved before the service required a known
+                # setpoint lack one; the boosted setpoint stays
+                _LOGGER.warning(
+                    "Boost of %s ended, but its previous setpoint is unknown; "
+                    "leaving the setpoint at %s",
+                    device_id,
+                    boost.setpoint,
+                )
+                del self.boosts[device_id]
+                ended.append(device_id)
+                continue
+            self._ending[device_id] = boost.previous
+            batches.setdefault(self._coordinators[device_id], {})[device_id] = {
+                FIELD_SETPOINT: boost.previous
+            }
+        self._store.async_remove(*ended)
+        self._async_schedule()
+        await asyncio.gather(
+            *(
+                self._async_end(coordinator, writes, now)
+                for coordinator, writes in batches.items()
+            )
+        )
+
+    async def _async_end(
+        self,
+        coordinator: SalusAccountCoordinator,
+        writes: dict[str, dict[str, Any]],
+        now: datetime,
+    ) -> None:
+        """Write back the previous setpoints of one account's boosts."""
+        _LOGGER.info("Ending boosts of %s", ", ".join(writes))
+        try:
+            results: dict[str, bool | Exception] = await coordinator.async_write_devices(
+                writes
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            results = dict.fromkeys(writes, err)
+        ended = []
+        for device_id, result in results.items():
+            previous = self._ending.pop(device_id, None)
+            if (boost := self.boosts.get(device_id)) is None:
+                # Cancelled meanwhile
+                continue
+            if boost.expires > now + EXPIRY_WINDOW:
+                # Extended while writing; the new boost setpoint was written
+                continue
+            if result is not True:
+                _LOGGER.warning(
+                    "Could not end the boost of %s, trying again in %s",
+                    device_id,
+                    RETRY_DELAY,
+                )
+                self._retry_at[device_id] = now + RETRY_DELAY
+            elif boost.previous == previous:
+                del self.boosts[device_id]
+                self._retry_at.pop(device_id, None)
+                ended.append(device_id)
+            # Otherwise a schedule moved the setpoint to restore while
+            # writing, and the boost is ended again right away
+        self._store.async_remove(*ended)
+        self._async_schedule()
+
+    def as_dict(self, device_id: str) -> dict[str, Any] | None:
+        """Return a device's boost for diagnostics."""
+        if (boost := self.boosts.get(device_id)) is None:
+            return None
+        return boost.as_dict()
+
+
+@callback
+def async_get_boost_manager(
+    hass: HomeAssistant, store: SalusBoostStore
+) -> SalusBoostManager:
+    """Return the boost manager shared by all entries."""
+    if (manager := hass.data.get(DATA_BOOST_MANAGER)) is None:
+        manager = hass.data[DATA_BOOST_MANAGER] = SalusBoostManager(hass, store)
+    return manager
@@ -5,6 +5,7 @@ import logging
 from typing import Any
 
 from homeassistant.components.climate import (
+    ATTR_HVAC_MODE,
     ClimateEntity,
     ClimateEntityFeature,
     HVACMode,
@@ -13,17 +14,17 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     DOMAIN,
-    ATTR_CURRENT_TEMP,
-    ATTR_TARGET_TEMP,
-    ATTR_HEATING_ON,
     DEFAULT_MIN_TEMP,
     DEFAULT_MAX_TEMP,
     DEFAULT_TEMP_STEP,
+    FIELD_AUTO,
+    FIELD_SETPOINT,
 )
+from .entity import SalusEntity
+from .salus_api import hvac_mode_value
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -38,12 +39,15 @@ async def async_setup_entry(
     api = hass.data[DOMAIN][entry.entry_id]["api"]
     device_id = hass.data[DOMAIN][entry.entry_id]["device_id"]
     
-    async_add_entities([SalusClimate(coordinator, api, device_id)])
+    write_queue = hass.data[DOMAIN][entry.entry_id]["write_queue"]
+    
+    async_add_entities([SalusClimate(coordinator, api, device_id, write_queue)])
 
 
-class SalusClimate(CoordinatorEntity, ClimateEntity):
+class SalusClimate(SalusEntity, ClimateEntity):
     """Representation of a SALUS RT310i thermostat."""
 
+    _state_fields = ("current_temperature", "target_temperature", "heating_enabled")
     _attr_has_entity_name = True
     _attr_temperature_unit = UnitOfTemperature.CELSIUS
     _attr_supported_features = (
@@ -51,57 +55,38 @@ class SalusClimate(CoordinatorEntity, ClimateEntity):
     )
     _attr_hvac_modes = [HVACMode.OFF, HVACMode.HEAT]
 
-    def __init__(self, coordinator, api, device_id):
+    def __init__(self, coordinator, api, device_id, write_queue):
         """Initialize the thermostat."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, device_id)
         self._api = api
-        self._device_id = device_id
+        self._write_queue = write_queue
         
         self._attr_unique_id = f"salus_{device_id}"
         self._attr_name = f"RT310i {device_id}"
 
-    @property
-    def device_info(self):
-        """Return device information."""
-        return {
-            "identifiers": {(DOMAIN, self._device_id)},
-            "name": self._attr_name,
-            "manufacturer": "SALUS",
-            "model": "RT310i",
-        }
-
     @property
     def current_temperature(self) -> float | None:
         """Return the current temperature."""
-        if self.coordinator.data and ATTR_CURRENT_TEMP in self.coordinator.data:
-            try:
-                temp = self.coordinator.data[ATTR_CURRENT_TEMP]
-                # Temperature might be in format "21.5" or similar
-                return float(temp) if temp else None
-            except (ValueError, TypeError):
-                _LOGGER.warning("Invalid current temperature value: %s", temp)
-                return None
-        return None
+        if (state := self.device_state) is None:
+            return None
+        return state.current_temperature
 
     @property
     def target_temperature(self) -> float | None:
         """Return the temperature we try to reach."""
-        if self.coordinator.data and ATTR_TARGET_TEMP in self.coordinator.data:
-            try:
-                temp = self.coordinator.data[ATTR_TARGET_TEMP]
-                return float(temp) if temp else None
-            except (ValueError, TypeError):
-                _LOGGER.warning("Invalid target temperature value: %s", temp)
-                return None
-        return None
+        if (pending := self._write_queue.pending.get(FIELD_SETPOINT)) is not None:
+            return pending
+        if (state := self.device_state) is None:
+            return None
+        return state.target_temperature
 
     @property
     def hvac_mode(self) -> HVACMode:
         """Return current HVAC mode."""
-        if self.coordinator.data and ATTR_HEATING_ON in self.coordinator.data:
-            # The API returns "1" for on, "0" for off
-            heating_on = str(self.coordinator.data.get(ATTR_HEATING_ON, "0"))
-            return HVACMode.HEAT if heating_on == "1" else HVACMode.OFF
+        if (pending := self._write_queue.pending.get(FIELD_AUTO)) is not None:
+            return HVACMode.HEAT if pending == "1" else HVACMode.OFF
+        if (state := self.device_state) is not None and state.heating_enabled:
+            return HVACMode.HEAT
         return HVACMode.OFF
 
     @property
@@ -125,11 +110,15 @@ class SalusClimate(CoordinatorEntity, ClimateEntity):
         if temperature is None:
             return
 
-        await self._api.set_temperature(temperature)
-        await self.coordinator.async_request_refresh()
+        fields: dict[str, Any] = {FIELD_SETPOINT: temperature}
+        if (hvac_mode := kwargs.get(ATTR_HVAC_MODE)) is not None:
+            fields[FIELD_AUTO] = hvac_mode_value(hvac_mode)
+
+        # Show the new target right away; bursts are coalesced into one write
+        await self._write_queue.async_set_values(**fields)
+        self.async_write_ha_state()
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set new target hvac mode."""
-        mode = "heat" if hvac_mode == HVACMode.HEAT else "off"
-        await self._api.set_hvac_mode(mode)
-        await self.coordinator.async_request_refresh()
+        await self._write_queue.async_set_values(**{FIELD_AUTO: hvac_mode_value(hvac_mode)})
+        self.async_write_ha_state()
@@ -8,11 +8,20 @@ import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import DOMAIN, CONF_DEVICE_ID
+from .const import (
+    DOMAIN,
+    CONF_DEVICE_ID,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_PROFILING,
+    CONF_STALE_WINDOW,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_STALE_WINDOW,
+)
 from .salus_api import SalusAPI
+from .session import async_get_circuit_breaker, async_get_connector
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,6 +39,14 @@ class SalusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> SalusOptionsFlow:
+        """Get the options flow for this handler."""
+        return SalusOptionsFlow(config_entry)
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -37,17 +54,22 @@ class SalusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors: dict[str, str] = {}
 
         if user_input is not None:
+            # Test the credentials
+            api = SalusAPI(
+                user_input[CONF_USERNAME],
+                user_input[CONF_PASSWORD],
+                user_input[CONF_DEVICE_ID],
+                async_get_connector(self.hass),
+                circuit_breaker=async_get_circuit_breaker(self.hass),
+            )
             try:
-                # Test the credentials
-                api = SalusAPI(
-                    user_input[CONF_USERNAME],
-                    user_input[CONF_PASSWORD],
-                    user_input[CONF_DEVICE_ID],
-                )
-                
                 login_success = await api.login()
+                device_ids = await api.get_device_ids() if login_success else []
                 
-                if login_success:
+                if device_ids and user_input[CONF_DEVICE_ID] not in device_ids:
+                    # The account's device list is known and lacks this id
+                    errors["base"] = "invalid_device"
+                elif login_success:
                     # Use device_id as unique_id
                     await self.async_set_unique_id(user_input[CONF_DEVICE_ID])
                     self._abort_if_unique_id_configured()
@@ -62,9 +84,50 @@ class SalusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             except Exception:  # pylint: disable=broad-except
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "cannot_connect"
+            finally:
+                await api.close()
 
         return self.async_show_form(
             step_id="user",
             data_schema=STEP_USER_DATA_SCHEMA,
             errors=errors,
         )
+
+
+class SalusOptionsFlow(config_entries.OptionsFlow):
+    """Handle SALUS RT310i options."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize the options flow."""
+        self._entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the polling options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_MAX_SCAN_INTERVAL,
+                        default=self._entry.options.get(
+                            CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=5, max=60)),
+                    vol.Required(
+                        CONF_STALE_WINDOW,
+                        default=self._entry.options.get(
+                            CONF_STALE_WINDOW, DEFAULT_STALE_WINDOW
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=240)),
+                    vol.Required(
+                        CONF_PROFILING,
+                        default=self._entry.options.get(CONF_PROFILING, False),
+                    ): bool,
+                }
+            ),
+        )
@@ -3,16 +3,30 @@
 DOMAIN = "salus_rt310i"
 
 # SALUS API endpoints (based on real salus-it500.com implementation)
+# Paths are relative to the base URL so the client can target a mock cloud
 SALUS_BASE_URL = "https://salus-it500.com"
-URL_LOGIN = f"{SALUS_BASE_URL}/public/login.php"
-URL_GET_TOKEN = f"{SALUS_BASE_URL}/public/control.php"
-URL_GET_DATA = f"{SALUS_BASE_URL}/public/ajax_device_values.php"
-URL_SET_DATA = f"{SALUS_BASE_URL}/includes/set.php"
+PATH_LOGIN = "/public/login.php"
+PATH_DEVICES = "/public/devices.php"
+PATH_GET_TOKEN = "/public/control.php"
+PATH_GET_DATA = "/public/ajax_device_values.php"
+PATH_SET_DATA = "/includes/set.php"
 
 # Configuration
 CONF_USERNAME = "username"
 CONF_PASSWORD = "password"
 CONF_DEVICE_ID = "device_id"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+CONF_PROFILING = "profiling"
+CONF_STALE_WINDOW = "stale_window"
+
+# set.php form fields
+FIELD_SETPOINT = "current_tempZ1_set"
+FIELD_TEMP_UNIT = "tempUnit"
+FIELD_AUTO = "auto"
+FIELD_FROST = "frost"
+FIELD_FROST_TEMP = "frost_tempZ1_set"
+FIELD_HOLIDAY = "holiday"
+FIELD_HOLIDAY_TEMP = "holiday_tempZ1_set"
 
 # Attributes
 ATTR_CURRENT_TEMP = "CH1currentRoomTemp"
@@ -25,3 +39,5 @@ DEFAULT_NAME = "SALUS RT310i"
 DEFAULT_MIN_TEMP = 5.0
 DEFAULT_MAX_TEMP = 35.0
 DEFAULT_TEMP_STEP = 0.5
+DEFAULT_MAX_SCAN_INTERVAL = 15  # minutes
+DEFAULT_STALE_WINDOW = 30  # minutes
@@ -0,0 +1,622 @@
+"""Data update coordinator for SALUS RT310i accounts."""
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from dataclasses import fields as dataclass_fields
+import logging
+from datetime import datetime, timedelta
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_HEATING_ON,
+    ATTR_TARGET_TEMP,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_STALE_WINDOW,
+    DOMAIN,
+    FIELD_AUTO,
+    FIELD_FROST_TEMP,
+    FIELD_HOLIDAY,
+    FIELD_SETPOINT,
+)
+from .metrics import LatencyHistogram
+from .models import ATTR_FROST_PROTECTION_TEMP, ATTR_HOLIDAY_ENABLED, SalusDeviceState
+from .salus_api import SalusAPI, SalusRateLimitError
+from .storage import SalusSnapshotStore
+
+_LOGGER = logging.getLogger(__name__)
+
+SCAN_INTERVAL = timedelta(minutes=5)
+
+# Poll quickly for a while after a write or relay change to show the result
+FAST_SCAN_INTERVAL = timedelta(seconds=30)
+FAST_POLL_WINDOW = timedelta(minutes=2)
+
+# Stretch the interval by this factor on each poll that changed nothing
+BACKOFF_FACTOR = 1.5
+
+# Read back written values after this delay; drop unconfirmed ones after
+# the timeout so the cloud's value wins again
+VERIFY_DELAY = 15
+OVERLAY_TIMEOUT = timedelta(minutes=2)
+
+# Payload field that reflects each set.php field
+WRITE_TO_READ_FIELDS = {
+    FIELD_SETPOINT: ATTR_TARGET_TEMP,
+    FIELD_AUTO: ATTR_HEATING_ON,
+    FIELD_FROST_TEMP: ATTR_FROST_PROTECTION_TEMP,
+    FIELD_HOLIDAY: ATTR_HOLIDAY_ENABLED,
+}
+
+REASON_DEFAULT = "default"
+REASON_WRITE = "recent write"
+REASON_RELAY = "relay change"
+REASON_STABLE = "stable"
+REASON_RATE_LIMITED = "rate limited"
+REASON_REVALIDATE = "revalidating"
+
+# A phased poll may come this much sooner than a regular one, to absorb
+# the jitter of the refresh timer
+PHASE_TOLERANCE = timedelta(seconds=1)
+
+# Poll again this soon while serving cached data after a failed update,
+# doubling the wait on each further failure up to SCAN_INTERVAL
+REVALIDATE_INTERVAL = timedelta(minutes=1)
+
+# Entries restored within this many seconds share the first background poll
+STARTUP_REFRESH_DELAY = 1.0
+
+
+class SalusAccountCoordinator(DataUpdateCoordinator[dict[str, SalusDeviceState]]):
+    """Poll every configured device of one SALUS account in a single cycle.
+
+    Config entries stay one per device; entries sharing credentials share
+    this coordinator, so an account is logged in once and all its devices
+    are fetched in one fan-out. ``data`` maps device id to its parsed
+    state; the raw payloads are kept in ``payloads``.
+
+    The poll interval adapts: fast right after a write or a relay change,
+    backing off towards ``max_interval`` while values stay the same, and
+    never sooner than the cloud allows after it rate limited us.
+
+    Confirmed writes are patched into ``data`` right away as an overlay.
+    A verification read follows; each overlaid field is dropped once the
+    cloud reports the written value, or after OVERLAY_TIMEOUT when the
+    cloud never applied it.
+
+    Listeners are only called when something they read changed. Entities
+    register a ``(device_id, fields)`` context naming the snapshot fields
+    they depend on; a listener without context is always called.
+
+    With a snapshot store, every fetched payload is saved so entries can
+    restore their device after a restart and poll in the background
+    instead of blocking setup on the cloud.
+
+    With profiling enabled for any of its devices, the coordinator times
+    each update (fetch and parse) and each round of entity state writes.
+
+    With a poll phase, polls at SCAN_INTERVAL or slower are moved later,
+    to that offset within SCAN_INTERVAL, so accounts polled by the same
+    Home Assistant do not all hit the cloud in the same second.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: SalusAPI,
+        snapshot_store: SalusSnapshotStore | None = None,
+        verify_delay: float = VERIFY_DELAY,
+    ) -> None:
+        """Initialize the coordinator; writes are read back after ``verify_delay``."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN}_{api.username}",
+            update_interval=SCAN_INTERVAL,
+        )
+        self.api = api
+        self.snapshot_store = snapshot_store
+        self.verify_delay = verify_delay
+        self.device_ids: set[str] = set()
+        self.payloads: dict[str, dict[str, Any]] = {}
+        self.poll_reason = REASON_DEFAULT
+        self._add_lock = asyncio.Lock()
+        self._max_intervals: dict[str, timedelta] = {}
+        self._fast_poll_until: datetime | None = None
+        self._fast_poll_reason = REASON_WRITE
+        self._overlays: dict[str, dict[str, tuple[str, datetime]]] = {}
+        self._unsub_verify: CALLBACK_TYPE | None = None
+        # Changed snapshot fields per device since the last notification;
+        # None notifies every listener, a None value every listener of
+        # that device
+        self._changed: dict[str, frozenset[str] | None] | None = None
+        self.writes_suppressed = 0
+        self._profiling_devices: set[str] = set()
+        # Stale-while-revalidate: when a device fails to update, its last
+        # good state is served for up to its stale window
+        self._stale_windows: dict[str, timedelta] = {}
+        self._fetched_at: dict[str, datetime] = {}
+        self.stale_devices: set[str] = set()
+        self.cache_hits: Counter[str] = Counter()
+        self.cache_stale: Counter[str] = Counter()
+        self._revalidate_interval: timedelta | None = None
+        self._startup_refresh = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=STARTUP_REFRESH_DELAY,
+            immediate=False,
+            function=self.async_refresh,
+        )
+        self.profile = {"update": LatencyHistogram(), "state_writes": LatencyHistogram()}
+        self.state_writes = 0
+        self.poll_phase: timedelta | None = None
+        self._poll_started: datetime | None = None
+
+    @property
+    def max_interval(self) -> timedelta:
+        """Return the ceiling for the backed-off poll interval."""
+        return min(
+            self._max_intervals.values(),
+            default=timedelta(minutes=DEFAULT_MAX_SCAN_INTERVAL),
+        )
+
+    def stale_window(self, device_id: str) -> timedelta:
+        """Return how long a device's last good state may be served."""
+        return self._stale_windows.get(
+            device_id, timedelta(minutes=DEFAULT_STALE_WINDOW)
+        )
+
+    def last_fetched(self, device_id: str) -> datetime | None:
+        """Return when the device's data was last fetched successfully."""
+        return self._fetched_at.get(device_id)
+
+    def cache_diagnostics(self, device_id: str) -> dict[str, Any]:
+        """Return the age and hit/stale counts of a device's cached state."""
+        fetched_at = self._fetched_at.get(device_id)
+        return {
+            "cache_age": (
+                round((dt_util.utcnow() - fetched_at).total_seconds())
+                if fetched_at is not None
+                else None
+            ),
+            "stale": device_id in self.stale_devices,
+            "cache_hits": self.cache_hits[device_id],
+            "cache_stale": self.cache_stale[device_id],
+            "stale_window": self.stale_window(device_id).total_seconds(),
+        }
+
+    async def async_add_device(
+        self,
+        device_id: str,
+        max_interval: timedelta | None = None,
+        stale_window: timedelta | None = None,
+    ) -> None:
+        """Start polling a device and wait until its first data arrived.
+
+        Entries set up together wait on one lock, so devices added while a
+        refresh is running are all picked up by the next fan-out.
+        """
+        self._register_device(device_id, max_interval, stale_window)
+        async with self._add_lock:
+            if self.data is None or device_id not in self.data:
+                await self.async_refresh()
+        if self.data is None or device_id not in self.data:
+            raise ConfigEntryNotReady(f"No data received for device {device_id}")
+
+    @callback
+    def async_restore_device(
+        self,
+        device_id: str,
+        max_interval: timedelta | None = None,
+        stale_window: timedelta | None = None,
+    ) -> bool:
+        """Start polling a device from its saved snapshot, without waiting.
+
+        Returns False if there is no snapshot to restore. Otherwise the
+        saved state is shown as stale until the first poll, which the
+        caller starts with ``async_request_startup_refresh``. A snapshot
+        older than the stale window still decides which entities exist,
+        but they stay unavailable until that poll succeeds.
+        """
+        if self.snapshot_store is None or (
+            snapshot := self.snapshot_store.get(device_id)
+        ) is None:
+            return False
+        self._register_device(device_id, max_interval, stale_window)
+        payload, fetched_at = snapshot
+        self.payloads[device_id] = payload
+        self._fetched_at[device_id] = fetched_at
+        if dt_util.utcnow() - fetched_at <= self.stale_window(device_id):
+            if self.data is None:
+                self.data = {}
+            self.data[device_id] = SalusDeviceState.from_payload(payload)
+            self.stale_devices.add(device_id)
+        return True
+
+    async def async_request_startup_refresh(self) -> None:
+        """Poll soon, once for all entries restored around the same time."""
+        await self._startup_refresh.async_call()
+
+    def last_known_state(self, device_id: str) -> SalusDeviceState | None:
+        """Return the current state, or the one parsed from the last payload."""
+        if self.data and (state := self.data.get(device_id)) is not None:
+            return state
+        if (payload := self.payloads.get(device_id)) is not None:
+            return SalusDeviceState.from_payload(payload)
+        return None
+
+    def _register_device(
+        self,
+        device_id: str,
+        max_interval: timedelta | None,
+        stale_window: timedelta | None,
+    ) -> None:
+        """Add a device to the fan-out with its entry's options."""
+        self.device_ids.add(device_id)
+        if max_interval is not None:
+            self._max_intervals[device_id] = max(max_interval, SCAN_INTERVAL)
+        if stale_window is not None:
+            self._stale_windows[device_id] = stale_window
+
+    @property
+    def profiling(self) -> bool:
+        """Return True if update and state write timings are recorded."""
+        return bool(self._profiling_devices)
+
+    def set_profiling(self, device_id: str, enabled: bool) -> None:
+        """Enable or disable profiling on behalf of a device's config entry."""
+        if enabled:
+            self._profiling_devices.add(device_id)
+        else:
+            self._profiling_devices.discard(device_id)
+
+    def set_poll_phase(self, phase: timedelta | None) -> None:
+        """Poll at this offset within SCAN_INTERVAL, from the next poll on."""
+        self.poll_phase = phase
+
+    def remove_device(self, device_id: str) -> None:
+        """Stop polling a device."""
+        self.device_ids.discard(device_id)
+        self._profiling_devices.discard(device_id)
+        self._max_intervals.pop(device_id, None)
+        self._stale_windows.pop(device_id, None)
+        self._fetched_at.pop(device_id, None)
+        self.stale_devices.discard(device_id)
+        self.cache_hits.pop(device_id, None)
+        self.cache_stale.pop(device_id, None)
+        self._overlays.pop(device_id, None)
+        self.payloads.pop(device_id, None)
+        if self.data is not None:
+            self.data.pop(device_id, None)
+
+    def note_write(self) -> None:
+        """Poll quickly for a short window after a value was written."""
+        self._start_fast_poll(REASON_WRITE)
+
+    @callback
+    def async_apply_write(self, device_id: str, fields: dict[str, Any]) -> None:
+        """Show confirmed set.php fields right away and verify them later."""
+        self.note_write()
+        expires = dt_util.utcnow() + OVERLAY_TIMEOUT
+        overlay = self._overlays.setdefault(device_id, {})
+        for field, value in fields.items():
+            if (read_field := WRITE_TO_READ_FIELDS.get(field)) is not None:
+                overlay[read_field] = (str(value), expires)
+
+        if self.data and device_id in self.payloads:
+            state = SalusDeviceState.from_payload(
+                self._apply_overlay(device_id, self.payloads[device_id])
+            )
+            self._changed = {device_id: _changed_fields(self.data.get(device_id), state)}
+            self.data[device_id] = state
+            self.async_update_listeners()
+
+        if self._unsub_verify is not None:
+            self._unsub_verify()
+        self._unsub_verify = async_call_later(
+            self.hass, self.verify_delay, self._async_verify_writes
+        )
+
+    async def async_write_devices(
+        self, writes: dict[str, dict[str, Any]]
+    ) -> dict[str, bool | Exception]:
+        """Write fields to several devices of the account, verified by one read."""
+        results = await self.api.set_devices_values(writes)
+        for device_id, result in results.items():
+            if result is True:
+                self.async_apply_write(device_id, writes[device_id])
+            elif isinstance(result, Exception):
+                _LOGGER.error("Failed to write to device %s: %s", device_id, result)
+            else:
+                _LOGGER.error("Device %s rejected the write", device_id)
+        return results
+
+    @callback
+    def async_update_device_listeners(self, device_id: str) -> None:
+        """Call every listener of one device, e.g. to drop pending values."""
+        self._changed = {device_id: None}
+        self.async_update_listeners()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Call the listeners whose fields changed since the last update."""
+        changed, self._changed = self._changed, None
+        start = time.perf_counter() if self.profiling else None
+        for update_callback, context in list(self._listeners.values()):
+            if changed is None or _context_changed(context, changed):
+                update_callback()
+                self.state_writes += 1
+            else:
+                self.writes_suppressed += 1
+        if start is not None:
+            self.profile["state_writes"].observe(time.perf_counter() - start)
+
+    async def _async_verify_writes(self, _now: datetime) -> None:
+        """Read back the device values after a write."""
+        self._unsub_verify = None
+        await self.async_request_refresh()
+
+    def _apply_overlay(self, device_id: str, payload: dict[str, Any]) -> dict[str, Any]:
+        """Reconcile pending written values with a payload from the cloud."""
+        if not (overlay := self._overlays.get(device_id)):
+            return payload
+
+        now = dt_util.utcnow()
+        patched = dict(payload)
+        for field, (value, expires) in list(overlay.items()):
+            if _values_match(payload.get(field), value):
+                del overlay[field]
+            elif now >= expires:
+                _LOGGER.debug(
+                    "Device %s never reported %s=%s, rolling back", device_id, field, value
+                )
+                del overlay[field]
+            else:
+                patched[field] = value
+        if not overlay:
+            del self._overlays[device_id]
+        return patched
+
+    async def async_shutdown(self) -> None:
+        """Cancel pending startup and verification reads and stop polling."""
+        self._startup_refresh.async_cancel()
+        if self._unsub_verify is not None:
+            self._unsub_verify()
+            self._unsub_verify = None
+        await super().async_shutdown()
+
+    def _start_fast_poll(self, reason: str) -> None:
+        """Switch to the fast interval for FAST_POLL_WINDOW."""
+        self._fast_poll_until = dt_util.utcnow() + FAST_POLL_WINDOW
+        self._fast_poll_reason = reason
+
+    def polling_diagnostics(self) -> dict[str, Any]:
+        """Return the current poll interval and why it was chosen."""
+        return {
+            "interval_seconds": self.update_interval.total_seconds(),
+            "reason": self.poll_reason,
+            "max_interval_seconds": self.max_interval.total_seconds(),
+            "fast_poll_until": (
+                self._fast_poll_until.isoformat() if self._fast_poll_until else None
+            ),
+            "phase_seconds": (
+                self.poll_phase.total_seconds() if self.poll_phase is not None else None
+            ),
+        }
+
+    def profiling_diagnostics(self) -> dict[str, Any] | None:
+        """Return update and state write timings, or None when not profiling."""
+        if not self.profiling:
+            return None
+        return {name: histogram.as_dict() for name, histogram in self.profile.items()}
+
+    async def _async_update_data(self) -> dict[str, SalusDeviceState]:
+        """Fetch all devices of the account, timing it when profiling."""
+        if not self.profiling:
+            return await self._async_fetch_devices()
+        start = time.perf_counter()
+        try:
+            return await self._async_fetch_devices()
+        finally:
+            elapsed = time.perf_counter() - start
+            self.profile["update"].observe(elapsed)
+            _LOGGER.debug(
+                "Update of %d devices took %.0f ms", len(self.device_ids), elapsed * 1000
+            )
+
+    async def _async_fetch_devices(self) -> dict[str, SalusDeviceState]:
+        """Fetch and parse all devices of the account."""
+        # Failures and recoveries change availability, so notify everyone
+        self._changed = None
+        self._poll_started = dt_util.utcnow()
+        try:
+            results = await self.api.get_devices_data(sorted(self.device_ids))
+        except SalusRateLimitError as err:
+            self._back_off_rate_limited(err)
+            return self._serve_stale({}, err)
+        except Exception as err:  # pylint: disable=broad-except
+            return self._serve_stale({}, err)
+
+        now = dt_util.utcnow()
+        data: dict[str, SalusDeviceState] = {}
+        rate_limit: SalusRateLimitError | None = None
+        error: Exception | None = None
+        for device_id, result in results.items():
+            if isinstance(result, SalusRateLimitError):
+                rate_limit = result
+            if isinstance(result, Exception):
+                _LOGGER.warning("Error updating device %s: %s", device_id, result)
+                error = result
+                continue
+            self.payloads[device_id] = result
+            self._fetched_at[device_id] = now
+            if self.snapshot_store is not None:
+                self.snapshot_store.async_update(device_id, result, now)
+            self.cache_hits[device_id] += 1
+            data[device_id] = SalusDeviceState.from_payload(
+                self._apply_overlay(device_id, result)
+            )
+
+        if rate_limit is not None:
+            self._back_off_rate_limited(rate_limit)
+        else:
+            self._adapt_interval(data)
+
+        if error is not None:
+            data = self._serve_stale(data, error)
+        else:
+            self.stale_devices.clear()
+            self._revalidate_interval = None
+
+        if self.last_update_success and self.data is not None:
+            previous = self.data
+            self._changed = {
+                device_id: _changed_fields(previous.get(device_id), data.get(device_id))
+                for device_id in previous.keys() | data.keys()
+            }
+        return data
+
+    def _serve_stale(
+        self, data: dict[str, SalusDeviceState], err: Exception
+    ) -> dict[str, SalusDeviceState]:
+        """Fill devices that failed to update from the last good snapshot.
+
+        Devices whose last good data is older than their stale window are
+        left out, which makes their entities unavailable; if no device has
+        data at all the update fails. While serving stale data the next
+        poll comes sooner to revalidate it, unless we are rate limited; the
+        wait doubles with every failed revalidation until it is back at
+        SCAN_INTERVAL, so one offline device does not keep the whole
+        account on one-minute polls for the stale window.
+        """
+        now = dt_util.utcnow()
+        previous = self.data or {}
+        self.stale_devices.clear()
+        for device_id in self.device_ids - data.keys():
+            fetched_at = self._fetched_at.get(device_id)
+            if (
+                device_id in previous
+                and fetched_at is not None
+                and now - fetched_at <= self.stale_window(device_id)
+            ):
+                data[device_id] = previous[device_id]
+                self.stale_devices.add(device_id)
+                self.cache_stale[device_id] += 1
+
+        if not data:
+            raise UpdateFailed(f"Error communicating with API: {err}") from err
+
+        if self.stale_devices and self.poll_reason != REASON_RATE_LIMITED:
+            _LOGGER.debug(
+                "Serving cached data for %s: %s", ", ".join(sorted(self.stale_devices)), err
+            )
+            self._revalidate_interval = (
+                REVALIDATE_INTERVAL
+                if self._revalidate_interval is None
+                else min(self._revalidate_interval * 2, SCAN_INTERVAL)
+            )
+            self.update_interval = self._revalidate_interval
+            self.poll_reason = REASON_REVALIDATE
+        return data
+
+    def _back_off_rate_limited(self, err: SalusRateLimitError) -> None:
+        """Wait at least as long as the cloud asked before polling again."""
+        interval = min(self.update_interval * 2, self.max_interval)
+        if err.retry_after is not None:
+            interval = max(interval, timedelta(seconds=err.retry_after))
+        self.update_interval = self._phased(interval, later_only=True)
+        self.poll_reason = REASON_RATE_LIMITED
+        self._fast_poll_until = None
+
+    def _adapt_interval(self, data: dict[str, SalusDeviceState]) -> None:
+        """Pick the next poll interval from how the values changed."""
+        previous = self.data or {}
+        if any(
+            device_id in previous and previous[device_id].relay_on != state.relay_on
+            for device_id, state in data.items()
+        ):
+            self._start_fast_poll(REASON_RELAY)
+
+        if self._fast_poll_until is not None and dt_util.utcnow() < self._fast_poll_until:
+            self.update_interval = FAST_SCAN_INTERVAL
+            self.poll_reason = self._fast_poll_reason
+        elif previous and data == previous:
+            self.update_interval = self._phased(
+                min(
+                    max(self.update_interval, SCAN_INTERVAL) * BACKOFF_FACTOR,
+                    self.max_interval,
+                )
+            )
+            self.poll_reason = REASON_STABLE
+        else:
+            self.update_interval = self._phased(SCAN_INTERVAL)
+            self.poll_reason = REASON_DEFAULT
+            self._fast_poll_until = None
+
+    def _phased(self, interval: timedelta, later_only: bool = False) -> timedelta:
+        """Stretch an interval so the next poll falls on our phase.
+
+        Fast and revalidating polls are left alone. The next poll is the
+        first on our phase no sooner than a regular poll would come, give or
+        take PHASE_TOLERANCE, so spreading never adds polls; it is not put
+        past the maximum interval. With ``later_only`` it is also at least
+        ``interval`` from now.
+        """
+        if self.poll_phase is None or interval < SCAN_INTERVAL:
+            return interval
+        now = dt_util.utcnow()
+        if later_only:
+            earliest = now + interval
+        else:
+            # A regular poll comes ``interval`` after this one ended
+            earliest = (self._poll_started or now) + interval - PHASE_TOLERANCE
+        wait = (
+            self.poll_phase.total_seconds() - earliest.timestamp()
+        ) % SCAN_INTERVAL.total_seconds()
+        phased = earliest + timedelta(seconds=wait) - now
+        if later_only:
+            return phased
+        return min(phased, max(self.max_interval, interval))
+
+
+def _values_match(reported: Any, written: str) -> bool:
+    """Return True if a reported payload value equals a written one."""
+    try:
+        return float(reported) == float(written)
+    except (TypeError, ValueError):
+        return str(reported) == written
+
+
+def _changed_fields(
+    previous: SalusDeviceState | None, current: SalusDeviceState | None
+) -> frozenset[str] | None:
+    """Return the snapshot fields that differ, or None if a side is missing."""
+    if previous is None or current is None:
+        return None
+    return frozenset(
+        field.name
+        for field in dataclass_fields(SalusDeviceState)
+        if getattr(previous, field.name) != getattr(current, field.name)
+    )
+
+
+def _context_changed(
+    context: Any, changed: dict[str, frozenset[str] | None]
+) -> bool:
+    """Return True if a listener context depends on a changed field."""
+    if context is None:
+        return True
+    device_id, fields = context
+    if device_id not in changed:
+        return False
+    if (device_changed := changed[device_id]) is None:
+        return True
+    return not fields.isdisjoint(device_changed)
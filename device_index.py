@@ -0,0 +1,117 @@
+"""Index of the SALUS devices behind entity and device registry IDs."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_DEVICE_INDEX = f"{DOMAIN}_device_index"
+
+
+class SalusDeviceIndex:
+    """Find the config entry of a SALUS entity or device without reading states.
+
+    Service handlers look up their targets here instead of building entity
+    IDs or reading hass.states. The index follows the entity and device
+    registries, so renamed entities keep resolving.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an empty index."""
+        self.hass = hass
+        # Entity ID or device registry ID -> config entry ID
+        self._entries: dict[str, str] = {}
+        self._unsubs: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_start(self) -> None:
+        """Follow changes of the entity and device registries."""
+        self._unsubs = [
+            self.hass.bus.async_listen(
+                er.EVENT_ENTITY_REGISTRY_UPDATED, self._async_entity_updated
+            ),
+            self.hass.bus.async_listen(
+                dr.EVENT_DEVICE_REGISTRY_UPDATED, self._async_device_updated
+            ),
+        ]
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following the registries."""
+        while self._unsubs:
+            self._unsubs.pop()()
+
+    @callback
+    def async_add_entry(self, entry_id: str, device_id: str) -> CALLBACK_TYPE:
+        """Index an entry's registered entities and device until the callback."""
+        for entity_entry in er.async_entries_for_config_entry(
+            er.async_get(self.hass), entry_id
+        ):
+            self._entries[entity_entry.entity_id] = entry_id
+        if (
+            device := dr.async_get(self.hass).async_get_device(
+                identifiers={(DOMAIN, device_id)}
+            )
+        ) is not None:
+            self._entries[device.id] = entry_id
+
+        @callback
+        def remove_entry() -> None:
+            for key in [key for key, value in self._entries.items() if value == entry_id]:
+                del self._entries[key]
+
+        return remove_entry
+
+    @callback
+    def async_get(self, entity_or_device_id: str) -> dict[str, Any] | None:
+        """Return the runtime data of the entry owning an entity or device."""
+        if (entry_id := self._entries.get(entity_or_device_id)) is None:
+            return None
+        return self.hass.data[DOMAIN].get(entry_id)
+
+    @callback
+    def _async_entity_updated(self, event: Event) -> None:
+        """Track SALUS entities being added, renamed and removed."""
+        entity_id = event.data["entity_id"]
+        action = event.data["action"]
+        if action == "remove":
+            self._entries.pop(entity_id, None)
+            return
+        if action == "update" and (old_entity_id := event.data.get("old_entity_id")):
+            if (entry_id := self._entries.pop(old_entity_id, None)) is not None:
+                _LOGGER.debug("Entity %s renamed to %s", old_entity_id, entity_id)
+                self._entries[entity_id] = entry_id
+            return
+        if action == "create":
+            entity_entry = er.async_get(self.hass).async_get(entity_id)
+            if entity_entry is not None and entity_entry.platform == DOMAIN:
+                self._entries[entity_id] = entity_entry.config_entry_id
+
+    @callback
+    def _async_device_updated(self, event: Event) -> None:
+        """Track SALUS devices being added and removed."""
+        device_id = event.data["device_id"]
+        if event.data["action"] == "remove":
+            self._entries.pop(device_id, None)
+            return
+        device = dr.async_get(self.hass).async_get(device_id)
+        if device is None:
+            return
+        for entry_id in device.config_entries:
+            if entry_id in self.hass.data.get(DOMAIN, {}):
+                self._entries[device_id] = entry_id
+
+
+@callback
+def async_get_device_index(hass: HomeAssistant) -> SalusDeviceIndex:
+    """Return the device index shared by all entries, starting it on first use."""
+    if (index := hass.data.get(DATA_DEVICE_INDEX)) is None:
+        index = hass.data[DATA_DEVICE_INDEX] = SalusDeviceIndex(hass)
+        index.async_start()
+    return index
@@ -0,0 +1,44 @@
+"""Diagnostics support for SALUS RT310i."""
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+TO_REDACT = {CONF_PASSWORD, CONF_USERNAME}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    coordinator = entry_data["coordinator"]
+    device_id = entry_data["device_id"]
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "polling": coordinator.polling_diagnostics(),
+        "poll_spread": entry_data["poll_scheduler"].as_dict(device_id),
+        "circuit_breaker": coordinator.api.circuit_breaker.as_dict(),
+        "cache": coordinator.cache_diagnostics(device_id),
+        "state_writes": coordinator.state_writes,
+        "state_writes_suppressed": coordinator.writes_suppressed,
+        "requests": coordinator.api.metrics.as_dict(),
+        "profiling": coordinator.profiling_diagnostics(),
+        "device_state": (
+            asdict(state)
+            if (state := (coordinator.data or {}).get(device_id)) is not None
+            else None
+        ),
+        "device_payload": coordinator.payloads.get(device_id),
+        "schedule_templates": entry_data["schedules"].templates,
+        "schedule": entry_data["schedule_engine"].as_dict(),
+        "boost": entry_data["boosts"].as_dict(device_id),
+    }
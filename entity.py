@@ -0,0 +1,49 @@
+"""Base entity for the SALUS RT310i integration."""
+from __future__ import annotations
+
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import SalusAccountCoordinator
+from .models import SalusDeviceState
+
+
+class SalusEntity(CoordinatorEntity[SalusAccountCoordinator]):
+    """Entity fed with one device's values from its account coordinator.
+
+    Subclasses list the SalusDeviceState fields they render in
+    ``_state_fields``; the coordinator then skips state writes when none
+    of them changed. None means the state is written on every poll.
+    """
+
+    _state_fields: tuple[str, ...] | None = None
+
+    def __init__(self, coordinator: SalusAccountCoordinator, device_id: str) -> None:
+        """Initialize the entity."""
+        context = None
+        if self._state_fields is not None:
+            context = (device_id, frozenset(self._state_fields))
+        super().__init__(coordinator, context)
+        self._device_id = device_id
+
+    @property
+    def device_state(self) -> SalusDeviceState | None:
+        """Return the parsed state of this entity's device."""
+        if self.coordinator.data:
+            return self.coordinator.data.get(self._device_id)
+        return None
+
+    @property
+    def available(self) -> bool:
+        """Return True if the last poll returned data for this device."""
+        return super().available and self.device_state is not None
+
+    @property
+    def device_info(self):
+        """Return device information."""
+        return {
+            "identifiers": {(DOMAIN, self._device_id)},
+            "name": f"SALUS RT310i {self._device_id}",
+            "manufacturer": "SALUS",
+            "model": "RT310i",
+        }
@@ -0,0 +1,165 @@
+"""Operations on many SALUS RT310i devices at once."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import hashlib
+import logging
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import instance_id
+
+from .const import DOMAIN
+from .coordinator import SCAN_INTERVAL, SalusAccountCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_POLL_SCHEDULER = f"{DOMAIN}_poll_scheduler"
+
+
+async def async_write_fleet(
+    writes: dict[str, tuple[SalusAccountCoordinator, dict[str, Any]]],
+) -> dict[str, bool | Exception]:
+    """Write fields to many devices: one batch per account, accounts in parallel.
+
+    Each account writes at most a few devices at a time and verifies the
+    whole batch with one read.
+    """
+    batches: dict[SalusAccountCoordinator, dict[str, dict[str, Any]]] = {}
+    for device_id, (coordinator, fields) in writes.items():
+        batches.setdefault(coordinator, {})[device_id] = fields
+    results: dict[str, bool | Exception] = {}
+    for batch_results in await asyncio.gather(
+        *(coordinator.async_write_devices(batch) for coordinator, batch in batches.items())
+    ):
+        results.update(batch_results)
+    return results
+
+
+def fleet_response(
+    results: dict[str, bool | Exception | str], unknown: list[str]
+) -> dict[str, Any]:
+    """Return a service response with the outcome for every device.
+
+    A result is True on success, False if the cloud rejected the write, an
+    exception, or a message for devices that were skipped.
+    """
+    devices: dict[str, dict[str, Any]] = {}
+    for device_id, result in results.items():
+        if result is True:
+            devices[device_id] = {"success": True}
+        elif result is False:
+            devices[device_id] = {"success": False, "error": "write rejected"}
+        else:
+            devices[device_id] = {"success": False, "error": str(result)}
+    return {"devices": devices, "unknown_targets": unknown}
+
+
+class SalusPollScheduler:
+    """Spread the polls of every account evenly over SCAN_INTERVAL.
+
+    Devices are ordered by account and device ID and each gets an equal
+    slot of the interval, so the same devices always get the same
+    offsets. The slots start at a base offset drawn from the Home
+    Assistant instance ID, so installs do not all poll at the same
+    second past the five minutes. An account fetches all its devices in
+    one cycle, at the offset of its first device; the more devices it
+    has, the longer the gap before the next account. Offsets are
+    recomputed whenever a device is added or removed and apply from each
+    account's next poll.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, base_offset: timedelta = timedelta(0)
+    ) -> None:
+        """Initialize an empty schedule starting at ``base_offset``."""
+        self.hass = hass
+        self.base_offset = base_offset
+        self._coordinators: dict[str, SalusAccountCoordinator] = {}
+        self.offsets: dict[str, timedelta] = {}
+
+    @callback
+    def async_add_device(
+        self, device_id: str, coordinator: SalusAccountCoordinator
+    ) -> CALLBACK_TYPE:
+        """Give a device a slot until the returned callback."""
+        self._coordinators[device_id] = coordinator
+        self._async_rebalance()
+
+        @callback
+        def remove_device() -> None:
+            self._coordinators.pop(device_id, None)
+            self._async_rebalance()
+
+        return remove_device
+
+    @callback
+    def _async_rebalance(self) -> None:
+        """Space the devices evenly and move each account to its first slot."""
+        order = sorted(
+            self._coordinators,
+            key=lambda device_id: (
+                self._coordinators[device_id].api.username.lower(),
+                device_id,
+            ),
+        )
+        slot = SCAN_INTERVAL / max(len(order), 1)
+        self.offsets = {
+            device_id: (self.base_offset + slot * index) % SCAN_INTERVAL
+            for index, device_id in enumerate(order)
+        }
+        phases: dict[SalusAccountCoordinator, timedelta] = {}
+        for device_id in order:
+            phases.setdefault(self._coordinators[device_id], self.offsets[device_id])
+        for coordinator, phase in phases.items():
+            coordinator.set_poll_phase(phase)
+        _LOGGER.debug(
+            "Polling %d devices of %d accounts, one slot every %.0f seconds",
+            len(order),
+            len(phases),
+            slot.total_seconds(),
+        )
+
+    def as_dict(self, device_id: str) -> dict[str, Any]:
+        """Return a device's slot and how far apart the accounts poll."""
+        phases = sorted(
+            {
+                coordinator.poll_phase.total_seconds()
+                for coordinator in self._coordinators.values()
+                if coordinator.poll_phase is not None
+            }
+        )
+        period = SCAN_INTERVAL.total_seconds()
+        gaps = [
+            later - earlier
+            for earlier, later in zip(phases, [*phases[1:], phases[0] + period])
+        ] if phases else []
+        offset = self.offsets.get(device_id)
+        return {
+            "devices": len(self._coordinators),
+            "accounts": len(phases),
+            "base_offset_seconds": round(self.base_offset.total_seconds(), 1),
+            "slot_seconds": round(period / max(len(self._coordinators), 1), 1),
+            "offset_seconds": (
+                round(offset.total_seconds(), 1) if offset is not None else None
+            ),
+            "min_account_gap_seconds": round(min(gaps), 1) if gaps else None,
+        }
+
+
+async def async_get_poll_scheduler(hass: HomeAssistant) -> SalusPollScheduler:
+    """Return the poll scheduler shared by all entries."""
+    if (scheduler := hass.data.get(DATA_POLL_SCHEDULER)) is None:
+        base_offset = poll_base_offset(await instance_id.async_get(hass))
+        # Entries set up together may both have waited for the instance ID
+        scheduler = hass.data.setdefault(
+            DATA_POLL_SCHEDULER, SalusPollScheduler(hass, base_offset)
+        )
+    return scheduler
+
+
+def poll_base_offset(seed: str) -> timedelta:
+    """Return a stable, evenly distributed offset within SCAN_INTERVAL."""
+    digest = hashlib.sha256(f"{DOMAIN}:{seed}".encode()).digest()
+    return SCAN_INTERVAL * (int.from_bytes(digest[:8], "big") / 2**64)
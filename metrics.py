@@ -0,0 +1,188 @@
+"""Request metrics for the SALUS RT310i integration."""
+from __future__ import annotations
+
+import asyncio
+from bisect import bisect_left
+from collections import Counter, deque
+from contextlib import contextmanager
+import statistics
+import time
+from typing import Any, Callable, Iterator, TypeVar
+
+_FuncT = TypeVar("_FuncT", bound=Callable[..., Any])
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Latencies kept for percentiles
+RECENT_SAMPLES = 200
+
+ENDPOINT_LOGIN = "login"
+ENDPOINT_TOKEN = "token"
+ENDPOINT_DEVICES = "devices"
+ENDPOINT_DATA = "data"
+ENDPOINT_SET = "set"
+
+
+def retry_endpoint(name: str) -> Callable[[_FuncT], _FuncT]:
+    """Mark a client method with the endpoint its retries are counted for."""
+
+    def decorate(func: _FuncT) -> _FuncT:
+        func.endpoint = name  # type: ignore[attr-defined]
+        return func
+
+    return decorate
+
+
+class LatencyHistogram:
+    """Latency distribution with fixed buckets and recent-sample percentiles."""
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self._recent: deque[float] = deque(maxlen=RECENT_SAMPLES)
+
+    def observe(self, seconds: float) -> None:
+        """Record one duration."""
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self._recent.append(seconds)
+
+    def percentile(self, percent: int) -> float | None:
+        """Return a percentile of the recent samples in seconds."""
+        if not self._recent:
+            return None
+        if len(self._recent) == 1:
+            return self._recent[0]
+        return statistics.quantiles(self._recent, n=100, method="inclusive")[percent - 1]
+
+    def as_dict(self) -> dict[str, object]:
+        """Return the distribution in milliseconds."""
+        labels = [f"le_{int(bound * 1000)}ms" for bound in LATENCY_BUCKETS] + ["inf"]
+        return {
+            "count": self.count,
+            "mean_ms": _ms(self.total / self.count) if self.count else None,
+            "p50_ms": _ms(self.percentile(50)),
+            "p95_ms": _ms(self.percentile(95)),
+            "max_ms": _ms(self.max) if self.count else None,
+            "histogram": dict(zip(labels, self.buckets)),
+        }
+
+
+class EndpointMetrics:
+    """Counters of one SALUS endpoint."""
+
+    def __init__(self) -> None:
+        """Initialize empty counters."""
+        self.latency = LatencyHistogram()
+        self.statuses: Counter[str] = Counter()
+        self.retries = 0
+        self.bytes_received = 0
+        self.last_size: int | None = None
+
+    @property
+    def errors(self) -> int:
+        """Return the number of failed requests."""
+        return sum(
+            count
+            for status, count in self.statuses.items()
+            if not status.isdigit() or int(status) >= 400
+        )
+
+    def as_dict(self) -> dict[str, object]:
+        """Return the counters for diagnostics."""
+        return {
+            "latency": self.latency.as_dict(),
+            "statuses": dict(self.statuses),
+            "errors": self.errors,
+            "retries": self.retries,
+            "bytes_received": self.bytes_received,
+            "last_size": self.last_size,
+        }
+
+
+class RequestSample:
+    """Status and size of one request, filled in while it runs."""
+
+    __slots__ = ("status", "size")
+
+    def __init__(self) -> None:
+        """Initialize an empty sample."""
+        self.status: int | str | None = None
+        self.size: int | None = None
+
+
+class ClientMetrics:
+    """Latency, status, retry and size metrics of one SalusAPI client."""
+
+    def __init__(self) -> None:
+        """Initialize metrics for every endpoint."""
+        self.endpoints: dict[str, EndpointMetrics] = {
+            endpoint: EndpointMetrics()
+            for endpoint in (
+                ENDPOINT_LOGIN,
+                ENDPOINT_TOKEN,
+                ENDPOINT_DEVICES,
+                ENDPOINT_DATA,
+                ENDPOINT_SET,
+            )
+        }
+
+    @contextmanager
+    def track(self, endpoint: str) -> Iterator[RequestSample]:
+        """Time a request; the caller sets the sample's status and size."""
+        sample = RequestSample()
+        start = time.perf_counter()
+        try:
+            yield sample
+        except asyncio.TimeoutError:
+            sample.status = "timeout"
+            raise
+        except asyncio.CancelledError:
+            sample.status = "cancelled"
+            raise
+        except Exception as err:
+            if sample.status is None:
+                sample.status = type(err).__name__
+            raise
+        finally:
+            metrics = self.endpoints[endpoint]
+            metrics.latency.observe(time.perf_counter() - start)
+            metrics.statuses[str(sample.status)] += 1
+            if sample.size is not None:
+                metrics.bytes_received += sample.size
+                metrics.last_size = sample.size
+
+    def record_retry(self, endpoint: str | None) -> None:
+        """Count a retried request."""
+        if endpoint in self.endpoints:
+            self.endpoints[endpoint].retries += 1
+
+    @property
+    def requests(self) -> int:
+        """Return the number of requests over all endpoints."""
+        return sum(metrics.latency.count for metrics in self.endpoints.values())
+
+    @property
+    def errors(self) -> int:
+        """Return the number of failed requests over all endpoints."""
+        return sum(metrics.errors for metrics in self.endpoints.values())
+
+    @property
+    def retries(self) -> int:
+        """Return the number of retries over all endpoints."""
+        return sum(metrics.retries for metrics in self.endpoints.values())
+
+    def as_dict(self) -> dict[str, object]:
+        """Return every endpoint's metrics for diagnostics."""
+        return {endpoint: metrics.as_dict() for endpoint, metrics in self.endpoints.items()}
+
+
+def _ms(seconds: float | None) -> float | None:
+    """Convert seconds to rounded milliseconds."""
+    return None if seconds is None else round(seconds * 1000, 1)
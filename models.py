@@ -0,0 +1,102 @@
+"""Parsed device state for the SALUS RT310i integration."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+from typing import Any
+
+from .const import ATTR_CURRENT_TEMP, ATTR_HEATING_ON, ATTR_HVAC_MODE, ATTR_TARGET_TEMP
+
+_LOGGER = logging.getLogger(__name__)
+
+# Payload fields read by the platforms, besides the ATTR_* constants
+ATTR_SCHEDULE_ON = "CH1scheduleOn"
+ATTR_AUTO_OFF = "CH1autoOff"
+ATTR_PROGRAM_MODE = "progMode"
+ATTR_FROST_PROTECTION_TEMP = "CH1frostProtectionTemp"
+ATTR_HOLIDAY_ENABLED = "holidayEnabled"
+ATTR_LOW_TEMP_ALARM = "CH1tempLowAlarmStatus"
+ATTR_HIGH_TEMP_ALARM = "CH1tempHighAlarmStatus"
+
+# Every payload field the integration reads; the client drops the rest
+PAYLOAD_FIELDS = frozenset(
+    {
+        ATTR_CURRENT_TEMP,
+        ATTR_TARGET_TEMP,
+        ATTR_HEATING_ON,
+        ATTR_HVAC_MODE,
+        ATTR_SCHEDULE_ON,
+        ATTR_AUTO_OFF,
+        ATTR_PROGRAM_MODE,
+        ATTR_FROST_PROTECTION_TEMP,
+        ATTR_HOLIDAY_ENABLED,
+        ATTR_LOW_TEMP_ALARM,
+        ATTR_HIGH_TEMP_ALARM,
+    }
+)
+
+# Readings outside this range are treated as sensor or payload errors
+VALID_TEMPERATURE_RANGE = (-40.0, 100.0)
+
+
+@dataclass(frozen=True, slots=True)
+class SalusDeviceState:
+    """Values of one device, parsed once per poll.
+
+    The cloud sends every value as a string; entities read these fields
+    instead of converting the raw payload on each state write. Optional
+    values the device does not report are None.
+    """
+
+    current_temperature: float | None
+    target_temperature: float | None
+    heating_enabled: bool | None
+    relay_on: bool
+    schedule_on: bool | None
+    auto_off: bool | None
+    program_mode: str | None
+    frost_protection_temp: float | None
+    holiday_enabled: bool | None
+    low_temp_alarm: bool | None
+    high_temp_alarm: bool | None
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> SalusDeviceState:
+        """Parse an ajax_device_values.php payload."""
+        return cls(
+            current_temperature=_parse_temperature(payload, ATTR_CURRENT_TEMP),
+            target_temperature=_parse_temperature(payload, ATTR_TARGET_TEMP),
+            heating_enabled=_parse_flag(payload, ATTR_HEATING_ON),
+            relay_on=_parse_flag(payload, ATTR_HVAC_MODE) is True,
+            schedule_on=_parse_flag(payload, ATTR_SCHEDULE_ON),
+            auto_off=_parse_flag(payload, ATTR_AUTO_OFF),
+            program_mode=(
+                str(payload[ATTR_PROGRAM_MODE]) if ATTR_PROGRAM_MODE in payload else None
+            ),
+            frost_protection_temp=_parse_temperature(payload, ATTR_FROST_PROTECTION_TEMP),
+            holiday_enabled=_parse_flag(payload, ATTR_HOLIDAY_ENABLED),
+            low_temp_alarm=_parse_flag(payload, ATTR_LOW_TEMP_ALARM),
+            high_temp_alarm=_parse_flag(payload, ATTR_HIGH_TEMP_ALARM),
+        )
+
+
+def _parse_temperature(payload: dict[str, Any], field: str) -> float | None:
+    """Return a temperature field as float, or None if missing or invalid."""
+    if not (value := payload.get(field)):
+        return None
+    try:
+        temperature = float(value)
+    except (ValueError, TypeError):
+        _LOGGER.warning("Invalid %s value: %s", field, value)
+        return None
+    if not VALID_TEMPERATURE_RANGE[0] <= temperature <= VALID_TEMPERATURE_RANGE[1]:
+        _LOGGER.warning("Out of range %s value: %s", field, value)
+        return None
+    return temperature
+
+
+def _parse_flag(payload: dict[str, Any], field: str) -> bool | None:
+    """Return a "0"/"1" flag as bool, or None if the field is missing."""
+    if (value := payload.get(field)) is None:
+        return None
+    return str(value) == "1"
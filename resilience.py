@@ -0,0 +1,130 @@
+"""Retry policy and circuit breaker for SALUS cloud requests."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import logging
+import random
+import time
+
+import aiohttp
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+def is_transient(err: BaseException) -> bool:
+    """Return True for failures worth retrying: timeouts, connection errors, 5xx."""
+    if isinstance(err, aiohttp.ClientResponseError):
+        return err.status >= 500
+    return isinstance(err, (asyncio.TimeoutError, aiohttp.ClientConnectionError))
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """How often and how long to wait before retrying a transient failure.
+
+    Delays grow exponentially from ``base_delay`` up to ``max_delay`` and
+    are drawn at random below that bound ("full jitter"), so clients that
+    failed together do not retry together.
+    """
+
+    attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+
+    def delay(self, retry: int) -> float:
+        """Return the wait before retry number ``retry``, counting from 0."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**retry))
+
+
+class CircuitBreaker:
+    """Fail fast while a host keeps failing, then probe it.
+
+    After ``failure_threshold`` consecutive transient failures the breaker
+    opens and ``allow_request`` refuses requests. Once ``recovery_timeout``
+    passed it lets a single probe through (half-open); success closes the
+    breaker, failure opens it again.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 60.0,
+    ) -> None:
+        """Initialize the breaker for a host."""
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.failures = 0
+        self.times_opened = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """Return closed, open or half_open."""
+        if self._opened_at is None:
+            return STATE_CLOSED
+        if time.monotonic() - self._opened_at < self.recovery_timeout:
+            return STATE_OPEN
+        return STATE_HALF_OPEN
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds until the open breaker lets a probe through."""
+        if self._opened_at is None:
+            return 0.0
+        return max(self.recovery_timeout - (time.monotonic() - self._opened_at), 0.0)
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent now."""
+        state = self.state
+        if state == STATE_CLOSED:
+            return True
+        if state == STATE_HALF_OPEN and not self._probing:
+            _LOGGER.debug("Probing %s after %d failures", self.host, self.failures)
+            self._probing = True
+            return True
+        return False
+
+    def release(self) -> None:
+        """Give up a probe that ended without an answer, e.g. on cancellation."""
+        self._probing = False
+
+    def record_success(self) -> None:
+        """Close the breaker after the host answered."""
+        if self._opened_at is not None:
+            _LOGGER.info("SALUS cloud at %s is reachable again", self.host)
+        self.failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a transient failure, opening the breaker at the threshold."""
+        self.failures += 1
+        if self._probing or (
+            self._opened_at is None and self.failures >= self.failure_threshold
+        ):
+            if self._opened_at is None:
+                _LOGGER.warning(
+                    "SALUS cloud at %s failed %d times, pausing requests for %ss",
+                    self.host,
+                    self.failures,
+                    self.recovery_timeout,
+                )
+            self.times_opened += 1
+            self._opened_at = time.monotonic()
+            self._probing = False
+
+    def as_dict(self) -> dict[str, object]:
+        """Return the breaker state for attributes and diagnostics."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "times_opened": self.times_opened,
+        }
@@ -1,46 +1,332 @@
 """SALUS API client for RT310i thermostat."""
 from __future__ import annotations
 
+import asyncio
+from functools import partial
+import json
 import logging
-from typing import Any
+import re
+import time
+from typing import Any, Callable
 import hashlib
+from urllib.parse import urlsplit
 
 import aiohttp
 import async_timeout
+from yarl import URL
 
 from .const import (
-    URL_LOGIN,
-    URL_GET_TOKEN,
-    URL_GET_DATA,
-    URL_SET_DATA,
+    FIELD_AUTO,
+    FIELD_SETPOINT,
+    FIELD_TEMP_UNIT,
+    PATH_DEVICES,
+    PATH_GET_DATA,
+    PATH_GET_TOKEN,
+    PATH_LOGIN,
+    PATH_SET_DATA,
+    SALUS_BASE_URL,
 )
+from .metrics import (
+    ENDPOINT_DATA,
+    ENDPOINT_DEVICES,
+    ENDPOINT_LOGIN,
+    ENDPOINT_SET,
+    ENDPOINT_TOKEN,
+    ClientMetrics,
+    retry_endpoint,
+)
+from .resilience import CircuitBreaker, RetryPolicy, is_transient
 
 _LOGGER = logging.getLogger(__name__)
 
+REQUEST_TIMEOUT = 10
+
+# Device fetches run in parallel when polling an account with many devices
+MAX_PARALLEL_REQUESTS = 4
+
+DEVICE_ID_PATTERN = re.compile(r"devId=(\d+)")
+
+# Fields that must accompany another field in every write
+FIELD_COMPANIONS = {
+    FIELD_SETPOINT: {FIELD_TEMP_UNIT: "0"},  # 0 = Celsius, 1 = Fahrenheit
+}
+
+# Marker of the login form, served instead of data once the session expired
+LOGIN_FORM_MARKER = "idemail"
+
+# Device data fetched this recently is handed to further callers as is
+DATA_SHARE_WINDOW = 2.0
+
+
+class SalusError(Exception):
+    """Base exception for SALUS cloud errors."""
+
+
+class SalusAuthError(SalusError):
+    """The SALUS cloud rejected the current session or credentials."""
+
+
+class SalusRateLimitError(SalusError):
+    """The SALUS cloud asked the client to slow down."""
+
+    def __init__(self, retry_after: float | None = None) -> None:
+        """Initialize the error with the server's Retry-After, if any."""
+        message = "Rate limited by SALUS cloud"
+        if retry_after is not None:
+            message += f" (retry after {retry_after:g}s)"
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class SalusCircuitOpenError(SalusError):
+    """Requests are suspended while the SALUS cloud keeps failing."""
+
+    def __init__(self, host: str, retry_in: float) -> None:
+        """Initialize the error with the time until the next probe."""
+        super().__init__(
+            f"SALUS cloud at {host} is unavailable, next attempt in {retry_in:.0f}s"
+        )
+        self.retry_in = retry_in
+
+
+def _project_fields(
+    fields: frozenset[str], pairs: list[tuple[str, Any]]
+) -> dict[str, Any]:
+    """Build a JSON object from only the wanted fields.
+
+    Payloads are flat, so this is applied to every object the parser
+    builds; unwanted values are never stored in the result.
+    """
+    return {key: value for key, value in pairs if key in fields}
+
+
+def hvac_mode_value(mode: str) -> str:
+    """Return the set.php ``auto`` value for an HVAC mode."""
+    # Mode mapping: 0 = Off, 1 = On (Auto/Heat)
+    return "1" if mode in ["heat", "auto"] else "0"
+
 
 class SalusAPI:
-    """Interface to the SALUS cloud API."""
+    """Interface to the SALUS cloud API for one account.
+
+    ``device_id`` is the device used to obtain the session token; every
+    device call accepts the id of any other device on the same account.
+    """
 
-    def __init__(self, username: str, password: str, device_id: str) -> None:
-        """Initialize the API client."""
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        device_id: str,
+        connector: aiohttp.BaseConnector | None = None,
+        base_url: str = SALUS_BASE_URL,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        payload_fields: frozenset[str] | None = None,
+        data_share_window: float = DATA_SHARE_WINDOW,
+    ) -> None:
+        """Initialize the API client.
+
+        Pass a shared connector to pool connections with other clients; the
+        client always keeps a cookie jar of its own. Pass a shared circuit
+        breaker so all clients of a host stop together when it is down.
+        With ``payload_fields``, device data keeps only those fields; the
+        rest of the payload is dropped while it is parsed. Device data is
+        handed to further callers for ``data_share_window`` seconds.
+        """
         self.username = username
         self.password = password
         self.device_id = device_id
+        self.base_url = base_url
         self.session: aiohttp.ClientSession | None = None
         self.token: str | None = None
-        self._session_owner = False
+        self._connector = connector
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(urlsplit(base_url).netloc)
+        self.metrics = ClientMetrics()
+        self.payload_fields = payload_fields
+        self._object_hook = None
+        if payload_fields is not None:
+            self._object_hook = partial(_project_fields, payload_fields)
         self._cookies: dict = {}
+        # None until a multi-field write showed whether set.php accepts them
+        self.combined_writes: bool | None = None
+        # Requests shared by concurrent callers, and recent device data
+        self._in_flight: dict[tuple[str, ...], asyncio.Task] = {}
+        self._recent_data: dict[str, tuple[float, dict[str, Any]]] = {}
+        self.data_share_window = data_share_window
+        self._login_generation = 0
+        # Called after the session was established or invalidated
+        self.on_session_update: Callable[[], None] | None = None
+        self._restored_cookies: dict[str, str] = {}
 
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get aiohttp session."""
-        if self.session is None:
-            self.session = aiohttp.ClientSession()
-            self._session_owner = True
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=self._connector,
+                connector_owner=self._connector is None,
+                cookie_jar=aiohttp.CookieJar(),
+            )
+            if self._restored_cookies:
+                self.session.cookie_jar.update_cookies(
+                    self._restored_cookies, URL(self.base_url)
+                )
+                self._restored_cookies = {}
         return self.session
 
+    def export_session(self) -> dict[str, Any] | None:
+        """Return the token and cookies of a valid session, for persisting."""
+        if not self.session_valid:
+            return None
+        return {"token": self.token, "cookies": dict(self._cookies)}
+
+    def restore_session(self, session: dict[str, Any]) -> None:
+        """Reuse a persisted session; it is checked by the first request."""
+        if self.session_valid or not session.get("token"):
+            return
+        self.token = session["token"]
+        self._cookies = dict(session.get("cookies", {}))
+        self._restored_cookies = dict(self._cookies)
+        if self.session is not None and not self.session.closed:
+            self.session.cookie_jar.update_cookies(self._restored_cookies, URL(self.base_url))
+            self._restored_cookies = {}
+
+    def _notify_session_update(self) -> None:
+        """Tell the owner that the session changed."""
+        if self.on_session_update is not None:
+            self.on_session_update()
+
+    @property
+    def session_valid(self) -> bool:
+        """Return True while the cloud session is believed to be valid."""
+        return self.token is not None
+
+    def invalidate_session(self) -> None:
+        """Forget the current session so the next call logs in again."""
+        self.token = None
+        self._cookies.clear()
+        self._recent_data.clear()
+        if self.session is not None:
+            self.session.cookie_jar.clear()
+        self._notify_session_update()
+
+    async def _ensure_login(self) -> None:
+        """Log in unless a valid session is already established."""
+        if self.session_valid:
+            return
+        if not await self.login():
+            raise SalusAuthError("SALUS cloud rejected the login")
+
+    async def _call_authenticated(self, request, *args: Any) -> Any:
+        """Run a request, logging in again once if the session expired."""
+        await self._ensure_login()
+        generation = self._login_generation
+        try:
+            return await self._call(request, *args)
+        except SalusAuthError:
+            # Requests failing together invalidate the session only once,
+            # and never while the new login is underway
+            if generation == self._login_generation and ("login",) not in self._in_flight:
+                _LOGGER.debug("SALUS session expired, logging in again")
+                self.invalidate_session()
+            await self._ensure_login()
+            return await self._call(request, *args)
+
+    async def _single_flight(self, key: tuple[str, ...], factory) -> Any:
+        """Run ``factory()`` once for all concurrent callers with the same key.
+
+        The shared task is shielded, so a caller that is cancelled does not
+        cancel the request for the others.
+        """
+        if (task := self._in_flight.get(key)) is None:
+            task = asyncio.ensure_future(factory())
+            self._in_flight[key] = task
+
+            def _done(_: asyncio.Task) -> None:
+                if self._in_flight.get(key) is task:
+                    del self._in_flight[key]
+
+            task.add_done_callback(_done)
+        return await asyncio.shield(task)
+
+    async def _call(self, request, *args: Any) -> Any:
+        """Run a request through the circuit breaker, retrying transient failures.
+
+        Timeouts, connection errors and 5xx responses are retried with
+        exponential back-off and jitter; auth failures and rate limiting
+        are left to the caller. Anything the host answered counts as a
+        success for the breaker.
+        """
+        breaker = self.circuit_breaker
+        retries = 0
+        while True:
+            if not breaker.allow_request():
+                raise SalusCircuitOpenError(breaker.host, breaker.retry_in)
+            try:
+                result = await request(*args)
+            except asyncio.CancelledError:
+                breaker.release()
+                raise
+            except Exception as err:
+                if not is_transient(err):
+                    breaker.record_success()
+                    raise
+                breaker.record_failure()
+                if retries + 1 >= self.retry_policy.attempts:
+                    raise
+                delay = self.retry_policy.delay(retries)
+                retries += 1
+                self.metrics.record_retry(getattr(request, "endpoint", None))
+                _LOGGER.debug(
+                    "Request to %s failed (%s), retry %d in %.1fs",
+                    breaker.host,
+                    err or type(err).__name__,
+                    retries,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+            else:
+                breaker.record_success()
+                return result
+
+    @staticmethod
+    def _raise_for_session(response: aiohttp.ClientResponse) -> None:
+        """Raise if the response signals an expired session or throttling.
+
+        A 503 is throttling only with a Retry-After; without one it is left
+        to ``raise_for_status`` as a transient server error.
+        """
+        if response.status in (429, 503):
+            try:
+                retry_after = float(response.headers["Retry-After"])
+            except (KeyError, ValueError):
+                retry_after = None
+            if response.status == 429 or retry_after is not None:
+                raise SalusRateLimitError(retry_after)
+        if response.status in (401, 403):
+            raise SalusAuthError(f"Session rejected with status {response.status}")
+        if response.status in (301, 302, 303, 307, 308):
+            location = response.headers.get("Location", "")
+            if "login" in location.lower():
+                raise SalusAuthError("Session expired, redirected to login")
+
     async def login(self) -> bool:
-        """Authenticate with the SALUS API."""
+        """Authenticate with the SALUS API, sharing one attempt between callers."""
+        return await self._single_flight(("login",), self._login_once)
+
+    async def _login_once(self) -> bool:
+        """Run one login, with retries, and start a new session generation."""
+        if logged_in := await self._call(self._login):
+            self._login_generation += 1
+            self._notify_session_update()
+        return logged_in
+
+    @retry_endpoint(ENDPOINT_LOGIN)
+    async def _login(self) -> bool:
+        """Post the credentials and fetch the session token."""
         session = await self._get_session()
+        self.token = None
         
         # Create password hash (MD5 is used by SALUS)
         password_hash = hashlib.md5(self.password.encode()).hexdigest()
@@ -52,26 +338,30 @@ class SalusAPI:
         }
         
         try:
-            async with async_timeout.timeout(10):
-                async with session.post(
-                    URL_LOGIN,
-                    data=payload,
-                    allow_redirects=False
-                ) as response:
-                    if response.status == 302:  # Redirect on successful login
+            with self.metrics.track(ENDPOINT_LOGIN) as sample:
+                async with async_timeout.timeout(REQUEST_TIMEOUT):
+                    async with session.post(
+                        self.base_url + PATH_LOGIN,
+                        data=payload,
+                        allow_redirects=False
+                    ) as response:
+                        sample.status = response.status
+                        if response.status == 429 or response.status >= 500:
+                            self._raise_for_session(response)
+                            response.raise_for_status()
+                        if response.status != 302:  # Redirect on successful login
+                            _LOGGER.error("Login failed with status: %s", response.status)
+                            return False
                         # Store cookies for subsequent requests
                         for cookie in session.cookie_jar:
                             self._cookies[cookie.key] = cookie.value
-                        
-                        # Get token from control page
-                        return await self._get_token()
-                    else:
-                        _LOGGER.error("Login failed with status: %s", response.status)
-                        return False
         except Exception as err:
             _LOGGER.error("Error during login: %s", err)
             raise
 
+        # Get token from control page
+        return await self._get_token()
+
     async def _get_token(self) -> bool:
         """Get session token from control page."""
         session = await self._get_session()
@@ -81,119 +371,271 @@ class SalusAPI:
         }
         
         try:
-            async with async_timeout.timeout(10):
-                async with session.post(
-                    URL_GET_TOKEN,
-                    data=payload,
-                ) as response:
-                    response.raise_for_status()
-                    content = await response.text()
+            with self.metrics.track(ENDPOINT_TOKEN) as sample:
+                async with async_timeout.timeout(REQUEST_TIMEOUT):
+                    async with session.post(
+                        self.base_url + PATH_GET_TOKEN,
+                        data=payload,
+                    ) as response:
+                        sample.status = response.status
+                        response.raise_for_status()
+                        content = await response.text()
+                        sample.size = len(content)
                     
-                    # Extract token from response (it's embedded in the HTML/JS)
-                    # The token is typically in a variable or hidden field
-                    # This is a simplified version - actual implementation may need HTML parsing
-                    if "token" in content.lower():
-                        # Token retrieval successful
-                        self.token = "authenticated"  # Cookies handle auth
-                        _LOGGER.debug("Successfully obtained token")
-                        return True
-                    else:
-                        _LOGGER.error("Could not find token in response")
-                        return False
+                        # Extract token from response (it's embedded in the HTML/JS)
+                        # The token is typically in a variable or hidden field
+                        # This is a simplified version - actual implementation may need HTML parsing
+                        if "token" in content.lower():
+                            # Token retrieval successful
+                            self.token = "authenticated"  # Cookies handle auth
+                            _LOGGER.debug("Successfully obtained token")
+                            return True
+                        else:
+                            _LOGGER.error("Could not find token in response")
+                            return False
         except Exception as err:
             _LOGGER.error("Error getting token: %s", err)
             raise
 
-    async def get_device_data(self) -> dict[str, Any]:
-        """Get device data from the SALUS API."""
-        if not self.token:
-            await self.login()
-        
+    async def get_device_ids(self) -> list[str]:
+        """Return the ids of all devices registered on the account."""
+        return await self._call_authenticated(self._fetch_device_ids)
+
+    @retry_endpoint(ENDPOINT_DEVICES)
+    async def _fetch_device_ids(self) -> list[str]:
+        """Scrape device ids from the device list page."""
         session = await self._get_session()
-        
-        params = {
-            "devId": self.device_id,
-            "current": 1,  # Get current values
-        }
-        
+
         try:
-            async with async_timeout.timeout(10):
-                async with session.get(
-                    URL_GET_DATA,
-                    params=params,
-                ) as response:
-                    response.raise_for_status()
-                    data = await response.json()
-                    
-                    _LOGGER.debug("Device data received: %s", data)
-                    return data
+            with self.metrics.track(ENDPOINT_DEVICES) as sample:
+                async with async_timeout.timeout(REQUEST_TIMEOUT):
+                    async with session.get(
+                        self.base_url + PATH_DEVICES,
+                        allow_redirects=False,
+                    ) as response:
+                        sample.status = response.status
+                        self._raise_for_session(response)
+                        response.raise_for_status()
+                        content = await response.text()
+                        sample.size = len(content)
+        except SalusError:
+            raise
         except Exception as err:
-            _LOGGER.error("Error getting device data: %s", err)
-            # Try to re-authenticate once
-            self.token = None
-            await self.login()
+            _LOGGER.error("Error getting device list: %s", err)
             raise
 
-    async def set_temperature(self, temperature: float) -> bool:
-        """Set target temperature for the device."""
-        if not self.token:
-            await self.login()
-        
+        # dict.fromkeys keeps page order while dropping repeated links
+        return list(dict.fromkeys(DEVICE_ID_PATTERN.findall(content)))
+
+    async def get_device_data(self, device_id: str | None = None) -> dict[str, Any]:
+        """Get device data from the SALUS API.
+
+        Concurrent callers share one request, and data fetched within the
+        last ``data_share_window`` seconds is returned without a new one.
+        """
+        device_id = device_id or self.device_id
+        if (recent := self._recent_data.get(device_id)) is not None:
+            fetched, data = recent
+            if time.monotonic() - fetched < self.data_share_window:
+                return data
+        return await self._single_flight(
+            ("data", device_id), partial(self._get_device_data_once, device_id)
+        )
+
+    async def _get_device_data_once(self, device_id: str) -> dict[str, Any]:
+        """Fetch device data and remember it for ``data_share_window``.
+
+        A fetch that a write dropped from the in-flight requests meanwhile
+        may hold the old values and is not remembered.
+        """
+        data = await self._call_authenticated(self._fetch_device_data, device_id)
+        if self._in_flight.get(("data", device_id)) is asyncio.current_task():
+            self._recent_data[device_id] = (time.monotonic(), data)
+        return data
+
+    def _forget_device_data(self, device_id: str) -> None:
+        """Make the next read fetch fresh data, e.g. after a write."""
+        self._recent_data.pop(device_id, None)
+        # A fetch already underway may predate the write; let it finish
+        # for its callers but do not hand it to new ones
+        self._in_flight.pop(("data", device_id), None)
+
+    async def get_devices_data(
+        self, device_ids: list[str]
+    ) -> dict[str, dict[str, Any] | Exception]:
+        """Get data for several devices with one login and bounded concurrency.
+
+        Failures are returned per device instead of being raised, so one
+        offline thermostat does not hide the others.
+        """
+        await self._ensure_login()
+        semaphore = asyncio.Semaphore(MAX_PARALLEL_REQUESTS)
+
+        async def _fetch(device_id: str) -> dict[str, Any]:
+            async with semaphore:
+                return await self.get_device_data(device_id)
+
+        results = await asyncio.gather(
+            *(_fetch(device_id) for device_id in device_ids),
+            return_exceptions=True,
+        )
+        return dict(zip(device_ids, results))
+
+    @retry_endpoint(ENDPOINT_DATA)
+    async def _fetch_device_data(self, device_id: str) -> dict[str, Any]:
+        """Fetch current device values using the existing session."""
         session = await self._get_session()
         
-        payload = {
-            "devId": self.device_id,
-            "current_tempZ1_set": str(temperature),
-            "tempUnit": "0",  # 0 = Celsius, 1 = Fahrenheit
+        params = {
+            "devId": device_id,
+            "current": 1,  # Get current values
         }
         
         try:
-            async with async_timeout.timeout(10):
-                async with session.post(
-                    URL_SET_DATA,
-                    data=payload,
-                ) as response:
-                    response.raise_for_status()
-                    result = await response.text()
-                    
-                    _LOGGER.debug("Set temperature response: %s", result)
-                    return "success" in result.lower() or response.status == 200
+            with self.metrics.track(ENDPOINT_DATA) as sample:
+                async with async_timeout.timeout(REQUEST_TIMEOUT):
+                    async with session.get(
+                        self.base_url + PATH_GET_DATA,
+                        params=params,
+                        allow_redirects=False,
+                    ) as response:
+                        sample.status = response.status
+                        self._raise_for_session(response)
+                        response.raise_for_status()
+                        # Raw bytes: json.loads decodes them without a str copy
+                        content = await response.read()
+                        sample.size = len(content)
+        except SalusError:
+            raise
         except Exception as err:
-            _LOGGER.error("Error setting temperature: %s", err)
+            _LOGGER.error("Error getting device data: %s", err)
             raise
 
-    async def set_hvac_mode(self, mode: str) -> bool:
-        """Set HVAC mode for the device."""
-        if not self.token:
-            await self.login()
-        
+        # An expired session gets the HTML login page instead of JSON
+        if content.lstrip().startswith(b"<"):
+            raise SalusAuthError("Login page returned instead of device data")
+
+        data = json.loads(content, object_pairs_hook=self._object_hook)
+        # The full payload is in the diagnostics download; log only its size
+        _LOGGER.debug(
+            "Device %s data received: %d bytes, %d fields kept",
+            device_id,
+            len(content),
+            len(data),
+        )
+        return data
+
+    @retry_endpoint(ENDPOINT_SET)
+    async def _post_set_data(self, payload: dict[str, str], description: str) -> bool:
+        """Post form fields to set.php using the existing session."""
         session = await self._get_session()
-        
-        # Mode mapping: 0 = Off, 1 = On (Auto/Heat)
-        mode_value = "1" if mode in ["heat", "auto"] else "0"
-        
-        payload = {
-            "devId": self.device_id,
-            "auto": mode_value,
-        }
-        
+
         try:
-            async with async_timeout.timeout(10):
-                async with session.post(
-                    URL_SET_DATA,
-                    data=payload,
-                ) as response:
-                    response.raise_for_status()
-                    result = await response.text()
-                    
-                    _LOGGER.debug("Set HVAC mode response: %s", result)
-                    return "success" in result.lower() or response.status == 200
+            with self.metrics.track(ENDPOINT_SET) as sample:
+                async with async_timeout.timeout(REQUEST_TIMEOUT):
+                    async with session.post(
+                        self.base_url + PATH_SET_DATA,
+                        data=payload,
+                        allow_redirects=False,
+                    ) as response:
+                        sample.status = response.status
+                        self._raise_for_session(response)
+                        response.raise_for_status()
+                        result = await response.text()
+                        sample.size = len(result)
+        except SalusError:
+            raise
         except Exception as err:
-            _LOGGER.error("Error setting HVAC mode: %s", err)
+            _LOGGER.error("Error setting %s: %s", description, err)
             raise
 
+        if LOGIN_FORM_MARKER in result.lower():
+            raise SalusAuthError("Login page returned instead of set response")
+
+        _LOGGER.debug("Set %s response: %s", description, result)
+        return "success" in result.lower() or response.status == 200
+
+    async def set_values(self, device_id: str | None = None, **fields: Any) -> bool:
+        """Write several set.php fields, in one request when the cloud allows.
+
+        If set.php rejects a combined request, the fields are written one
+        request each and later calls go straight to single-field writes.
+        """
+        device_id = device_id or self.device_id
+        # Reads overlapping the write must not be shared afterwards
+        self._forget_device_data(device_id)
+        try:
+            if len(fields) > 1 and self.combined_writes is not False:
+                try:
+                    accepted = await self._call_authenticated(
+                        self._post_set_data,
+                        self._build_set_payload(device_id, fields),
+                        ", ".join(fields),
+                    )
+                except aiohttp.ClientResponseError as err:
+                    if err.status not in (400, 422):
+                        raise
+                    accepted = False
+                if accepted:
+                    self.combined_writes = True
+                    return True
+                _LOGGER.debug("Combined write rejected, writing fields one by one")
+                self.combined_writes = False
+
+            success = True
+            for field, value in fields.items():
+                success = await self._call_authenticated(
+                    self._post_set_data,
+                    self._build_set_payload(device_id, {field: value}),
+                    field,
+                ) and success
+            return success
+        finally:
+            self._forget_device_data(device_id)
+
+    async def set_devices_values(
+        self, writes: dict[str, dict[str, Any]]
+    ) -> dict[str, bool | Exception]:
+        """Write set.php fields to several devices with bounded concurrency.
+
+        Failures are returned per device instead of being raised.
+        """
+        await self._ensure_login()
+        semaphore = asyncio.Semaphore(MAX_PARALLEL_REQUESTS)
+
+        async def _write(device_id: str, fields: dict[str, Any]) -> bool:
+            async with semaphore:
+                return await self.set_values(device_id, **fields)
+
+        results = await asyncio.gather(
+            *(_write(device_id, fields) for device_id, fields in writes.items()),
+            return_exceptions=True,
+        )
+        return dict(zip(writes, results))
+
+    @staticmethod
+    def _build_set_payload(device_id: str, fields: dict[str, Any]) -> dict[str, str]:
+        """Build a set.php form, including the fields each write depends on."""
+        payload = {"devId": device_id}
+        for field, value in fields.items():
+            payload[field] = str(value)
+            payload.update(FIELD_COMPANIONS.get(field, {}))
+        return payload
+
+    async def set_temperature(
+        self, temperature: float, device_id: str | None = None
+    ) -> bool:
+        """Set target temperature for the device."""
+        return await self.set_values(device_id, **{FIELD_SETPOINT: temperature})
+
+    async def set_hvac_mode(self, mode: str, device_id: str | None = None) -> bool:
+        """Set HVAC mode for the device."""
+        return await self.set_values(device_id, **{FIELD_AUTO: hvac_mode_value(mode)})
+
     async def close(self) -> None:
-        """Close the session."""
-        if self.session and self._session_owner:
+        """Close the session, leaving a shared connector open."""
+        if self.session:
             await self.session.close()
             self.session = None
+        self.token = None
+        self._recent_data.clear()
@@ -0,0 +1,416 @@
+"""Schedule templates and the active schedule of each SALUS RT310i device."""
+from __future__ import annotations
+
+from bisect import bisect_right
+from datetime import datetime, time, timedelta
+import logging
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Mapping
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt as dt_util
+
+from .const import FIELD_SETPOINT
+
+if TYPE_CHECKING:
+    from .boost import SalusBoostManager
+    from .coordinator import SalusAccountCoordinator
+    from .storage import SalusScheduleStore
+    from .write_queue import SalusWriteQueue
+
+_LOGGER = logging.getLogger(__name__)
+
+DAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+WEEKEND = frozenset({"sat", "sun"})
+MINUTES_PER_DAY = 24 * 60
+
+# Default schedule templates
+SCHEDULE_TEMPLATES = {
+    "comfort": {
+        "name": "Comfort Schedule",
+        "periods": {
+            "weekday": [
+                {"start": "06:00", "end": "08:00", "temp": 21},  # Morning
+                {"start": "08:00", "end": "17:00", "temp": 18},  # Day (away)
+                {"start": "17:00", "end": "22:00", "temp": 21},  # Evening
+                {"start": "22:00", "end": "06:00", "temp": 17},  # Night
+            ],
+            "weekend": [
+                {"start": "07:00", "end": "23:00", "temp": 21},  # Day
+                {"start": "23:00", "end": "07:00", "temp": 17},  # Night
+            ],
+        },
+    },
+    "eco": {
+        "name": "Eco Schedule",
+        "periods": {
+            "weekday": [
+                {"start": "06:00", "end": "08:00", "temp": 19},  # Morning
+                {"start": "08:00", "end": "17:00", "temp": 16},  # Day (away)
+                {"start": "17:00", "end": "22:00", "temp": 19},  # Evening
+                {"start": "22:00", "end": "06:00", "temp": 16},  # Night
+            ],
+            "weekend": [
+                {"start": "07:00", "end": "23:00", "temp": 19},  # Day
+                {"start": "23:00", "end": "07:00", "temp": 16},  # Night
+            ],
+        },
+    },
+    "working_from_home": {
+        "name": "Work From Home",
+        "periods": {
+            "weekday": [
+                {"start": "06:00", "end": "08:00", "temp": 21},  # Morning
+                {"start": "08:00", "end": "12:00", "temp": 20},  # Work morning
+                {"start": "12:00", "end": "13:00", "temp": 21},  # Lunch
+                {"start": "13:00", "end": "17:00", "temp": 20},  # Work afternoon
+                {"start": "17:00", "end": "22:00", "temp": 21},  # Evening
+                {"start": "22:00", "end": "06:00", "temp": 17},  # Night
+            ],
+            "weekend": [
+                {"start": "08:00", "end": "23:00", "temp": 21},  # Day
+                {"start": "23:00", "end": "08:00", "temp": 17},  # Night
+            ],
+        },
+    },
+}
+
+
+class SalusScheduleRegistry:
+    """Active schedule template and schedule switch of one device.
+
+    The schedule switches read their state from here instead of from each
+    other's states. Activating a template is a single change: the previous
+    template, the new one and the master switch are updated together by
+    their listeners, without service calls between them.
+    """
+
+    def __init__(self, device_id: str, store: SalusScheduleStore | None = None) -> None:
+        """Initialize from the saved state, or with no active template."""
+        self.device_id = device_id
+        self._store = store
+        saved = store.device(device_id) if store is not None else {}
+        self.active: str | None = saved.get("active")
+        self.enabled: bool = saved.get("enabled", False)
+        self._listeners: list[Callable[[str | None, str | None], None]] = []
+
+    @property
+    def templates(self) -> Mapping[str, dict[str, Any]]:
+        """Return the built-in and custom templates that can be activated."""
+        if self._store is None:
+            return SCHEDULE_TEMPLATES
+        return self._store.templates
+
+    @callback
+    def async_add_listener(
+        self, update_callback: Callable[[str | None, str | None], None]
+    ) -> CALLBACK_TYPE:
+        """Call back with the previous and new template on every change."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_restore(self, template_id: str | None, enabled: bool) -> None:
+        """Take over state saved before a restart, without notifying."""
+        if template_id in self.templates and self.active is None:
+            self.active = template_id
+        self.enabled = self.enabled or enabled
+
+    @callback
+    def async_activate(self, template_id: str) -> bool:
+        """Make a template the active one and enable the schedule."""
+        if template_id not in self.templates:
+            raise ValueError(f"Unknown schedule template: {template_id}")
+        if self.active == template_id and self.enabled:
+            return False
+        previous, self.active, self.enabled = self.active, template_id, True
+        _LOGGER.info(
+            "Activated schedule template %s for device %s", template_id, self.device_id
+        )
+        self._async_notify(previous)
+        return True
+
+    @callback
+    def async_deactivate(self, template_id: str) -> bool:
+        """Deactivate a template if it is the active one."""
+        if self.active != template_id:
+            return False
+        self.active = None
+        _LOGGER.info(
+            "Deactivated schedule template %s for device %s", template_id, self.device_id
+        )
+        self._async_notify(template_id)
+        return True
+
+    @callback
+    def async_set_enabled(self, enabled: bool) -> bool:
+        """Enable or disable the schedule, keeping the active template."""
+        if self.enabled == enabled:
+            return False
+        self.enabled = enabled
+        self._async_notify(self.active)
+        return True
+
+    @callback
+    def _async_notify(self, previous: str | None) -> None:
+        """Save the change and tell every listener about it."""
+        if self._store is not None:
+            self._store.async_update_device(
+                self.device_id, active=self.active, enabled=self.enabled
+            )
+        for update_callback in list(self._listeners):
+            update_callback(previous, self.active)
+
+
+class CompiledSchedule:
+    """Setpoint of every minute of the week, as one step function per day.
+
+    Each day is a sorted list of segment starts with the setpoint from
+    there to the next start (None between periods, where the setpoint is
+    left alone). A period ending at or before its start runs past
+    midnight and is split over both days; the next day's own periods win
+    over the part that spilled into it. Otherwise periods listed later
+    win where they overlap, so overrides go last.
+    """
+
+    __slots__ = ("_starts", "_setpoints")
+
+    def __init__(self, periods: Iterable[tuple[int, int, int, float]]) -> None:
+        """Compile (day, start minute, end minute, setpoint) periods."""
+        spilled: list[list[tuple[int, int, float]]] = [[] for _ in DAYS]
+        own: list[list[tuple[int, int, float]]] = [[] for _ in DAYS]
+        for day, start, end, setpoint in periods:
+            if end > start:
+                own[day].append((start, end, setpoint))
+                continue
+            own[day].append((start, MINUTES_PER_DAY, setpoint))
+            if end > 0:
+                spilled[(day + 1) % len(DAYS)].append((0, end, setpoint))
+
+        self._starts: list[list[int]] = []
+        self._setpoints: list[list[float | None]] = []
+        for day in range(len(DAYS)):
+            intervals = spilled[day] + own[day]
+            edges = {edge for interval in intervals for edge in interval[:2]}
+            bounds = sorted(({0} | edges) - {MINUTES_PER_DAY})
+            starts: list[int] = []
+            setpoints: list[float | None] = []
+            for bound in bounds:
+                setpoint = None
+                for start, end, value in intervals:
+                    if start <= bound < end:
+                        setpoint = value
+                if not setpoints or setpoints[-1] != setpoint:
+                    starts.append(bound)
+                    setpoints.append(setpoint)
+            self._starts.append(starts)
+            self._setpoints.append(setpoints)
+
+    @classmethod
+    def from_template(
+        cls, template: Mapping[str, Any], overrides: Iterable[Mapping[str, Any]] = ()
+    ) -> CompiledSchedule:
+        """Compile a template's weekday/weekend periods plus day overrides."""
+        periods = []
+        for day, name in enumerate(DAYS):
+            kind = "weekend" if name in WEEKEND else "weekday"
+            for period in template["periods"][kind]:
+                periods.append(_period(day, period))
+        for override in overrides:
+            for name in override.get("days") or DAYS:
+                periods.append(_period(DAYS.index(name), override))
+        return cls(periods)
+
+    def setpoint(self, day: int, minute: int) -> float | None:
+        """Return the setpoint at a minute of a day, or None between periods."""
+        index = bisect_right(self._starts[day], minute) - 1
+        return self._setpoints[day][index]
+
+    def next_change(self, day: int, minute: int) -> tuple[int, int] | None:
+        """Return (days ahead, minute) of the next setpoint change, if any."""
+        index = bisect_right(self._starts[day], minute) - 1
+        if index + 1 < len(self._starts[day]):
+            return 0, self._starts[day][index + 1]
+        current = self._setpoints[day][index]
+        for ahead in range(1, len(DAYS) + 1):
+            next_day = (day + ahead) % len(DAYS)
+            for start, setpoint in zip(self._starts[next_day], self._setpoints[next_day]):
+                if setpoint != current:
+                    return ahead, start
+        return None
+
+
+class SalusScheduleEngine:
+    """Apply a device's active schedule at each of its transitions.
+
+    While the schedule is enabled and a template is active, the engine
+    writes the current period's setpoint and sets one timer for the next
+    transition; it does not poll. While the device is boosted, the
+    setpoint is kept for when the boost ends instead. The schedule is
+    compiled again only when the active template or the device's
+    overrides change. Services that activate or reload many schedules at
+    once take the setpoints and write them in one fleet batch instead.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        registry: SalusScheduleRegistry,
+        store: SalusScheduleStore,
+        coordinator: SalusAccountCoordinator,
+        write_queue: SalusWriteQueue,
+        boosts: SalusBoostManager | None = None,
+    ) -> None:
+        """Initialize the engine."""
+        self.hass = hass
+        self._boosts = boosts
+        self._registry = registry
+        self._store = store
+        self._coordinator = coordinator
+        self._write_queue = write_queue
+        self._schedule: CompiledSchedule | None = None
+        self._unsub_registry: CALLBACK_TYPE | None = None
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._activating = False
+        self.next_transition: datetime | None = None
+
+    @property
+    def device_id(self) -> str:
+        """Return the device the engine drives."""
+        return self._registry.device_id
+
+    @callback
+    def async_start(self) -> None:
+        """Follow the registry and apply the current schedule."""
+        self._unsub_registry = self._registry.async_add_listener(self._async_changed)
+        self.async_reload()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following the registry and cancel the timer."""
+        if self._unsub_registry is not None:
+            self._unsub_registry()
+            self._unsub_registry = None
+        self._cancel_timer()
+
+    @callback
+    def async_activate(self, template_id: str) -> float | None:
+        """Activate a template and return the setpoint to write now, if any.
+
+        The setpoint is not written; the caller writes it, so the setpoints
+        of many devices go out in one fleet batch.
+        """
+        self._activating = True
+        try:
+            self._registry.async_activate(template_id)
+        finally:
+            self._activating = False
+        return self.async_reload(write=False)
+
+    @callback
+    def async_reload(self, write: bool = True) -> float | None:
+        """Compile the active schedule again and apply it.
+
+        Return the setpoint in force if the device is not at it yet; with
+        ``write`` False it is left to the caller to write.
+        """
+        self._cancel_timer()
+        self._schedule = None
+        active = self._registry.active
+        if self._registry.enabled and active in self._registry.templates:
+            self._schedule = CompiledSchedule.from_template(
+                self._registry.templates[active],
+                self._store.device(self.device_id).get("periods", []),
+            )
+            return self._async_apply(dt_util.now(), write)
+        return None
+
+    @callback
+    def _async_changed(self, previous: str | None, active: str | None) -> None:
+        """Recompile after another template was activated or the schedule toggled."""
+        if previous != active and self._store.device(self.device_id).get("periods"):
+            # Applied periods belong to the template they were applied to
+            self._store.async_update_device(self.device_id, periods=[])
+        if not self._activating:
+            self.async_reload()
+
+    @callback
+    def _async_transition(self, now: datetime) -> None:
+        """Apply the period that starts now."""
+        self._unsub_timer = None
+        self._async_apply(dt_util.as_local(now))
+
+    @callback
+    def _async_apply(self, now: datetime, write: bool = True) -> float | None:
+        """Write the setpoint in force at ``now`` and time the next change."""
+        if self._schedule is None:
+            return None
+        day, minute = now.weekday(), now.hour * 60 + now.minute
+        setpoint = self._schedule.setpoint(day, minute)
+        state = (self._coordinator.data or {}).get(self.device_id)
+        if setpoint is not None and self._boosts is not None:
+            if self._boosts.async_defer(self.device_id, setpoint):
+                setpoint = None
+        if setpoint is not None and state is not None and (
+            state.target_temperature == setpoint
+        ):
+            setpoint = None
+        if setpoint is not None and write:
+            _LOGGER.debug("Schedule sets device %s to %s", self.device_id, setpoint)
+            self.hass.async_create_task(
+                self._write_queue.async_set_values(**{FIELD_SETPOINT: setpoint})
+            )
+        if (change := self._schedule.next_change(day, minute)) is None:
+            self.next_transition = None
+            return setpoint
+        ahead, start = change
+        self.next_transition = datetime.combine(
+            now.date() + timedelta(days=ahead),
+            time(start // 60, start % 60),
+            tzinfo=now.tzinfo,
+        )
+        self._unsub_timer = async_track_point_in_time(
+            self.hass, self._async_transition, self.next_transition
+        )
+        return setpoint
+
+    @callback
+    def _cancel_timer(self) -> None:
+        """Cancel the pending transition."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self.next_transition = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the engine state for diagnostics."""
+        now = dt_util.now()
+        return {
+            "active": self._registry.active,
+            "enabled": self._registry.enabled,
+            "setpoint": (
+                self._schedule.setpoint(now.weekday(), now.hour * 60 + now.minute)
+                if self._schedule is not None
+                else None
+            ),
+            "next_transition": (
+                self.next_transition.isoformat() if self.next_transition else None
+            ),
+            "overrides": self._store.device(self.device_id).get("periods", []),
+        }
+
+
+def _period(day: int, period: Mapping[str, Any]) -> tuple[int, int, int, float]:
+    """Return a stored period as (day, start minute, end minute, setpoint)."""
+    return day, _minutes(period["start"]), _minutes(period["end"]), float(period["temp"])
+
+
+def _minutes(value: str) -> int:
+    """Return the minute of the day of an "HH:MM" time."""
+    hours, minutes = value.split(":")[:2]
+    return int(hours) * 60 + int(minutes)
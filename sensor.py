@@ -10,12 +10,13 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfTime, PERCENTAGE
+from homeassistant.const import EntityCategory, UnitOfTime, PERCENTAGE
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
+from .entity import SalusEntity
+from .metrics import ENDPOINT_DATA
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,46 +29,41 @@ async def async_setup_entry(
     """Set up SALUS RT310i sensor platform."""
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
     device_id = hass.data[DOMAIN][entry.entry_id]["device_id"]
+    # Restored at startup from the saved snapshot until the first poll
+    state = coordinator.last_known_state(device_id)
     
     sensors = [
         SalusTargetTemperatureSensor(coordinator, device_id),
         SalusHeatingDemandSensor(coordinator, device_id),
         SalusLastUpdateSensor(coordinator, device_id),
         SalusOperationModeSensor(coordinator, device_id),
+        SalusApiLatencySensor(coordinator, device_id),
+        SalusApiRequestsSensor(coordinator, device_id),
     ]
     
     # Add optional sensors if data available
-    if coordinator.data.get("CH1frostProtectionTemp"):
+    if state.frost_protection_temp is not None:
         sensors.append(SalusFrostProtectionSensor(coordinator, device_id))
     
     async_add_entities(sensors)
 
 
-class SalusBaseSensor(CoordinatorEntity, SensorEntity):
+class SalusBaseSensor(SalusEntity, SensorEntity):
     """Base class for SALUS sensors."""
 
     def __init__(self, coordinator, device_id, sensor_type: str, name: str):
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._device_id = device_id
+        super().__init__(coordinator, device_id)
         self._sensor_type = sensor_type
         self._attr_name = name
         self._attr_unique_id = f"salus_{device_id}_{sensor_type}"
 
-    @property
-    def device_info(self):
-        """Return device information."""
-        return {
-            "identifiers": {(DOMAIN, self._device_id)},
-            "name": f"SALUS RT310i {self._device_id}",
-            "manufacturer": "SALUS",
-            "model": "RT310i",
-        }
-
 
 class SalusTargetTemperatureSensor(SalusBaseSensor):
     """Sensor for target temperature."""
 
+    _state_fields = ("target_temperature",)
+
     def __init__(self, coordinator, device_id):
         """Initialize the sensor."""
         super().__init__(coordinator, device_id, "target_temp", "Target Temperature")
@@ -78,17 +74,16 @@ class SalusTargetTemperatureSensor(SalusBaseSensor):
     @property
     def native_value(self) -> float | None:
         """Return the target temperature."""
-        if self.coordinator.data and "CH1currentSetPoint" in self.coordinator.data:
-            try:
-                return float(self.coordinator.data["CH1currentSetPoint"])
-            except (ValueError, TypeError):
-                return None
-        return None
+        if (state := self.device_state) is None:
+            return None
+        return state.target_temperature
 
 
 class SalusHeatingDemandSensor(SalusBaseSensor):
     """Sensor for heating demand percentage."""
 
+    _state_fields = ("heating_enabled", "current_temperature", "target_temperature")
+
     def __init__(self, coordinator, device_id):
         """Initialize the sensor."""
         super().__init__(coordinator, device_id, "heating_demand", "Heating Demand")
@@ -99,53 +94,56 @@ class SalusHeatingDemandSensor(SalusBaseSensor):
     @property
     def native_value(self) -> int | None:
         """Return the heating demand."""
-        if self.coordinator.data:
-            current_temp = self.coordinator.data.get("CH1currentRoomTemp")
-            target_temp = self.coordinator.data.get("CH1currentSetPoint")
-            heating_on = self.coordinator.data.get("CH1heatOnOff")
-            
-            if current_temp and target_temp and heating_on:
-                try:
-                    current = float(current_temp)
-                    target = float(target_temp)
-                    is_heating = heating_on == "1"
-                    
-                    if not is_heating:
-                        return 0
-                    
-                    # Calculate demand based on temperature difference
-                    diff = target - current
-                    if diff <= 0:
-                        return 0
-                    
-                    # Scale to percentage (max 5°C difference = 100%)
-                    demand = min(100, int((diff / 5.0) * 100))
-                    return demand
-                except (ValueError, TypeError):
-                    pass
-        return 0
+        state = self.device_state
+        if (
+            state is None
+            or not state.heating_enabled
+            or state.current_temperature is None
+            or state.target_temperature is None
+        ):
+            return 0
+        
+        # Calculate demand based on temperature difference
+        diff = state.target_temperature - state.current_temperature
+        if diff <= 0:
+            return 0
+        
+        # Scale to percentage (max 5°C difference = 100%)
+        return min(100, int((diff / 5.0) * 100))
 
 
 class SalusLastUpdateSensor(SalusBaseSensor):
     """Sensor for last update time."""
 
+    _unrecorded_attributes = frozenset({"cache_age", "cache_hits", "cache_stale"})
+
     def __init__(self, coordinator, device_id):
         """Initialize the sensor."""
         super().__init__(coordinator, device_id, "last_update", "Last Update")
         self._attr_device_class = SensorDeviceClass.TIMESTAMP
         self._attr_icon = "mdi:clock-outline"
 
+    @property
+    def available(self) -> bool:
+        """Return True; the time of the last good update is always known."""
+        return True
+
     @property
     def native_value(self) -> datetime | None:
-        """Return the last update time."""
-        if self.coordinator.last_update_success_time:
-            return self.coordinator.last_update_success_time
-        return None
+        """Return when the device's data was last fetched successfully."""
+        return self.coordinator.last_fetched(self._device_id)
+
+    @property
+    def extra_state_attributes(self):
+        """Return the age and hit/stale counts of the cached device state."""
+        return self.coordinator.cache_diagnostics(self._device_id)
 
 
 class SalusOperationModeSensor(SalusBaseSensor):
     """Sensor for operation mode."""
 
+    _state_fields = ("heating_enabled", "schedule_on", "auto_off")
+
     def __init__(self, coordinator, device_id):
         """Initialize the sensor."""
         super().__init__(coordinator, device_id, "operation_mode", "Operation Mode")
@@ -154,36 +152,34 @@ class SalusOperationModeSensor(SalusBaseSensor):
     @property
     def native_value(self) -> str | None:
         """Return the operation mode."""
-        if self.coordinator.data:
-            heating_on = self.coordinator.data.get("CH1heatOnOff", "0")
-            auto_off = self.coordinator.data.get("CH1autoOff", "0")
-            schedule_on = self.coordinator.data.get("CH1scheduleOn", "0")
-            
-            if heating_on == "0":
-                return "Off"
-            elif schedule_on == "1":
-                return "Schedule"
-            elif auto_off == "0":
-                return "Manual"
-            else:
-                return "Auto"
-        return "Unknown"
+        if (state := self.device_state) is None:
+            return "Unknown"
+        if not state.heating_enabled:
+            return "Off"
+        elif state.schedule_on:
+            return "Schedule"
+        elif not state.auto_off:
+            return "Manual"
+        else:
+            return "Auto"
 
     @property
     def extra_state_attributes(self):
         """Return additional attributes."""
-        if self.coordinator.data:
-            return {
-                "heating_enabled": self.coordinator.data.get("CH1heatOnOff") == "1",
-                "schedule_enabled": self.coordinator.data.get("CH1scheduleOn") == "1",
-                "auto_mode": self.coordinator.data.get("CH1autoOff") == "0",
-            }
-        return {}
+        if (state := self.device_state) is None:
+            return {}
+        return {
+            "heating_enabled": state.heating_enabled is True,
+            "schedule_enabled": state.schedule_on is True,
+            "auto_mode": state.auto_off is False,
+        }
 
 
 class SalusFrostProtectionSensor(SalusBaseSensor):
     """Sensor for frost protection temperature."""
 
+    _state_fields = ("frost_protection_temp",)
+
     def __init__(self, coordinator, device_id):
         """Initialize the sensor."""
         super().__init__(coordinator, device_id, "frost_protection", "Frost Protection")
@@ -195,9 +191,89 @@ class SalusFrostProtectionSensor(SalusBaseSensor):
     @property
     def native_value(self) -> float | None:
         """Return the frost protection temperature."""
-        if self.coordinator.data and "CH1frostProtectionTemp" in self.coordinator.data:
-            try:
-                return float(self.coordinator.data["CH1frostProtectionTemp"])
-            except (ValueError, TypeError):
-                return None
-        return None
+        if (state := self.device_state) is None:
+            return None
+        return state.frost_protection_temp
+
+
+class SalusApiLatencySensor(SalusBaseSensor):
+    """Diagnostic sensor for the SALUS cloud response time."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _unrecorded_attributes = frozenset({"endpoints"})
+
+    def __init__(self, coordinator, device_id):
+        """Initialize the sensor."""
+        super().__init__(coordinator, device_id, "api_latency", "API Latency")
+        self._attr_device_class = SensorDeviceClass.DURATION
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+        self._attr_icon = "mdi:timer-outline"
+
+    @property
+    def available(self) -> bool:
+        """Return True; request metrics are kept while the cloud is down."""
+        return True
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the 95th percentile latency of device data requests."""
+        latency = self.coordinator.api.metrics.endpoints[ENDPOINT_DATA].latency
+        if (p95 := latency.percentile(95)) is None:
+            return None
+        return round(p95 * 1000, 1)
+
+    @property
+    def extra_state_attributes(self):
+        """Return latency percentiles per endpoint."""
+        endpoints = {}
+        for endpoint, metrics in self.coordinator.api.metrics.endpoints.items():
+            if metrics.latency.count:
+                latency = metrics.latency.as_dict()
+                endpoints[endpoint] = {
+                    key: latency[key] for key in ("count", "p50_ms", "p95_ms", "max_ms")
+                }
+        return {"endpoints": endpoints}
+
+
+class SalusApiRequestsSensor(SalusBaseSensor):
+    """Diagnostic sensor counting requests to the SALUS cloud."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _unrecorded_attributes = frozenset({"statuses", "bytes_received"})
+
+    def __init__(self, coordinator, device_id):
+        """Initialize the sensor."""
+        super().__init__(coordinator, device_id, "api_requests", "API Requests")
+        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+        self._attr_icon = "mdi:cloud-sync-outline"
+
+    @property
+    def available(self) -> bool:
+        """Return True; request metrics are kept while the cloud is down."""
+        return True
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of requests sent by the account's client."""
+        return self.coordinator.api.metrics.requests
+
+    @property
+    def extra_state_attributes(self):
+        """Return error, retry, status and size counters."""
+        metrics = self.coordinator.api.metrics
+        return {
+            "errors": metrics.errors,
+            "retries": metrics.retries,
+            "statuses": {
+                endpoint: dict(endpoint_metrics.statuses)
+                for endpoint, endpoint_metrics in metrics.endpoints.items()
+                if endpoint_metrics.statuses
+            },
+            "bytes_received": sum(
+                endpoint_metrics.bytes_received
+                for endpoint_metrics in metrics.endpoints.values()
+            ),
+        }
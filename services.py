@@ -0,0 +1,421 @@
+"""Services of the SALUS RT310i Thermostat integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Any
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import slugify
+
+from .boost import SalusBoostManager, async_get_boost_manager
+from .const import (
+    DOMAIN,
+    FIELD_AUTO,
+    FIELD_FROST,
+    FIELD_FROST_TEMP,
+    FIELD_HOLIDAY,
+    FIELD_HOLIDAY_TEMP,
+    FIELD_SETPOINT,
+)
+from .device_index import async_get_device_index
+from .fleet import async_write_fleet, fleet_response
+from .salus_api import hvac_mode_value
+from .schedules import DAYS, SCHEDULE_TEMPLATES
+from .storage import async_get_boost_store, async_get_schedule_store
+
+_LOGGER = logging.getLogger(__name__)
+
+# Service schemas
+SERVICE_BOOST_HEATING = "boost_heating"
+SERVICE_SET_FROST_PROTECTION = "set_frost_protection"
+SERVICE_SET_HOLIDAY_MODE = "set_holiday_mode"
+SERVICE_SET_SCHEDULE = "set_schedule"
+SERVICE_CREATE_CUSTOM_SCHEDULE = "create_custom_schedule"
+SERVICE_APPLY_SCHEDULE_PERIOD = "apply_schedule_period"
+SERVICE_GET_SCHEDULES = "get_schedules"
+SERVICE_SET_TEMPERATURE_BULK = "set_temperature_bulk"
+
+# Fleet services take any number of thermostats or devices
+FLEET_TARGETS = {
+    vol.Optional("entity_id"): cv.entity_ids,
+    vol.Optional("device_id"): vol.All(cv.ensure_list, [cv.string]),
+}
+
+BOOST_HEATING_SCHEMA = vol.All(
+    vol.Schema({
+        **FLEET_TARGETS,
+        vol.Required("duration"): vol.All(vol.Coerce(int), vol.Range(min=5, max=120)),
+        vol.Optional("temperature"): vol.All(vol.Coerce(float), vol.Range(min=5, max=35)),
+    }),
+    cv.has_at_least_one_key("entity_id", "device_id"),
+)
+
+FROST_PROTECTION_SCHEMA = vol.Schema({
+    vol.Required("entity_id"): cv.entity_id,
+    vol.Required("enabled"): cv.boolean,
+    vol.Optional("temperature"): vol.All(vol.Coerce(float), vol.Range(min=5, max=15)),
+})
+
+HOLIDAY_MODE_SCHEMA = vol.All(
+    vol.Schema({
+        **FLEET_TARGETS,
+        vol.Required("enabled"): cv.boolean,
+        vol.Optional("temperature"): vol.All(vol.Coerce(float), vol.Range(min=5, max=25)),
+    }),
+    cv.has_at_least_one_key("entity_id", "device_id"),
+)
+
+SET_SCHEDULE_SCHEMA = vol.All(
+    vol.Schema({
+        **FLEET_TARGETS,
+        vol.Required("schedule_name"): cv.string,
+    }),
+    cv.has_at_least_one_key("entity_id", "device_id"),
+)
+
+SET_TEMPERATURE_BULK_SCHEMA = vol.All(
+    vol.Schema({
+        **FLEET_TARGETS,
+        vol.Required("temperature"): vol.All(vol.Coerce(float), vol.Range(min=5, max=35)),
+        vol.Optional("hvac_mode"): vol.In(["heat", "off"]),
+    }),
+    cv.has_at_least_one_key("entity_id", "device_id"),
+)
+
+# Times are stored as "HH:MM"
+TIME_OF_DAY = vol.All(cv.time, lambda value: value.strftime("%H:%M"))
+SCHEDULE_TEMPERATURE = vol.All(vol.Coerce(float), vol.Range(min=5, max=35))
+
+PERIOD_SCHEMA = vol.Schema({
+    vol.Required("start"): TIME_OF_DAY,
+    vol.Required("end"): TIME_OF_DAY,
+    vol.Required("temp"): SCHEDULE_TEMPERATURE,
+})
+
+CREATE_CUSTOM_SCHEDULE_SCHEMA = vol.Schema({
+    vol.Optional("entity_id"): cv.entity_id,
+    vol.Required("name"): cv.string,
+    vol.Required("weekday_periods"): vol.All(cv.ensure_list, [PERIOD_SCHEMA]),
+    vol.Optional("weekend_periods"): vol.All(cv.ensure_list, [PERIOD_SCHEMA]),
+})
+
+APPLY_SCHEDULE_PERIOD_SCHEMA = vol.Schema({
+    vol.Required("entity_id"): cv.entity_id,
+    vol.Required("start_time"): TIME_OF_DAY,
+    vol.Required("end_time"): TIME_OF_DAY,
+    vol.Required("temperature"): SCHEDULE_TEMPERATURE,
+    vol.Optional("days"): vol.All(cv.ensure_list, [vol.In(DAYS)]),
+})
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services once for every config entry.
+
+    Each call is routed to the entries owning its targets through the
+    device index, so entries can be set up, reloaded and unloaded without
+    touching the services.
+    """
+
+    async def handle_boost_heating(call: ServiceCall) -> ServiceResponse:
+        """Handle boost heating service call."""
+        duration = call.data["duration"]
+        temperature = call.data.get("temperature")
+        targets, unknown = _resolve_targets(hass, call)
+        boosts = await _async_get_boosts(hass)
+        
+        _LOGGER.info("Boost heating called: devices=%s, duration=%s, temp=%s", 
+                     ", ".join(targets), duration, temperature)
+        
+        # Pending manual changes go out first, so they neither land after
+        # the boost nor get lost as the setpoint to restore
+        flushed = await asyncio.gather(
+            *(entry_data["write_queue"].async_flush() for entry_data in targets.values())
+        )
+        
+        results: dict[str, Any] = {}
+        writes = {}
+        for (device_id, entry_data), written in zip(targets.items(), flushed):
+            if not written:
+                results[device_id] = "pending change could not be written"
+                continue
+            state = (entry_data["coordinator"].data or {}).get(device_id)
+            current = state.target_temperature if state is not None else None
+            if (boost := boosts.boosts.get(device_id)) is not None:
+                # Boost from the setpoint before the running boost, not on top of it
+                current = boost.previous
+            
+            if current is None:
+                # Nothing to put back when the boost ends
+                results[device_id] = "setpoint unknown, try again after a poll"
+                continue
+            
+            # Calculate boost temperature
+            setpoint = temperature
+            if setpoint is None:
+                setpoint = min(35, current + 2)
+            
+            if boosts.async_boost(
+                device_id, current, setpoint, timedelta(minutes=duration)
+            ):
+                writes[device_id] = (entry_data["coordinator"], {FIELD_SETPOINT: setpoint})
+            else:
+                results[device_id] = True
+        
+        results.update(await async_write_fleet(writes))
+        return fleet_response(results, unknown)
+    
+    async def handle_frost_protection(call: ServiceCall) -> None:
+        """Handle frost protection service call."""
+        entity_id = call.data["entity_id"]
+        _LOGGER.info("Frost protection service called: %s", call.data)
+        
+        entry_data = _get_entry_data(hass, entity_id)
+        if entry_data is None:
+            _LOGGER.error("Entity %s is not a SALUS thermostat", entity_id)
+            return
+        
+        # Switch and temperature go out together in one set.php request
+        fields = {FIELD_FROST: "1" if call.data["enabled"] else "0"}
+        if (temperature := call.data.get("temperature")) is not None:
+            fields[FIELD_FROST_TEMP] = temperature
+        await entry_data["write_queue"].async_set_values(**fields)
+    
+    async def handle_holiday_mode(call: ServiceCall) -> ServiceResponse:
+        """Handle holiday mode service call."""
+        _LOGGER.info("Holiday mode service called: %s", call.data)
+        targets, unknown = _resolve_targets(hass, call)
+        
+        fields = {FIELD_HOLIDAY: "1" if call.data["enabled"] else "0"}
+        if (temperature := call.data.get("temperature")) is not None:
+            fields[FIELD_HOLIDAY_TEMP] = temperature
+        results = await async_write_fleet({
+            device_id: (entry_data["coordinator"], fields)
+            for device_id, entry_data in targets.items()
+        })
+        return fleet_response(results, unknown)
+    
+    async def handle_set_temperature_bulk(call: ServiceCall) -> ServiceResponse:
+        """Handle bulk set temperature service call."""
+        _LOGGER.info("Bulk set temperature called: %s", call.data)
+        targets, unknown = _resolve_targets(hass, call)
+        
+        # Mode and setpoint go out together in one set.php request per device
+        fields: dict[str, Any] = {FIELD_SETPOINT: call.data["temperature"]}
+        if (hvac_mode := call.data.get("hvac_mode")) is not None:
+            fields[FIELD_AUTO] = hvac_mode_value(hvac_mode)
+        results = await async_write_fleet({
+            device_id: (entry_data["coordinator"], fields)
+            for device_id, entry_data in targets.items()
+        })
+        return fleet_response(results, unknown)
+        
+    async def handle_set_schedule(call: ServiceCall) -> ServiceResponse:
+        """Handle set schedule service call."""
+        schedule_name = call.data["schedule_name"]
+        targets, unknown = _resolve_targets(hass, call)
+        schedule_store = await async_get_schedule_store(hass)
+        
+        _LOGGER.info("Set schedule called: devices=%s, schedule=%s",
+                     ", ".join(targets), schedule_name)
+        
+        results: dict[str, Any] = {}
+        writes = {}
+        for device_id, entry_data in targets.items():
+            if schedule_name not in schedule_store.templates:
+                results[device_id] = f"unknown schedule {schedule_name}"
+                continue
+            # The template switches and the master switch follow the registry;
+            # the setpoints in force go out in one fleet write
+            setpoint = entry_data["schedule_engine"].async_activate(schedule_name)
+            if setpoint is None:
+                # Already at it, between periods or kept for a running boost
+                results[device_id] = True
+            else:
+                writes[device_id] = (entry_data["coordinator"], {FIELD_SETPOINT: setpoint})
+        
+        results.update(await async_write_fleet(writes))
+        return fleet_response(results, unknown)
+    
+    async def handle_create_custom_schedule(call: ServiceCall) -> None:
+        """Handle create custom schedule service call."""
+        name = call.data["name"]
+        weekday_periods = call.data["weekday_periods"]
+        weekend_periods = call.data.get("weekend_periods", weekday_periods)
+        
+        _LOGGER.info("Create custom schedule called: %s", name)
+        
+        schedule_store = await async_get_schedule_store(hass)
+        template_id = slugify(name)
+        if template_id in SCHEDULE_TEMPLATES:
+            _LOGGER.error("Schedule %s would replace a built-in template", name)
+            return
+        schedule_store.async_save_template(
+            template_id, name, weekday_periods, weekend_periods
+        )
+        
+        # Devices already running this schedule pick up the new periods
+        setpoints = {
+            entry_data["device_id"]: (
+                entry_data["coordinator"],
+                entry_data["schedule_engine"].async_reload(write=False),
+            )
+            for entry_data in hass.data[DOMAIN].values()
+            if entry_data["schedules"].active == template_id
+        }
+        
+        if (entity_id := call.data.get("entity_id")) is not None:
+            if (entry_data := _get_entry_data(hass, entity_id)) is None:
+                _LOGGER.error("Entity %s is not a SALUS thermostat", entity_id)
+            else:
+                setpoints[entry_data["device_id"]] = (
+                    entry_data["coordinator"],
+                    entry_data["schedule_engine"].async_activate(template_id),
+                )
+        
+        # Failed writes are logged by the coordinator
+        await async_write_fleet({
+            device_id: (coordinator, {FIELD_SETPOINT: setpoint})
+            for device_id, (coordinator, setpoint) in setpoints.items()
+            if setpoint is not None
+        })
+    
+    async def handle_apply_schedule_period(call: ServiceCall) -> None:
+        """Handle apply schedule period service call."""
+        entity_id = call.data["entity_id"]
+        start_time = call.data["start_time"]
+        end_time = call.data["end_time"]
+        temperature = call.data["temperature"]
+        days = call.data.get("days") or list(DAYS)
+        
+        _LOGGER.info("Apply schedule period: %s-%s at %s°C", start_time, end_time, temperature)
+        
+        entry_data = _get_entry_data(hass, entity_id)
+        if entry_data is None:
+            _LOGGER.error("Entity %s is not a SALUS thermostat", entity_id)
+            return
+        if start_time == end_time:
+            _LOGGER.error("Schedule period %s-%s is empty", start_time, end_time)
+            return
+        if entry_data["schedules"].active is None:
+            _LOGGER.error("No schedule is active on %s", entity_id)
+            return
+        
+        # Applied on top of the active template until another one is activated
+        schedule_store = await async_get_schedule_store(hass)
+        device_id = entry_data["device_id"]
+        period = {"start": start_time, "end": end_time, "temp": temperature, "days": days}
+        schedule_store.async_update_device(
+            device_id,
+            periods=[*schedule_store.device(device_id).get("periods", []), period],
+        )
+        entry_data["schedule_engine"].async_reload()
+    
+    async def handle_get_schedules(call: ServiceCall) -> ServiceResponse:
+        """Return the schedule templates and each device's active one."""
+        # Kept out of the switches' state so the recorder does not store them
+        schedule_store = await async_get_schedule_store(hass)
+        return {
+            "templates": schedule_store.templates,
+            "active": {
+                entry_data["device_id"]: entry_data["schedules"].active
+                for entry_data in hass.data[DOMAIN].values()
+            },
+        }
+    
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BOOST_HEATING,
+        handle_boost_heating,
+        schema=BOOST_HEATING_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_FROST_PROTECTION,
+        handle_frost_protection,
+        schema=FROST_PROTECTION_SCHEMA,
+    )
+    
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_HOLIDAY_MODE,
+        handle_holiday_mode,
+        schema=HOLIDAY_MODE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_TEMPERATURE_BULK,
+        handle_set_temperature_bulk,
+        schema=SET_TEMPERATURE_BULK_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    
+    # Register schedule services
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_SCHEDULE,
+        handle_set_schedule,
+        schema=SET_SCHEDULE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CREATE_CUSTOM_SCHEDULE,
+        handle_create_custom_schedule,
+        schema=CREATE_CUSTOM_SCHEDULE_SCHEMA,
+    )
+    
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_APPLY_SCHEDULE_PERIOD,
+        handle_apply_schedule_period,
+        schema=APPLY_SCHEDULE_PERIOD_SCHEMA,
+    )
+    
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_SCHEDULES,
+        handle_get_schedules,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+def _get_entry_data(hass: HomeAssistant, entity_id: str) -> dict | None:
+    """Return the runtime data of the config entry owning an entity."""
+    return async_get_device_index(hass).async_get(entity_id)
+
+
+def _resolve_targets(
+    hass: HomeAssistant, call: ServiceCall
+) -> tuple[dict[str, dict], list[str]]:
+    """Return the entry data of every targeted device and the unknown targets."""
+    index = async_get_device_index(hass)
+    targets: dict[str, dict] = {}
+    unknown: list[str] = []
+    for target in [*call.data.get("entity_id", []), *call.data.get("device_id", [])]:
+        if (entry_data := index.async_get(target)) is None:
+            _LOGGER.error("%s is not a SALUS thermostat", target)
+            unknown.append(target)
+        else:
+            targets[entry_data["device_id"]] = entry_data
+    return targets, unknown
+
+
+async def _async_get_boosts(hass: HomeAssistant) -> SalusBoostManager:
+    """Return the boost manager shared by all entries."""
+    return async_get_boost_manager(hass, await async_get_boost_store(hass))
@@ -0,0 +1,62 @@
+"""Pooled HTTP connections for the SALUS RT310i integration."""
+from __future__ import annotations
+
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.util.ssl import get_default_context
+
+from .const import DOMAIN, SALUS_BASE_URL
+from .resilience import CircuitBreaker
+
+DATA_CONNECTOR = f"{DOMAIN}_connector"
+DATA_CIRCUIT_BREAKERS = f"{DOMAIN}_circuit_breakers"
+
+# salus-it500.com may block IPs that open too many parallel connections
+CONNECTION_LIMIT_PER_HOST = 4
+KEEPALIVE_TIMEOUT = 60
+
+
+@callback
+def async_get_connector(hass: HomeAssistant) -> aiohttp.TCPConnector:
+    """Return the connector shared by every SALUS client.
+
+    All config entries and the config flow share one keep-alive pool, so a
+    poll reuses an open TLS connection instead of handshaking again. Each
+    client still gets its own cookie jar, since sessions are per account.
+    """
+    if (connector := hass.data.get(DATA_CONNECTOR)) is not None and not connector.closed:
+        return connector
+
+    connector = aiohttp.TCPConnector(
+        limit_per_host=CONNECTION_LIMIT_PER_HOST,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ssl=get_default_context(),
+    )
+    hass.data[DATA_CONNECTOR] = connector
+
+    async def _async_close_connector(event: Event) -> None:
+        """Close the shared connector when Home Assistant stops."""
+        await connector.close()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_connector)
+    return connector
+
+
+@callback
+def async_get_circuit_breaker(
+    hass: HomeAssistant, base_url: str = SALUS_BASE_URL
+) -> CircuitBreaker:
+    """Return the circuit breaker shared by every SALUS client of a host.
+
+    When the cloud is down, one breaker stops the polls of all accounts
+    instead of each client finding out on its own.
+    """
+    host = urlsplit(base_url).netloc
+    breakers: dict[str, CircuitBreaker] = hass.data.setdefault(DATA_CIRCUIT_BREAKERS, {})
+    if (breaker := breakers.get(host)) is None:
+        breaker = breakers[host] = CircuitBreaker(host)
+    return breaker
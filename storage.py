@@ -0,0 +1,248 @@
+"""Persistent storage for the SALUS RT310i integration."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .salus_api import SalusAPI
+from .schedules import SCHEDULE_TEMPLATES
+
+STORAGE_VERSION = 1
+SESSION_STORAGE_KEY = f"{DOMAIN}.sessions"
+SNAPSHOT_STORAGE_KEY = f"{DOMAIN}.snapshots"
+SCHEDULE_STORAGE_KEY = f"{DOMAIN}.schedules"
+BOOST_STORAGE_KEY = f"{DOMAIN}.boosts"
+DATA_SESSION_STORE = f"{DOMAIN}_session_store"
+DATA_SNAPSHOT_STORE = f"{DOMAIN}_snapshot_store"
+DATA_SCHEDULE_STORE = f"{DOMAIN}_schedule_store"
+DATA_BOOST_STORE = f"{DOMAIN}_boost_store"
+
+# Coalesce saves; pending data is also written when Home Assistant stops
+SAVE_DELAY = 10
+SNAPSHOT_SAVE_DELAY = 60
+
+
+class SalusSessionStore:
+    """Keep each account's cloud session across restarts.
+
+    The token and cookies of every tracked client are saved whenever it
+    logs in or its session is invalidated, and handed back to new clients
+    of the same account. A restored session is not checked up front: the
+    first request finds out, and a rejected session triggers the usual
+    login.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, SESSION_STORAGE_KEY, private=True
+        )
+        self._sessions: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load the saved sessions."""
+        self._sessions = await self._store.async_load() or {}
+
+    @callback
+    def async_track(self, api: SalusAPI) -> None:
+        """Restore the client's saved session and save it when it changes."""
+        if (session := self._sessions.get(api.username.lower())) is not None:
+            api.restore_session(session)
+        api.on_session_update = lambda: self._async_save(api)
+
+    @callback
+    def _async_save(self, api: SalusAPI) -> None:
+        """Schedule saving a client's current session."""
+        if (session := api.export_session()) is None:
+            self._sessions.pop(api.username.lower(), None)
+        else:
+            self._sessions[api.username.lower()] = session
+        self._store.async_delay_save(lambda: self._sessions, SAVE_DELAY)
+
+
+class SalusSnapshotStore:
+    """Keep the last payload of every device across restarts.
+
+    Entries restore it at startup to register their entities and show the
+    last known values right away, while the first poll runs in the
+    background.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, SNAPSHOT_STORAGE_KEY
+        )
+        self._snapshots: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load the saved snapshots."""
+        self._snapshots = await self._store.async_load() or {}
+
+    def get(self, device_id: str) -> tuple[dict[str, Any], datetime] | None:
+        """Return a device's last payload and when it was fetched."""
+        if (snapshot := self._snapshots.get(device_id)) is None:
+            return None
+        if (fetched_at := dt_util.parse_datetime(snapshot["fetched_at"])) is None:
+            return None
+        return snapshot["payload"], fetched_at
+
+    @callback
+    def async_update(
+        self, device_id: str, payload: dict[str, Any], fetched_at: datetime
+    ) -> None:
+        """Schedule saving a device's latest payload."""
+        self._snapshots[device_id] = {
+            "payload": payload,
+            "fetched_at": fetched_at.isoformat(),
+        }
+        self._store.async_delay_save(lambda: self._snapshots, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def async_remove(self, device_id: str) -> None:
+        """Forget a device that is no longer configured."""
+        if self._snapshots.pop(device_id, None) is not None:
+            self._store.async_delay_save(lambda: self._snapshots, SAVE_DELAY)
+
+
+class SalusScheduleStore:
+    """Keep custom schedule templates and each device's schedule.
+
+    Per device it saves the active template, whether the schedule is
+    enabled and the periods applied on top of the template.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, SCHEDULE_STORAGE_KEY
+        )
+        self._custom: dict[str, dict[str, Any]] = {}
+        self._devices: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load the saved schedules."""
+        data = await self._store.async_load() or {}
+        self._custom = data.get("custom", {})
+        self._devices = data.get("devices", {})
+
+    @property
+    def templates(self) -> dict[str, dict[str, Any]]:
+        """Return the built-in templates and the custom ones."""
+        return {**SCHEDULE_TEMPLATES, **self._custom}
+
+    def device(self, device_id: str) -> dict[str, Any]:
+        """Return a device's saved schedule state."""
+        return self._devices.get(device_id, {})
+
+    @callback
+    def async_save_template(
+        self,
+        template_id: str,
+        name: str,
+        weekday: list[dict[str, Any]],
+        weekend: list[dict[str, Any]],
+    ) -> None:
+        """Add or replace a custom template."""
+        self._custom[template_id] = {
+            "name": name,
+            "periods": {"weekday": weekday, "weekend": weekend},
+        }
+        self._async_schedule_save()
+
+    @callback
+    def async_update_device(self, device_id: str, **changes: Any) -> None:
+        """Change a device's saved schedule state."""
+        self._devices[device_id] = {**self.device(device_id), **changes}
+        self._async_schedule_save()
+
+    @callback
+    def async_remove_device(self, device_id: str) -> None:
+        """Forget a device that is no longer configured."""
+        if self._devices.pop(device_id, None) is not None:
+            self._async_schedule_save()
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Schedule writing the schedules."""
+        self._store.async_delay_save(
+            lambda: {"custom": self._custom, "devices": self._devices}, SAVE_DELAY
+        )
+
+
+class SalusBoostStore:
+    """Keep the active boosts across restarts.
+
+    Each boost is saved as the setpoint before it, the boost setpoint and
+    when it ends, so a boost that ended while Home Assistant was down is
+    still undone at the next start.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, BOOST_STORAGE_KEY
+        )
+        self._boosts: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load the saved boosts."""
+        self._boosts = await self._store.async_load() or {}
+
+    @property
+    def boosts(self) -> dict[str, dict[str, Any]]:
+        """Return the saved boosts by device."""
+        return self._boosts
+
+    @callback
+    def async_set(self, device_id: str, boost: dict[str, Any]) -> None:
+        """Save a device's boost."""
+        self._boosts[device_id] = boost
+        self._store.async_delay_save(lambda: self._boosts, SAVE_DELAY)
+
+    @callback
+    def async_remove(self, *device_ids: str) -> None:
+        """Forget the boosts of devices."""
+        removed = [self._boosts.pop(device_id, None) for device_id in device_ids]
+        if any(boost is not None for boost in removed):
+            self._store.async_delay_save(lambda: self._boosts, SAVE_DELAY)
+
+
+async def async_get_session_store(hass: HomeAssistant) -> SalusSessionStore:
+    """Return the session store, loading it on first use."""
+    return await _async_get_store(hass, DATA_SESSION_STORE, SalusSessionStore)
+
+
+async def async_get_snapshot_store(hass: HomeAssistant) -> SalusSnapshotStore:
+    """Return the snapshot store, loading it on first use."""
+    return await _async_get_store(hass, DATA_SNAPSHOT_STORE, SalusSnapshotStore)
+
+
+async def async_get_schedule_store(hass: HomeAssistant) -> SalusScheduleStore:
+    """Return the schedule store, loading it on first use."""
+    return await _async_get_store(hass, DATA_SCHEDULE_STORE, SalusScheduleStore)
+
+
+async def async_get_boost_store(hass: HomeAssistant) -> SalusBoostStore:
+    """Return the boost store, loading it on first use."""
+    return await _async_get_store(hass, DATA_BOOST_STORE, SalusBoostStore)
+
+
+async def _async_get_store(hass: HomeAssistant, key: str, store_class):
+    """Return a store kept in hass.data, loading it once."""
+    if (load := hass.data.get(key)) is None:
+        store = store_class(hass)
+
+        async def _async_load():
+            await store.async_load()
+            return store
+
+        # Entries set up together share the one load
+        load = hass.data[key] = hass.async_create_task(_async_load())
+    return await asyncio.shield(load)
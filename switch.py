@@ -2,71 +2,20 @@
 from __future__ import annotations
 
 import logging
-from datetime import time
 from typing import Any
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.restore_state import RestoreEntity
 
 from .const import DOMAIN
+from .entity import SalusEntity
+from .schedules import SCHEDULE_TEMPLATES, SalusScheduleRegistry
 
 _LOGGER = logging.getLogger(__name__)
 
-# Default schedule templates
-SCHEDULE_TEMPLATES = {
-    "comfort": {
-        "name": "Comfort Schedule",
-        "periods": {
-            "weekday": [
-                {"start": "06:00", "end": "08:00", "temp": 21},  # Morning
-                {"start": "08:00", "end": "17:00", "temp": 18},  # Day (away)
-                {"start": "17:00", "end": "22:00", "temp": 21},  # Evening
-                {"start": "22:00", "end": "06:00", "temp": 17},  # Night
-            ],
-            "weekend": [
-                {"start": "07:00", "end": "23:00", "temp": 21},  # Day
-                {"start": "23:00", "end": "07:00", "temp": 17},  # Night
-            ],
-        },
-    },
-    "eco": {
-        "name": "Eco Schedule",
-        "periods": {
-            "weekday": [
-                {"start": "06:00", "end": "08:00", "temp": 19},  # Morning
-                {"start": "08:00", "end": "17:00", "temp": 16},  # Day (away)
-                {"start": "17:00", "end": "22:00", "temp": 19},  # Evening
-                {"start": "22:00", "end": "06:00", "temp": 16},  # Night
-            ],
-            "weekend": [
-                {"start": "07:00", "end": "23:00", "temp": 19},  # Day
-                {"start": "23:00", "end": "07:00", "temp": 16},  # Night
-            ],
-        },
-    },
-    "working_from_home": {
-        "name": "Work From Home",
-        "periods": {
-            "weekday": [
-                {"start": "06:00", "end": "08:00", "temp": 21},  # Morning
-                {"start": "08:00", "end": "12:00", "temp": 20},  # Work morning
-                {"start": "12:00", "end": "13:00", "temp": 21},  # Lunch
-                {"start": "13:00", "end": "17:00", "temp": 20},  # Work afternoon
-                {"start": "17:00", "end": "22:00", "temp": 21},  # Evening
-                {"start": "22:00", "end": "06:00", "temp": 17},  # Night
-            ],
-            "weekend": [
-                {"start": "08:00", "end": "23:00", "temp": 21},  # Day
-                {"start": "23:00", "end": "08:00", "temp": 17},  # Night
-            ],
-        },
-    },
-}
-
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -77,172 +26,143 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
     api = hass.data[DOMAIN][entry.entry_id]["api"]
     device_id = hass.data[DOMAIN][entry.entry_id]["device_id"]
+    schedules = hass.data[DOMAIN][entry.entry_id]["schedules"]
     
     # Create schedule entities for each template
     entities = [
-        SalusScheduleMaster(coordinator, api, device_id),
+        SalusScheduleMaster(coordinator, api, device_id, schedules),
     ]
     
     # Add template schedule switches
     for template_id, template_data in SCHEDULE_TEMPLATES.items():
         entities.append(
-            SalusScheduleTemplate(coordinator, device_id, template_id, template_data)
+            SalusScheduleTemplate(
+                coordinator, device_id, template_id, template_data, schedules
+            )
         )
     
     async_add_entities(entities)
 
 
-class SalusScheduleMaster(CoordinatorEntity, SwitchEntity, RestoreEntity):
+class SalusScheduleMaster(SalusEntity, SwitchEntity, RestoreEntity):
     """Master schedule control switch."""
 
-    def __init__(self, coordinator, api, device_id):
+    _state_fields = ("schedule_on",)
+
+    def __init__(self, coordinator, api, device_id, schedules: SalusScheduleRegistry):
         """Initialize the schedule master."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, device_id)
         self._api = api
-        self._device_id = device_id
+        self._schedules = schedules
         self._attr_name = "Schedule Master"
         self._attr_unique_id = f"salus_{device_id}_schedule_master"
         self._attr_icon = "mdi:calendar-clock"
-        self._is_on = False
-
-    @property
-    def device_info(self):
-        """Return device information."""
-        return {
-            "identifiers": {(DOMAIN, self._device_id)},
-            "name": f"SALUS RT310i {self._device_id}",
-            "manufacturer": "SALUS",
-            "model": "RT310i",
-        }
 
     @property
     def is_on(self) -> bool:
         """Return true if schedule is enabled."""
         # Check API data for schedule status
-        if self.coordinator.data:
-            return self.coordinator.data.get("CH1scheduleOn") == "1"
-        return self._is_on
+        if (state := self.device_state) is not None:
+            return state.schedule_on is True
+        return self._schedules.enabled
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Enable schedule mode."""
-        try:
-            # This would call the SALUS API to enable schedule
-            # For now, we'll track it locally
-            self._is_on = True
+        # This would call the SALUS API to enable schedule
+        # For now, we'll track it locally
+        if self._schedules.async_set_enabled(True):
             _LOGGER.info("Schedule enabled for device %s", self._device_id)
             await self.coordinator.async_request_refresh()
-        except Exception as err:
-            _LOGGER.error("Failed to enable schedule: %s", err)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Disable schedule mode."""
-        try:
-            self._is_on = False
+        if self._schedules.async_set_enabled(False):
             _LOGGER.info("Schedule disabled for device %s", self._device_id)
             await self.coordinator.async_request_refresh()
-        except Exception as err:
-            _LOGGER.error("Failed to disable schedule: %s", err)
 
     async def async_added_to_hass(self) -> None:
         """Restore state when added to hass."""
         await super().async_added_to_hass()
         if (last_state := await self.async_get_last_state()) is not None:
-            self._is_on = last_state.state == "on"
+            self._schedules.async_restore(
+                last_state.attributes.get("active_schedule"), last_state.state == "on"
+            )
+        self.async_on_remove(
+            self._schedules.async_add_listener(self._async_schedule_changed)
+        )
+
+    @callback
+    def _async_schedule_changed(self, previous: str | None, active: str | None) -> None:
+        """Show the new active template or schedule state."""
+        self.async_write_ha_state()
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return additional state attributes."""
-        return {
-            "active_schedule": self._get_active_schedule(),
-            "available_templates": list(SCHEDULE_TEMPLATES.keys()),
-        }
+        # The templates and their periods come from the get_schedules service
+        return {"active_schedule": self._schedules.active}
 
-    def _get_active_schedule(self) -> str | None:
-        """Get the currently active schedule template."""
-        # Check which template is active
-        for template_id in SCHEDULE_TEMPLATES:
-            entity_id = f"switch.salus_{self._device_id}_schedule_{template_id}"
-            state = self.hass.states.get(entity_id)
-            if state and state.state == "on":
-                return template_id
-        return None
 
-
-class SalusScheduleTemplate(CoordinatorEntity, SwitchEntity, RestoreEntity):
+class SalusScheduleTemplate(SalusEntity, SwitchEntity, RestoreEntity):
     """Schedule template switch."""
 
-    def __init__(self, coordinator, device_id, template_id, template_data):
+    _state_fields = ()
+    # Static details, kept out of the recorder
+    _unrecorded_attributes = frozenset({"template_id", "total_periods"})
+
+    def __init__(
+        self,
+        coordinator,
+        device_id,
+        template_id,
+        template_data,
+        schedules: SalusScheduleRegistry,
+    ):
         """Initialize the schedule template."""
-        super().__init__(coordinator)
-        self._device_id = device_id
+        super().__init__(coordinator, device_id)
         self._template_id = template_id
         self._template_data = template_data
+        self._schedules = schedules
         self._attr_name = f"Schedule {template_data['name']}"
         self._attr_unique_id = f"salus_{device_id}_schedule_{template_id}"
         self._attr_icon = "mdi:calendar-text"
-        self._is_on = False
-
-    @property
-    def device_info(self):
-        """Return device information."""
-        return {
-            "identifiers": {(DOMAIN, self._device_id)},
-            "name": f"SALUS RT310i {self._device_id}",
-            "manufacturer": "SALUS",
-            "model": "RT310i",
-        }
 
     @property
     def is_on(self) -> bool:
         """Return true if this schedule template is active."""
-        return self._is_on
+        return self._schedules.active == self._template_id
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Activate this schedule template."""
-        try:
-            # Turn off other templates
-            for template_id in SCHEDULE_TEMPLATES:
-                if template_id != self._template_id:
-                    entity_id = f"switch.salus_{self._device_id}_schedule_{template_id}"
-                    await self.hass.services.async_call(
-                        "switch", "turn_off", {"entity_id": entity_id}, blocking=False
-                    )
-            
-            self._is_on = True
-            _LOGGER.info("Activated schedule template: %s", self._template_id)
-            
-            # Enable the master schedule
-            master_entity_id = f"switch.salus_{self._device_id}_schedule_master"
-            await self.hass.services.async_call(
-                "switch", "turn_on", {"entity_id": master_entity_id}, blocking=False
-            )
-            
-            self.async_write_ha_state()
-        except Exception as err:
-            _LOGGER.error("Failed to activate schedule: %s", err)
+        # Turns the previous template off and the schedule on in one change
+        self._schedules.async_activate(self._template_id)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Deactivate this schedule template."""
-        try:
-            self._is_on = False
-            _LOGGER.info("Deactivated schedule template: %s", self._template_id)
-            self.async_write_ha_state()
-        except Exception as err:
-            _LOGGER.error("Failed to deactivate schedule: %s", err)
+        self._schedules.async_deactivate(self._template_id)
 
     async def async_added_to_hass(self) -> None:
         """Restore state when added to hass."""
         await super().async_added_to_hass()
         if (last_state := await self.async_get_last_state()) is not None:
-            self._is_on = last_state.state == "on"
+            if last_state.state == "on":
+                self._schedules.async_restore(self._template_id, False)
+        self.async_on_remove(
+            self._schedules.async_add_listener(self._async_schedule_changed)
+        )
+
+    @callback
+    def _async_schedule_changed(self, previous: str | None, active: str | None) -> None:
+        """Write state only if this template was turned on or off."""
+        if previous != active and self._template_id in (previous, active):
+            self.async_write_ha_state()
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return schedule details as attributes."""
+        # The periods come from the get_schedules service, not every state
         return {
             "template_id": self._template_id,
-            "weekday_periods": self._template_data["periods"]["weekday"],
-            "weekend_periods": self._template_data["periods"]["weekend"],
             "total_periods": (
                 len(self._template_data["periods"]["weekday"])
                 + len(self._template_data["periods"]["weekend"])
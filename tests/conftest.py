@@ -0,0 +1,77 @@
+"""Fixtures for the SALUS RT310i tests."""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import bench  # noqa: E402
+from mock_cloud import MockCloudConfig, MockSalusCloud  # noqa: E402
+
+
+def bench_args(*argv: str) -> argparse.Namespace:
+    """Return benchmark options sized for a test run."""
+    return bench.parse_args(["--devices", "4", "--polls", "5", *argv])
+
+
+@pytest.fixture(autouse=True)
+def allow_mock_cloud(socket_enabled):
+    """Let the tests reach the mock cloud on localhost."""
+
+
+@pytest.fixture
+def salus_integration(enable_custom_integrations, tmp_path):
+    """Make the repository loadable as a custom integration.
+
+    Return the package name Home Assistant imports it as.
+    """
+    import custom_components  # pylint: disable=import-outside-toplevel
+
+    (tmp_path / bench.PACKAGE).symlink_to(ROOT)
+    custom_components.__path__.append(str(tmp_path))
+    yield f"custom_components.{bench.PACKAGE}"
+    custom_components.__path__.remove(str(tmp_path))
+
+
+@pytest.fixture
+def cloud_config() -> MockCloudConfig:
+    """Return the mock cloud's setup; a test module may override it."""
+    return MockCloudConfig(devices=1)
+
+
+@pytest.fixture
+def client_options() -> dict[str, Any]:
+    """Return extra client options; a test module may override them."""
+    return {}
+
+
+@pytest.fixture
+async def cloud(cloud_config: MockCloudConfig):
+    """Run a mock SALUS cloud for the test."""
+    cloud = MockSalusCloud(cloud_config)
+    await cloud.start()
+    yield cloud
+    await cloud.stop()
+
+
+@pytest.fixture
+async def api(cloud: MockSalusCloud, client_options: dict[str, Any]):
+    """Return a client for the mock cloud's account."""
+    api = await bench.client(cloud, **client_options)
+    yield api
+    await api.close()
+
+
+@pytest.fixture
+async def coordinator(hass: HomeAssistant, api):
+    """Return an account coordinator for the mock cloud's account."""
+    coordinator = bench.load("coordinator").SalusAccountCoordinator(hass, api)
+    yield coordinator
+    await coordinator.async_shutdown()
@@ -0,0 +1,110 @@
+"""Check the properties the benchmark scenarios measure.
+
+Each scenario runs against the local mock cloud at a small size; the
+assertions are the regressions the change behind the scenario protects
+against, not timings, except where the point of a change is speed.
+"""
+from __future__ import annotations
+
+from conftest import bench, bench_args
+
+
+async def test_polling_reuses_session_and_connections() -> None:
+    """A steady-state poll is one request per device, without logging in."""
+    results = await bench.bench_polling(bench_args())
+
+    assert results["logins_per_poll"] == 0
+    assert results["requests_per_poll"] == results["devices"]
+    assert results["connections_per_poll"] == 0
+    assert results["peak_concurrency"] <= 4
+
+
+async def test_session_expiry_logs_in_once_per_poll() -> None:
+    """An expired session costs one login, not one per device."""
+    results = await bench.bench_session_expiry(bench_args())
+
+    assert results["logins_per_poll"] == 1
+
+
+async def test_outage_opens_the_circuit_breaker() -> None:
+    """Polls during an outage stop sending requests once the breaker opened."""
+    results = await bench.bench_outage(bench_args("--polls", "20"))
+
+    assert results["circuit_breaker"]["state"] == "open"
+    # The breaker opens after 5 failures; later polls send nothing
+    assert results["requests_per_poll"] * results["polls"] <= 5
+
+
+async def test_memory_keeps_only_projected_fields() -> None:
+    """Parsed payloads keep the projected fields only."""
+    results = await bench.bench_memory(bench_args())
+
+    projected = results["projected"]
+    full = results["full_payload"]
+    assert projected["fields_per_payload"] < full["fields_per_payload"]
+    assert projected["bytes_per_device"] < full["bytes_per_device"]
+
+
+async def test_write_burst_sends_one_request() -> None:
+    """A ramp of setpoint changes is written once, with the last value.
+
+    The steps are spaced like a card drag, closer than the write debounce
+    but long enough that a throttle would write several times mid-ramp.
+    """
+    results = await bench.bench_writes(
+        bench_args("--burst", "8", "--step-delay", "0.5")
+    )
+
+    assert results["set_requests"] == 1
+    assert float(results["cloud_setpoint"]) == 20 + 0.5 * results["burst"]
+
+
+async def test_restored_startup_needs_no_requests() -> None:
+    """Entries restored from storage are ready before any request or login."""
+    results = await bench.bench_startup(bench_args())
+
+    assert results["restored"]["requests_before_ready"] == 0
+    assert results["restored"]["logins"] == 0
+    assert results["cold"]["logins"] == 1
+
+
+async def test_recorder_skips_schedule_attributes() -> None:
+    """The switches write state less often and record smaller attributes."""
+    results = await bench.bench_recorder(bench_args("--polls", "30"))
+
+    current, inline = results["current"], results["inline"]
+    assert results["service_calls_per_activation"] == 1
+    assert current["poll_state_writes"] < inline["poll_state_writes"]
+    assert current["states_rows"] <= inline["states_rows"]
+    assert current["attribute_bytes"] < inline["attribute_bytes"]
+
+
+async def test_compiled_schedule_lookup_is_faster() -> None:
+    """Looking up a compiled schedule beats scanning its periods."""
+    results = await bench.bench_schedule(bench_args("--devices", "50"))
+
+    assert results["compiled_lookup_us"] < results["scan_lookup_us"]
+
+
+async def test_fleet_write_reads_once_per_account() -> None:
+    """A fleet write is verified by one read per device, within the bound."""
+    results = await bench.bench_fleet(bench_args())
+
+    fleet = results["fleet"]
+    assert fleet["succeeded"] == results["devices"]
+    assert fleet["set_requests"] == results["devices"]
+    assert fleet["data_requests"] == results["devices"]
+    assert fleet["data_requests"] < results["serial"]["data_requests"]
+    assert fleet["peak_concurrent_requests"] <= 4
+
+
+async def test_spread_lowers_peak_concurrency() -> None:
+    """Spread accounts overlap less than in lockstep, without polling more."""
+    results = await bench.bench_spread(
+        bench_args("--accounts", "4", "--devices", "8", "--spread-period", "5")
+    )
+
+    lockstep, spread = results["lockstep"], results["spread"]
+    assert lockstep["peak_concurrent_requests"] > results["devices_per_account"]
+    assert spread["peak_concurrent_requests"] < lockstep["peak_concurrent_requests"]
+    assert spread["data_requests"] <= lockstep["data_requests"]
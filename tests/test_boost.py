@@ -0,0 +1,89 @@
+"""Tests for the SALUS RT310i boosts."""
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from conftest import bench
+from mock_cloud import MockSalusCloud
+
+
+@pytest.fixture
+def client_options() -> dict[str, Any]:
+    """Return a client that retries quickly and keeps its breaker shut."""
+    resilience = bench.load("resilience")
+    return {
+        "retry_policy": resilience.RetryPolicy(base_delay=0.01, max_delay=0.05),
+        # Keep the breaker shut so the retry reaches the cloud again
+        "circuit_breaker": resilience.CircuitBreaker("mock", failure_threshold=100),
+    }
+
+
+@pytest.fixture
+async def store(hass: HomeAssistant):
+    """Return a loaded boost store."""
+    store = bench.load("storage").SalusBoostStore(hass)
+    await store.async_load()
+    return store
+
+
+@pytest.fixture
+def manager(hass: HomeAssistant, store):
+    """Return a boost manager on the store."""
+    return bench.load("boost").SalusBoostManager(hass, store)
+
+
+async def test_boost_kept_until_previous_setpoint_written(
+    hass: HomeAssistant, cloud: MockSalusCloud, coordinator, store, manager
+) -> None:
+    """A boost whose end could not be written is tried again, not dropped."""
+    boost_module = bench.load("boost")
+    const = bench.load("const")
+    device_id = next(iter(cloud.devices))
+    await coordinator.async_add_device(device_id)
+    unsub = manager.async_add_device(device_id, coordinator)
+    manager.async_boost(device_id, 20.0, 24.0, timedelta(minutes=30))
+    await coordinator.async_write_devices({device_id: {const.FIELD_SETPOINT: 24.0}})
+
+    cloud.offline_devices.add(device_id)
+    ends = dt_util.utcnow() + timedelta(minutes=31)
+    async_fire_time_changed(hass, ends)
+    await hass.async_block_till_done()
+    assert device_id in manager.boosts
+    assert device_id in store.boosts
+
+    cloud.offline_devices.clear()
+    async_fire_time_changed(hass, ends + boost_module.RETRY_DELAY)
+    await hass.async_block_till_done()
+    assert device_id not in manager.boosts
+    assert device_id not in store.boosts
+    assert float(cloud.devices[device_id]["CH1currentSetPoint"]) == 20.0
+    unsub()
+
+
+async def test_boost_without_previous_setpoint_warns(
+    hass: HomeAssistant,
+    cloud: MockSalusCloud,
+    coordinator,
+    store,
+    manager,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """A saved boost without a previous setpoint ends with a warning, no write."""
+    device_id = next(iter(cloud.devices))
+    await coordinator.async_add_device(device_id)
+    unsub = manager.async_add_device(device_id, coordinator)
+    manager.async_boost(device_id, None, 24.0, timedelta(minutes=30))
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=31))
+    await hass.async_block_till_done()
+    assert device_id not in manager.boosts
+    assert device_id not in store.boosts
+    assert cloud.stats.requests["/includes/set.php"] == 0
+    assert "previous setpoint is unknown" in caplog.text
+    unsub()
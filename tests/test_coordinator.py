@@ -0,0 +1,57 @@
+"""Tests for the SALUS account coordinator."""
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+import pytest
+
+from conftest import bench
+from mock_cloud import MockCloudConfig, MockSalusCloud
+
+
+@pytest.fixture
+def cloud_config() -> MockCloudConfig:
+    """Return a mock cloud with two devices on the account."""
+    return MockCloudConfig(devices=2)
+
+
+@pytest.fixture
+def client_options() -> dict[str, Any]:
+    """Return a client that retries without waiting long."""
+    resilience = bench.load("resilience")
+    return {"retry_policy": resilience.RetryPolicy(base_delay=0.01, max_delay=0.05)}
+
+
+async def test_revalidation_backs_off_to_scan_interval(
+    cloud: MockSalusCloud, coordinator
+) -> None:
+    """One offline device does not keep the account on one-minute polls."""
+    coordinator_module = bench.load("coordinator")
+    for device_id in cloud.devices:
+        await coordinator.async_add_device(device_id)
+    offline = next(iter(cloud.devices))
+    cloud.offline_devices.add(offline)
+
+    intervals = []
+    for _ in range(5):
+        await coordinator.async_refresh()
+        assert offline in coordinator.stale_devices
+        intervals.append(coordinator.update_interval)
+    assert intervals == [
+        timedelta(minutes=1),
+        timedelta(minutes=2),
+        timedelta(minutes=4),
+        coordinator_module.SCAN_INTERVAL,
+        coordinator_module.SCAN_INTERVAL,
+    ]
+
+    # Back to normal polling, and to one minute on the next outage
+    cloud.offline_devices.clear()
+    await coordinator.async_refresh()
+    assert not coordinator.stale_devices
+    assert coordinator.poll_reason != coordinator_module.REASON_REVALIDATE
+    assert coordinator.update_interval >= coordinator_module.SCAN_INTERVAL
+    cloud.offline_devices.add(offline)
+    await coordinator.async_refresh()
+    assert coordinator.update_interval == timedelta(minutes=1)
@@ -0,0 +1,42 @@
+"""Tests for the SALUS RT310i fleet operations."""
+from __future__ import annotations
+
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import instance_id
+import pytest
+
+from conftest import bench
+from mock_cloud import MockCloudConfig, MockSalusCloud
+
+
+@pytest.fixture
+def cloud_config() -> MockCloudConfig:
+    """Return a mock cloud with two devices on the account."""
+    return MockCloudConfig(devices=2)
+
+
+async def test_poll_slots_start_at_the_install_offset(
+    hass: HomeAssistant, cloud: MockSalusCloud, coordinator
+) -> None:
+    """Every install starts its slots at its own, stable offset."""
+    coordinator_module = bench.load("coordinator")
+    fleet = bench.load("fleet")
+    period = coordinator_module.SCAN_INTERVAL
+
+    offsets = {fleet.poll_base_offset(str(seed)) for seed in range(20)}
+    assert len(offsets) == 20
+    assert all(timedelta(0) <= offset < period for offset in offsets)
+    assert fleet.poll_base_offset("install") == fleet.poll_base_offset("install")
+
+    scheduler = await fleet.async_get_poll_scheduler(hass)
+    assert scheduler is await fleet.async_get_poll_scheduler(hass)
+    base = fleet.poll_base_offset(await instance_id.async_get(hass))
+    assert scheduler.base_offset == base
+    for device_id in cloud.devices:
+        scheduler.async_add_device(device_id, coordinator)
+    first, second = sorted(cloud.devices)
+    assert scheduler.offsets == {first: base, second: (base + period / 2) % period}
+    # The account polls at the slot of its first device
+    assert coordinator.poll_phase == base
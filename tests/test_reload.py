@@ -0,0 +1,72 @@
+"""Tests for reloading SALUS RT310i config entries."""
+from __future__ import annotations
+
+import functools
+from unittest.mock import patch
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from conftest import bench
+from mock_cloud import MockCloudConfig, MockSalusCloud
+
+RELOADS = 5
+
+
+@pytest.fixture
+def cloud_config() -> MockCloudConfig:
+    """Return a mock cloud with three devices on the account."""
+    return MockCloudConfig(devices=3)
+
+
+async def test_reload_releases_resources(
+    hass: HomeAssistant, cloud: MockSalusCloud, salus_integration: str
+) -> None:
+    """Reloading entries leaves no sessions, sockets, tasks, listeners or timers."""
+    salus_api = __import__(f"{salus_integration}.salus_api", fromlist=["SalusAPI"])
+    entries = [
+        MockConfigEntry(
+            domain="salus_rt310i",
+            title=device_id,
+            unique_id=device_id,
+            data={
+                "username": cloud.config.username,
+                "password": cloud.config.password,
+                "device_id": device_id,
+            },
+        )
+        for device_id in cloud.devices
+    ]
+    with patch(
+        f"{salus_integration}.SalusAPI",
+        functools.partial(salus_api.SalusAPI, base_url=cloud.url, data_share_window=0),
+    ):
+        for entry in entries:
+            entry.add_to_hass(hass)
+            assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        async def reload_all() -> None:
+            # All at once, so the account's client is released too
+            for entry in entries:
+                assert await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_block_till_done()
+            for entry in entries:
+                assert await hass.config_entries.async_setup(entry.entry_id)
+            await hass.async_block_till_done()
+
+        # The shared pools and stores exist after the first reload
+        await reload_all()
+        before = bench.resources(hass)
+        for _ in range(RELOADS):
+            await reload_all()
+        after = bench.resources(hass)
+
+        assert all(entry.state is ConfigEntryState.LOADED for entry in entries)
+        assert after == before
+
+        for entry in entries:
+            assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
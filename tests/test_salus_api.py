@@ -0,0 +1,76 @@
+"""Tests for the SALUS cloud client."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import aiohttp
+import pytest
+
+from conftest import bench
+from mock_cloud import MockCloudConfig, MockSalusCloud
+
+DATA_PATH = "/public/ajax_device_values.php"
+
+
+@pytest.fixture
+def client_options() -> dict[str, Any]:
+    """Return a client that retries quickly and shares reads like in production."""
+    resilience = bench.load("resilience")
+    salus_api = bench.load("salus_api")
+    return {
+        "retry_policy": resilience.RetryPolicy(base_delay=0.01, max_delay=0.05),
+        "circuit_breaker": resilience.CircuitBreaker("mock", failure_threshold=5),
+        "data_share_window": salus_api.DATA_SHARE_WINDOW,
+    }
+
+
+@pytest.mark.parametrize(
+    "cloud_config", [MockCloudConfig(error_rate=1.0, error_status=503)]
+)
+async def test_plain_503_is_retried_and_opens_the_breaker(
+    cloud: MockSalusCloud, api
+) -> None:
+    """A 503 without Retry-After is a transient failure, not a rate limit."""
+    resilience = bench.load("resilience")
+    salus_api = bench.load("salus_api")
+
+    with pytest.raises(aiohttp.ClientResponseError) as err:
+        await api.get_device_data()
+    assert err.value.status == 503
+    assert not isinstance(err.value, salus_api.SalusRateLimitError)
+    assert cloud.stats.requests[DATA_PATH] == api.retry_policy.attempts
+    assert api.metrics.retries == api.retry_policy.attempts - 1
+
+    # The fifth failure opens the breaker in the middle of the next read
+    with pytest.raises(salus_api.SalusCircuitOpenError):
+        await api.get_device_data()
+    assert api.circuit_breaker.state == resilience.STATE_OPEN
+    assert cloud.stats.requests[DATA_PATH] == 5
+
+
+async def test_read_overlapping_a_write_is_not_shared(
+    cloud: MockSalusCloud, api, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A read that fetched before a write landed is not handed to later callers."""
+    device_id = next(iter(cloud.devices))
+    fetched = asyncio.Event()
+    release = asyncio.Event()
+    fetch = api._fetch_device_data  # pylint: disable=protected-access
+
+    async def held_fetch(device_id: str) -> dict[str, Any]:
+        data = await fetch(device_id)
+        fetched.set()
+        await release.wait()
+        return data
+
+    monkeypatch.setattr(api, "_fetch_device_data", held_fetch)
+    read = asyncio.ensure_future(api.get_device_data(device_id))
+    await fetched.wait()
+    assert await api.set_values(device_id, current_tempZ1_set=25.0)
+    release.set()
+    assert float((await read)["CH1currentSetPoint"]) == 20.0
+
+    data = await api.get_device_data(device_id)
+    assert float(data["CH1currentSetPoint"]) == 25.0
+    assert cloud.stats.requests[DATA_PATH] == 2
@@ -0,0 +1,154 @@
+"""Tests for the SALUS RT310i schedules."""
+from __future__ import annotations
+
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from conftest import bench
+from mock_cloud import MockSalusCloud
+
+MON, TUE, WED, SUN = 0, 1, 2, 6
+
+
+def _compile(*periods: tuple[int, str, str, float]):
+    """Compile (day, "HH:MM" start, "HH:MM" end, setpoint) periods."""
+
+    def minute(clock: str) -> int:
+        hours, minutes = clock.split(":")
+        return int(hours) * 60 + int(minutes)
+
+    schedules = bench.load("schedules")
+    return schedules.CompiledSchedule(
+        (day, minute(start), minute(end), setpoint)
+        for day, start, end, setpoint in periods
+    )
+
+
+def test_overnight_period_spills_into_the_next_day() -> None:
+    """A period ending before its start runs past midnight."""
+    schedule = _compile((MON, "22:00", "06:00", 18.0))
+    assert schedule.setpoint(MON, 21 * 60 + 59) is None
+    assert schedule.setpoint(MON, 22 * 60) == 18.0
+    assert schedule.setpoint(MON, 23 * 60 + 59) == 18.0
+    assert schedule.setpoint(TUE, 0) == 18.0
+    assert schedule.setpoint(TUE, 5 * 60 + 59) == 18.0
+    assert schedule.setpoint(TUE, 6 * 60) is None
+
+
+def test_next_day_periods_win_over_the_spill() -> None:
+    """The next day's own periods override the part that spilled into it."""
+    # Listed first, so only the day rule can make it win
+    schedule = _compile(
+        (TUE, "05:00", "09:00", 21.0),
+        (MON, "22:00", "06:00", 18.0),
+    )
+    assert schedule.setpoint(TUE, 4 * 60 + 59) == 18.0
+    assert schedule.setpoint(TUE, 5 * 60) == 21.0
+    assert schedule.setpoint(TUE, 6 * 60) == 21.0
+    assert schedule.setpoint(TUE, 9 * 60) is None
+
+
+def test_last_listed_period_wins_an_overlap() -> None:
+    """Overlapping periods of one day take the setpoint listed last."""
+    day = ((MON, "08:00", "18:00", 19.0), (MON, "12:00", "14:00", 22.0))
+    schedule = _compile(*day)
+    assert schedule.setpoint(MON, 11 * 60 + 59) == 19.0
+    assert schedule.setpoint(MON, 13 * 60) == 22.0
+    assert schedule.setpoint(MON, 14 * 60) == 19.0
+    assert _compile(*reversed(day)).setpoint(MON, 13 * 60) == 19.0
+
+
+def test_next_change_crosses_day_boundaries() -> None:
+    """The next change is found on a later day, including across the week."""
+    schedule = _compile((MON, "22:00", "06:00", 18.0), (SUN, "20:00", "00:00", 17.0))
+    assert schedule.next_change(MON, 23 * 60) == (1, 6 * 60)
+    assert schedule.next_change(TUE, 0) == (0, 6 * 60)
+    # Sunday's period ends at midnight, where Monday starts without one
+    assert schedule.next_change(SUN, 21 * 60) == (1, 0)
+
+
+def test_empty_days() -> None:
+    """Days without periods leave the setpoint alone until the next period."""
+    schedule = _compile((MON, "08:00", "10:00", 20.0))
+    assert schedule.setpoint(WED, 9 * 60) is None
+    assert schedule.next_change(WED, 0) == (5, 8 * 60)
+    empty = _compile()
+    assert empty.setpoint(MON, 0) is None
+    assert empty.next_change(MON, 0) is None
+
+
+@pytest.fixture
+async def device_id(cloud: MockSalusCloud, coordinator) -> str:
+    """Return the mock cloud's device, added to the coordinator."""
+    device_id = next(iter(cloud.devices))
+    await coordinator.async_add_device(device_id)
+    return device_id
+
+
+@pytest.fixture
+async def store(hass: HomeAssistant):
+    """Return a loaded schedule store."""
+    store = bench.load("storage").SalusScheduleStore(hass)
+    await store.async_load()
+    return store
+
+
+@pytest.fixture
+def registry(device_id: str, store):
+    """Return the device's schedule registry."""
+    return bench.load("schedules").SalusScheduleRegistry(device_id, store)
+
+
+@pytest.fixture
+def queue(hass: HomeAssistant, coordinator, device_id: str):
+    """Return the device's write queue."""
+    queue = bench.load("write_queue").SalusWriteQueue(hass, coordinator, device_id)
+    yield queue
+    queue.async_shutdown()
+
+
+@pytest.fixture
+def engine(hass: HomeAssistant, registry, store, coordinator, queue):
+    """Return the device's started schedule engine."""
+    schedules = bench.load("schedules")
+    engine = schedules.SalusScheduleEngine(hass, registry, store, coordinator, queue)
+    engine.async_start()
+    yield engine
+    engine.async_stop()
+
+
+async def test_activation_leaves_the_setpoint_to_the_caller(
+    hass: HomeAssistant,
+    cloud: MockSalusCloud,
+    coordinator,
+    device_id: str,
+    registry,
+    engine,
+) -> None:
+    """Activating a template returns its setpoint instead of queueing a write."""
+    fleet = bench.load("fleet")
+    schedules = bench.load("schedules")
+    cloud.devices[device_id]["CH1currentSetPoint"] = "30.0"
+    await coordinator.async_refresh()
+
+    setpoint = engine.async_activate("comfort")
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=1))
+    await hass.async_block_till_done()
+    now = dt_util.now()
+    assert registry.active == "comfort"
+    assert setpoint == schedules.CompiledSchedule.from_template(
+        schedules.SCHEDULE_TEMPLATES["comfort"]
+    ).setpoint(now.weekday(), now.hour * 60 + now.minute)
+    assert cloud.stats.requests["/includes/set.php"] == 0
+
+    results = await fleet.async_write_fleet(
+        {device_id: (coordinator, {"current_tempZ1_set": setpoint})}
+    )
+    assert results == {device_id: True}
+    assert float(cloud.devices[device_id]["CH1currentSetPoint"]) == setpoint
+    # Nothing left to write once the device is at the setpoint
+    assert engine.async_reload(write=False) is None
@@ -0,0 +1,90 @@
+"""Tests for the SALUS RT310i write queue."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+import pytest
+
+from conftest import bench
+from mock_cloud import MockCloudConfig, MockSalusCloud
+
+SET_PATH = "/includes/set.php"
+
+
+@pytest.fixture
+def client_options() -> dict[str, Any]:
+    """Return a client that retries quickly and keeps its breaker shut."""
+    resilience = bench.load("resilience")
+    return {
+        "retry_policy": resilience.RetryPolicy(base_delay=0.01, max_delay=0.05),
+        "circuit_breaker": resilience.CircuitBreaker("mock", failure_threshold=100),
+    }
+
+
+@pytest.fixture
+async def device_id(cloud: MockSalusCloud, coordinator) -> str:
+    """Return the mock cloud's device, added to the coordinator."""
+    device_id = next(iter(cloud.devices))
+    await coordinator.async_add_device(device_id)
+    return device_id
+
+
+@pytest.fixture
+def queue(hass: HomeAssistant, coordinator, device_id: str):
+    """Return the device's write queue."""
+    queue = bench.load("write_queue").SalusWriteQueue(hass, coordinator, device_id)
+    yield queue
+    queue.async_shutdown()
+
+
+async def test_flush_sends_pending_fields_now(
+    cloud: MockSalusCloud, coordinator, device_id: str, queue
+) -> None:
+    """A flush writes pending changes without waiting for the debounce."""
+    const = bench.load("const")
+    await queue.async_set_values(**{const.FIELD_SETPOINT: 21.5})
+    assert cloud.stats.requests[SET_PATH] == 0
+
+    await queue.async_flush()
+    assert not queue.pending
+    assert cloud.stats.requests[SET_PATH] == 1
+    assert float(cloud.devices[device_id]["CH1currentSetPoint"]) == 21.5
+    # Services reading the setpoint next see the written value
+    assert coordinator.data[device_id].target_temperature == 21.5
+
+    await queue.async_flush()
+    assert cloud.stats.requests[SET_PATH] == 1
+
+
+@pytest.mark.parametrize("cloud_config", [MockCloudConfig(latency=0.05)])
+async def test_flushes_reach_the_cloud_in_order(
+    cloud: MockSalusCloud, device_id: str, queue
+) -> None:
+    """A flush waits for the write underway, so the newest value lands last."""
+    const = bench.load("const")
+    await queue.async_set_values(**{const.FIELD_SETPOINT: 21.0})
+    first = asyncio.ensure_future(queue.async_flush())
+    await asyncio.sleep(0.01)
+    await queue.async_set_values(**{const.FIELD_SETPOINT: 22.0})
+    assert await queue.async_flush()
+    assert await first
+
+    assert cloud.stats.requests[SET_PATH] == 2
+    assert cloud.stats.peak_in_flight == 1
+    assert float(cloud.devices[device_id]["CH1currentSetPoint"]) == 22.0
+
+
+async def test_failed_flush_shows_the_cloud_value(
+    cloud: MockSalusCloud, coordinator, device_id: str, queue
+) -> None:
+    """A write that failed is reported and no longer shown as pending."""
+    const = bench.load("const")
+    before = coordinator.data[device_id].target_temperature
+    await queue.async_set_values(**{const.FIELD_SETPOINT: before + 1})
+    cloud.offline_devices.add(device_id)
+
+    assert not await queue.async_flush()
+    assert not queue.pending
+    assert coordinator.data[device_id].target_temperature == before
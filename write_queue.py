@@ -0,0 +1,110 @@
+"""Coalescing write queue for SALUS RT310i devices."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+import logging
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers.event import async_call_later
+
+from .coordinator import SalusAccountCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Quiet time after the last change before pending fields are sent
+WRITE_DEBOUNCE = 1.5
+
+
+class SalusWriteQueue:
+    """Coalesce changes to one device into a single write.
+
+    Dragging the thermostat card or ramping from an automation produces a
+    burst of 0.5°C steps, and scenes change mode and setpoint together.
+    Pending set.php fields are merged and sent in one ``set_values`` call
+    WRITE_DEBOUNCE seconds after the last change; every change restarts
+    the wait, so a ramp is written once, after it ends. Until then they
+    are shown as pending values, afterwards as the coordinator's
+    read-your-writes overlay. Writes go out one at a time, so a newer
+    value never reaches the cloud before an older one; a failed write
+    drops its pending values and the device shows the cloud's again.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: SalusAccountCoordinator,
+        device_id: str,
+    ) -> None:
+        """Initialize the write queue."""
+        self.hass = hass
+        self._coordinator = coordinator
+        self._device_id = device_id
+        self.pending: dict[str, Any] = {}
+        self._unsub_flush: CALLBACK_TYPE | None = None
+        self._lock = asyncio.Lock()
+
+    async def async_set_values(self, **fields: Any) -> None:
+        """Queue set.php fields, replacing pending values of the same fields."""
+        self.pending.update(fields)
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+        self._unsub_flush = async_call_later(
+            self.hass, WRITE_DEBOUNCE, self._async_flush
+        )
+
+    async def async_flush(self) -> bool:
+        """Send pending fields now; return False if they could not be written."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        return await self._async_write()
+
+    async def _async_flush(self, _now: datetime) -> None:
+        """Send pending fields once the debounce is over."""
+        self._unsub_flush = None
+        await self._async_write()
+
+    async def _async_write(self) -> bool:
+        """Send all pending fields and refresh once, after any write underway."""
+        async with self._lock:
+            if not (fields := dict(self.pending)):
+                return True
+            try:
+                written = await self._coordinator.api.set_values(
+                    self._device_id, **fields
+                )
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.error(
+                    "Failed to write %s to device %s: %s",
+                    ", ".join(fields),
+                    self._device_id,
+                    err,
+                )
+                written = False
+            else:
+                if not written:
+                    _LOGGER.error(
+                        "Device %s rejected %s", self._device_id, ", ".join(fields)
+                    )
+
+            # Values queued during the write are sent by the next flush
+            for field, value in fields.items():
+                if self.pending.get(field) == value:
+                    del self.pending[field]
+
+            if written:
+                # Patches the coordinator data and schedules the read-back
+                self._coordinator.async_apply_write(self._device_id, fields)
+            else:
+                # Show the cloud's values again instead of the unwritten ones
+                self._coordinator.async_update_device_listeners(self._device_id)
+            return written
+
+    def async_shutdown(self) -> None:
+        """Drop pending writes and cancel the debounce timer."""
+        self.pending.clear()
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None